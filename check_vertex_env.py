@@ -9,9 +9,40 @@ This script verifies:
 4. Required packages are installed
 """
 
+import functools
+import importlib.util
+import json
 import os
 import sys
-import json
+from pathlib import Path
+
+try:
+    # orjson parses the (escape-heavy) private_key PEM much faster
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+# Fields every service account key file must contain
+_REQUIRED_FIELDS = frozenset({'type', 'project_id', 'private_key', 'client_email'})
+
+# Output is collected here and written out once per section by _flush(),
+# instead of one stdout write per line.
+_out = []
+
+
+def _emit(text=""):
+    """Buffer one line of output."""
+    _out.append(f"{text}\n")
+
+
+def _flush():
+    """Write all buffered output with a single stdout write."""
+    if _out:
+        sys.stdout.write("".join(_out))
+        sys.stdout.flush()
+        _out.clear()
 
 
 def check_env_var():
@@ -19,54 +50,54 @@ def check_env_var():
     creds_path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
     
     if not creds_path:
-        print("❌ GOOGLE_APPLICATION_CREDENTIALS is not set")
-        print("\nTo fix this, run:")
-        print("  export GOOGLE_APPLICATION_CREDENTIALS=/path/to/service-account-key.json")
+        _emit("❌ GOOGLE_APPLICATION_CREDENTIALS is not set")
+        _emit("\nTo fix this, run:")
+        _emit("  export GOOGLE_APPLICATION_CREDENTIALS=/path/to/service-account-key.json")
         return False
     
-    print(f"✅ GOOGLE_APPLICATION_CREDENTIALS is set: {creds_path}")
+    _emit(f"✅ GOOGLE_APPLICATION_CREDENTIALS is set: {creds_path}")
     return creds_path
 
 
-def check_file_exists(creds_path):
-    """Check if the credentials file exists."""
-    if not os.path.exists(creds_path):
-        print(f"❌ Credentials file does not exist: {creds_path}")
-        return False
-    
-    print(f"✅ Credentials file exists")
-    return True
+def _stat_key(creds_path):
+    """Return the (mtime_ns, size) pair used to key the credentials cache."""
+    st = os.stat(creds_path)
+    return st.st_mtime_ns, st.st_size
 
 
-def check_file_valid(creds_path):
-    """Check if the credentials file is valid JSON."""
-    try:
-        with open(creds_path, 'r') as f:
-            data = json.load(f)
-        
-        # Check for required fields
-        required_fields = ['type', 'project_id', 'private_key', 'client_email']
-        missing_fields = [field for field in required_fields if field not in data]
-        
-        if missing_fields:
-            print(f"❌ Credentials file is missing required fields: {', '.join(missing_fields)}")
-            return False
-        
-        if data.get('type') != 'service_account':
-            print(f"❌ Credentials file type is '{data.get('type')}', expected 'service_account'")
-            return False
-        
-        print(f"✅ Credentials file is valid")
-        print(f"   Project ID: {data.get('project_id')}")
-        print(f"   Service Account: {data.get('client_email')}")
-        return True
-        
-    except json.JSONDecodeError as e:
-        print(f"❌ Credentials file is not valid JSON: {e}")
+@functools.lru_cache(maxsize=8)
+def _load_creds(creds_path, mtime_ns, size):
+    """
+    Read and parse the credentials file.
+
+    Cached on (path, mtime_ns, size) so repeated checks of an unchanged file
+    skip the read and the JSON parse. Raises FileNotFoundError, or
+    ValueError (json.JSONDecodeError / orjson.JSONDecodeError) on bad JSON.
+    """
+    return _loads(Path(creds_path).read_bytes())
+
+
+def load_creds(creds_path):
+    """Load the credentials file, reusing the cached parse when unchanged."""
+    return _load_creds(creds_path, *_stat_key(creds_path))
+
+
+def _validate_fields(data):
+    """Check that parsed credentials look like a service account key."""
+    missing_fields = _REQUIRED_FIELDS.difference(data)
+    
+    if missing_fields:
+        _emit(f"❌ Credentials file is missing required fields: {', '.join(sorted(missing_fields))}")
         return False
-    except Exception as e:
-        print(f"❌ Error reading credentials file: {e}")
+    
+    if data.get('type') != 'service_account':
+        _emit(f"❌ Credentials file type is '{data.get('type')}', expected 'service_account'")
         return False
+    
+    _emit(f"✅ Credentials file is valid")
+    _emit(f"   Project ID: {data.get('project_id')}")
+    _emit(f"   Service Account: {data.get('client_email')}")
+    return True
 
 
 def check_packages():
@@ -78,12 +109,18 @@ def check_packages():
     
     all_installed = True
     for package_name, import_name in packages.items():
+        # find_spec only locates the module; it does not execute the import
         try:
-            __import__(import_name)
-            print(f"✅ {package_name} is installed")
-        except ImportError:
-            print(f"❌ {package_name} is not installed")
-            print(f"   Install with: pip install {package_name}")
+            installed = importlib.util.find_spec(import_name) is not None
+        except ModuleNotFoundError:
+            # Raised when a parent package (e.g. "google.cloud") is missing
+            installed = False
+        
+        if installed:
+            _emit(f"✅ {package_name} is installed")
+        else:
+            _emit(f"❌ {package_name} is not installed")
+            _emit(f"   Install with: pip install {package_name}")
             all_installed = False
     
     return all_installed
@@ -91,44 +128,63 @@ def check_packages():
 
 def main():
     """Run all checks."""
-    print("Checking Vertex AI Environment Configuration")
-    print("=" * 50)
-    print()
+    _emit("Checking Vertex AI Environment Configuration")
+    _emit("=" * 50)
+    _emit()
     
     # Check environment variable
-    print("1. Checking GOOGLE_APPLICATION_CREDENTIALS...")
+    _emit("1. Checking GOOGLE_APPLICATION_CREDENTIALS...")
     creds_path = check_env_var()
     if not creds_path:
-        print("\n❌ Environment check failed")
+        _emit("\n❌ Environment check failed")
+        _flush()
         sys.exit(1)
-    print()
+    _emit()
+    _flush()
     
-    # Check file exists
-    print("2. Checking credentials file...")
-    if not check_file_exists(creds_path):
-        print("\n❌ Environment check failed")
+    # Load and validate credentials file (one stat + one read, parsed once)
+    _emit("2. Checking credentials file...")
+    try:
+        data = load_creds(creds_path)
+    except FileNotFoundError:
+        _emit(f"❌ Credentials file does not exist: {creds_path}")
+        _emit("\n❌ Environment check failed")
+        _flush()
+        sys.exit(1)
+    except ValueError as e:
+        _emit(f"❌ Credentials file is not valid JSON: {e}")
+        _emit("\n❌ Environment check failed")
+        _flush()
+        sys.exit(1)
+    except Exception as e:
+        _emit(f"❌ Error reading credentials file: {e}")
+        _emit("\n❌ Environment check failed")
+        _flush()
         sys.exit(1)
-    print()
+    _emit(f"✅ Credentials file exists")
     
-    # Check file is valid
-    print("3. Validating credentials file...")
-    if not check_file_valid(creds_path):
-        print("\n❌ Environment check failed")
+    # Validate the already-parsed data; no second open of the file
+    if not _validate_fields(data):
+        _emit("\n❌ Environment check failed")
+        _flush()
         sys.exit(1)
-    print()
+    _emit()
+    _flush()
     
     # Check packages
-    print("4. Checking required packages...")
+    _emit("3. Checking required packages...")
     if not check_packages():
-        print("\n❌ Environment check failed")
+        _emit("\n❌ Environment check failed")
+        _flush()
         sys.exit(1)
-    print()
+    _emit()
+    _flush()
     
-    print("=" * 50)
-    print("✅ All checks passed! Vertex AI environment is properly configured.")
-    print()
-    print("You can now use Vertex AI mode in your config.yaml:")
-    print("""
+    _emit("=" * 50)
+    _emit("✅ All checks passed! Vertex AI environment is properly configured.")
+    _emit()
+    _emit("You can now use Vertex AI mode in your config.yaml:")
+    _emit("""
   gemini:
     mode: vertex
     project_id: your-project-id
@@ -136,6 +192,7 @@ def main():
     models:
       multimodal: gemini-2.5-flash
 """)
+    _flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+"""
+示例脚本共用的事件循环入口。
+
+示例都是网络密集型（httpx 往返），安装了 uvloop（Windows 上为 winloop）时
+用它替代标准库事件循环，未安装时退回 asyncio.run，行为不变。
+"""
+
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+try:
+    import uvloop as _fast_loop
+except ImportError:
+    try:
+        import winloop as _fast_loop
+    except ImportError:
+        _fast_loop = None
+
+T = TypeVar("T")
+
+
+def run_main(main: Coroutine[Any, Any, T]) -> T:
+    """
+    运行示例的 main() 协程，优先使用 uvloop / winloop。
+
+    Args:
+        main: 要运行的协程
+
+    Returns:
+        协程的返回值
+    """
+    if _fast_loop is None:
+        return asyncio.run(main)
+    return asyncio.run(main, loop_factory=_fast_loop.new_event_loop)
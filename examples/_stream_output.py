@@ -0,0 +1,44 @@
+"""
+示例脚本共用的流式输出工具。
+
+逐 chunk 调用 print(..., flush=True) 时每个 token 都是一次系统调用，
+这里改为先写入缓冲区，累计到 4 KiB、距上次输出超过 50 ms
+或遇到换行时再统一写出，肉眼看不出差别。
+"""
+
+import sys
+import time
+from typing import AsyncIterator
+
+_FLUSH_BYTES = 4096
+_FLUSH_INTERVAL = 0.05  # 秒
+
+
+async def write_stream(chunks: AsyncIterator[str], prefix: str = "") -> None:
+    """
+    将 adapter.stream() 的输出批量写到 stdout。
+
+    Args:
+        chunks: adapter.stream() 返回的异步迭代器
+        prefix: 第一个 chunk 之前输出的前缀
+    """
+    out = sys.stdout.buffer
+    buf = bytearray(prefix.encode("utf-8"))
+    last_flush = time.monotonic()
+
+    try:
+        async for chunk in chunks:
+            buf += chunk.encode("utf-8")
+            now = time.monotonic()
+            if len(buf) >= _FLUSH_BYTES or now - last_flush > _FLUSH_INTERVAL or "\n" in chunk:
+                sys.stdout.flush()  # 先清空文本层缓冲，保证输出顺序
+                out.write(buf)
+                out.flush()
+                buf.clear()
+                last_flush = now
+    finally:
+        # 出错时也写出已收到的部分
+        if buf:
+            sys.stdout.flush()
+            out.write(buf)
+            out.flush()
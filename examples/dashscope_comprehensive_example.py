@@ -7,24 +7,32 @@
 
 import asyncio
 import os
-from llm_adapter.adapters.dashscope_adapter import DashScopeAdapter
+import sys
 
+from _event_loop import run_main
+from _stream_output import write_stream
 
-async def basic_generation():
+# 分隔线
+SEP = "=" * 70
+DASH = "-" * 70
+
+# 通义千问系列模型 (model_id, 显示名称)
+MODELS = (
+    ("qwen-turbo", "通义千问-Turbo (最快最便宜)"),
+    ("qwen-plus", "通义千问-Plus (平衡性能)"),
+    ("qwen-max", "通义千问-Max (最强性能)"),
+)
+
+# 超长提示词探测用例（20000 字符），模块加载时构造一次
+_LONG_PROBE = "测试" * 10000
+
+
+async def basic_generation(adapter):
     """基础文本生成示例"""
     
-    print("=" * 70)
+    print(SEP)
     print("基础文本生成示例")
-    print("=" * 70)
-    
-    api_key = os.getenv("DASHSCOPY_API_KEY")
-    if not api_key:
-        print("\n⚠ 错误: 未设置 DASHSCOPY_API_KEY 环境变量")
-        print("请设置: export DASHSCOPY_API_KEY=your_api_key")
-        return
-    
-    # 初始化 adapter
-    adapter = DashScopeAdapter(api_key=api_key)
+    print(SEP)
     
     # 使用 qwen-turbo 模型（最快最便宜）
     model = "qwen-turbo"
@@ -37,9 +45,9 @@ async def basic_generation():
     try:
         result = await adapter.generate(prompt, model)
         
-        print("\n" + "=" * 70)
+        print("\n" + SEP)
         print("生成结果")
-        print("=" * 70)
+        print(SEP)
         
         print(f"\n📝 生成文本:")
         print(f"  {result.text}")
@@ -51,22 +59,14 @@ async def basic_generation():
         
     except Exception as e:
         print(f"\n✗ 错误: {e}")
-    
-    await adapter.aclose()
 
 
-async def streaming_generation():
+async def streaming_generation(adapter):
     """流式输出示例"""
     
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("流式输出示例")
-    print("=" * 70)
-    
-    api_key = os.getenv("DASHSCOPY_API_KEY")
-    if not api_key:
-        return
-    
-    adapter = DashScopeAdapter(api_key=api_key)
+    print(SEP)
     
     model = "qwen-turbo"
     prompt = "请写一首关于春天的五言绝句。"
@@ -74,63 +74,40 @@ async def streaming_generation():
     print(f"\n模型: {model}")
     print(f"提示词: {prompt}")
     print("\n流式输出:")
-    print("-" * 70)
+    print(DASH)
     
     try:
-        print("  ", end="", flush=True)
-        async for chunk in adapter.stream(prompt, model):
-            print(chunk, end="", flush=True)
-        print("\n" + "-" * 70)
+        await write_stream(adapter.stream(prompt, model), prefix="  ")
+        print("\n" + DASH)
         print("✓ 流式输出完成")
         
     except Exception as e:
         print(f"\n✗ 错误: {e}")
-    
-    await adapter.aclose()
 
 
-async def multi_model_comparison():
+async def multi_model_comparison(adapter):
     """多模型对比示例"""
     
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("多模型对比示例")
-    print("=" * 70)
-    
-    api_key = os.getenv("DASHSCOPY_API_KEY")
-    if not api_key:
-        return
-    
-    adapter = DashScopeAdapter(api_key=api_key)
-    
-    # 通义千问系列模型
-    models = [
-        ("qwen-turbo", "通义千问-Turbo (最快最便宜)"),
-        ("qwen-plus", "通义千问-Plus (平衡性能)"),
-        ("qwen-max", "通义千问-Max (最强性能)"),
-    ]
+    print(SEP)
     
     prompt = "什么是人工智能？用一句话回答。"
     
     print(f"\n测试提示词: {prompt}")
-    print(f"\n测试 {len(models)} 个模型...\n")
+    print(f"\n测试 {len(MODELS)} 个模型...\n")
+    
+    # 三个模型的请求相互独立，并发发出
+    raw_results = await asyncio.gather(
+        *(adapter.generate(prompt, model_id) for model_id, _ in MODELS),
+        return_exceptions=True,
+    )
     
     results = []
     
-    for model_id, model_name in models:
-        print(f"测试 {model_name}...", end=" ", flush=True)
-        try:
-            result = await adapter.generate(prompt, model_id)
-            results.append({
-                "model_id": model_id,
-                "model_name": model_name,
-                "text": result.text,
-                "input_tokens": result.input_tokens or 0,
-                "output_tokens": result.output_tokens or 0,
-                "success": True
-            })
-            print("✓")
-        except Exception as e:
-            print(f"✗ ({e})")
+    for (model_id, model_name), result in zip(MODELS, raw_results):
+        if isinstance(result, Exception):
+            print(f"测试 {model_name}... ✗ ({result})")
             results.append({
                 "model_id": model_id,
                 "model_name": model_name,
@@ -139,33 +116,40 @@ async def multi_model_comparison():
                 "output_tokens": 0,
                 "success": False
             })
+        else:
+            print(f"测试 {model_name}... ✓")
+            results.append({
+                "model_id": model_id,
+                "model_name": model_name,
+                "text": result.text,
+                "input_tokens": result.input_tokens or 0,
+                "output_tokens": result.output_tokens or 0,
+                "success": True
+            })
     
     # 打印对比表格
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("模型对比结果")
-    print("=" * 70)
+    print(SEP)
     
+    lines = []
     for r in results:
         if r["success"]:
-            print(f"\n【{r['model_name']}】")
-            print(f"  回答: {r['text']}")
-            print(f"  Tokens: 输入 {r['input_tokens']} + 输出 {r['output_tokens']} = {r['input_tokens'] + r['output_tokens']}")
-    
-    await adapter.aclose()
+            lines.append(
+                f"\n【{r['model_name']}】\n"
+                f"  回答: {r['text']}\n"
+                f"  Tokens: 输入 {r['input_tokens']} + 输出 {r['output_tokens']} = {r['input_tokens'] + r['output_tokens']}"
+            )
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
-async def chinese_english_mixed():
+async def chinese_english_mixed(adapter):
     """中英文混合测试"""
     
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("中英文混合测试")
-    print("=" * 70)
-    
-    api_key = os.getenv("DASHSCOPY_API_KEY")
-    if not api_key:
-        return
-    
-    adapter = DashScopeAdapter(api_key=api_key)
+    print(SEP)
     
     model = "qwen-turbo"
     
@@ -177,33 +161,29 @@ async def chinese_english_mixed():
     
     print(f"\n使用模型: {model}\n")
     
-    for test_name, prompt in test_cases:
+    raw_results = await asyncio.gather(
+        *(adapter.generate(prompt, model) for _, prompt in test_cases),
+        return_exceptions=True,
+    )
+    
+    for (test_name, prompt), result in zip(test_cases, raw_results):
         print(f"【{test_name}测试】")
         print(f"提示词: {prompt}")
         
-        try:
-            result = await adapter.generate(prompt, model)
+        if isinstance(result, Exception):
+            print(f"✗ 错误: {result}\n")
+        else:
             print(f"回答: {result.text}")
             print(f"Tokens: 输入 {result.input_tokens}, 输出 {result.output_tokens}")
             print()
-        except Exception as e:
-            print(f"✗ 错误: {e}\n")
-    
-    await adapter.aclose()
 
 
-async def long_context_test():
+async def long_context_test(adapter):
     """长文本上下文测试"""
     
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("长文本上下文测试")
-    print("=" * 70)
-    
-    api_key = os.getenv("DASHSCOPY_API_KEY")
-    if not api_key:
-        return
-    
-    adapter = DashScopeAdapter(api_key=api_key)
+    print(SEP)
     
     model = "qwen-turbo"
     
@@ -236,60 +216,57 @@ async def long_context_test():
         
     except Exception as e:
         print(f"\n✗ 错误: {e}")
-    
-    await adapter.aclose()
 
 
-async def error_handling_demo():
+async def error_handling_demo(adapter):
     """错误处理示例"""
     
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("错误处理示例")
-    print("=" * 70)
+    print(SEP)
     
-    api_key = os.getenv("DASHSCOPY_API_KEY")
-    if not api_key:
-        return
+    very_long_prompt = _LONG_PROBE
     
-    adapter = DashScopeAdapter(api_key=api_key)
+    # 三个探测请求相互独立，并发发出
+    probe_1, probe_2, probe_3 = await asyncio.gather(
+        adapter.generate("你好", "invalid-model-name"),
+        adapter.generate("", "qwen-turbo"),
+        adapter.generate(very_long_prompt, "qwen-turbo"),
+        return_exceptions=True,
+    )
     
     # 测试 1: 无效的模型名称
     print("\n测试 1: 使用无效的模型名称")
-    try:
-        result = await adapter.generate("你好", "invalid-model-name")
-        print(f"✓ 成功: {result.text}")
-    except Exception as e:
-        print(f"✗ 预期的错误: {e}")
+    if isinstance(probe_1, Exception):
+        print(f"✗ 预期的错误: {probe_1}")
+    else:
+        print(f"✓ 成功: {probe_1.text}")
     
     # 测试 2: 空提示词
     print("\n测试 2: 使用空提示词")
-    try:
-        result = await adapter.generate("", "qwen-turbo")
-        print(f"✓ 成功: {result.text}")
-    except Exception as e:
-        print(f"✗ 错误: {e}")
+    if isinstance(probe_2, Exception):
+        print(f"✗ 错误: {probe_2}")
+    else:
+        print(f"✓ 成功: {probe_2.text}")
     
     # 测试 3: 超长提示词（可能触发限制）
     print("\n测试 3: 使用超长提示词")
-    very_long_prompt = "测试" * 10000  # 20000 字符
-    try:
-        result = await adapter.generate(very_long_prompt, "qwen-turbo")
+    if isinstance(probe_3, Exception):
+        print(f"✗ 预期的错误: {probe_3}")
+    else:
         print(f"✓ 成功处理超长文本")
-    except Exception as e:
-        print(f"✗ 预期的错误: {e}")
-    
-    await adapter.aclose()
 
 
 async def main():
     """运行所有示例"""
     
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("阿里百炼 (DashScope) 完整使用示例")
-    print("=" * 70)
+    print(SEP)
     
     # 检查 API Key
-    if not os.getenv("DASHSCOPY_API_KEY"):
+    api_key = os.getenv("DASHSCOPY_API_KEY")
+    if not api_key:
         print("\n⚠ 错误: 未设置 DASHSCOPY_API_KEY 环境变量")
         print("\n请先设置环境变量:")
         print("  export DASHSCOPY_API_KEY=your_api_key")
@@ -297,17 +274,24 @@ async def main():
         print("  DASHSCOPY_API_KEY=your_api_key")
         return
     
+    # 所有示例共用一个 adapter，复用同一个连接池
+    from llm_adapter.adapters.dashscope_adapter import DashScopeAdapter
+    adapter = DashScopeAdapter(api_key=api_key)
+    
     # 运行所有示例
-    await basic_generation()
-    await streaming_generation()
-    await multi_model_comparison()
-    await chinese_english_mixed()
-    await long_context_test()
-    await error_handling_demo()
-    
-    print("\n" + "=" * 70)
+    try:
+        await basic_generation(adapter)
+        await streaming_generation(adapter)
+        await multi_model_comparison(adapter)
+        await chinese_english_mixed(adapter)
+        await long_context_test(adapter)
+        await error_handling_demo(adapter)
+    finally:
+        await adapter.aclose()
+    
+    print("\n" + SEP)
     print("总结")
-    print("=" * 70)
+    print(SEP)
     print("\n✅ DashScope (通义千问) 主要特点:")
     print("  • 支持中文优化的大语言模型")
     print("  • 提供多个性能级别: turbo (快), plus (平衡), max (强)")
@@ -324,4 +308,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_main(main())
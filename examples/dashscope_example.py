@@ -7,10 +7,9 @@
 或者在代码中直接设置 api_key
 """
 
-import asyncio
 import os
 
-from llm_adapter.adapters.dashscope_adapter import DashScopeAdapter
+from _event_loop import run_main
 
 
 async def main():
@@ -21,6 +20,7 @@ async def main():
         return
     
     # 创建适配器
+    from llm_adapter.adapters.dashscope_adapter import DashScopeAdapter
     adapter = DashScopeAdapter(api_key=api_key)
     
     # 测试不同模型
@@ -47,4 +47,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_main(main())
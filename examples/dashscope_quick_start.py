@@ -7,12 +7,11 @@
   python examples/dashscope_quick_start.py                    # 使用环境变量中的 API Key
   python examples/dashscope_quick_start.py your-api-key       # 使用命令行参数指定 API Key
 """
-import time
-import asyncio
 import os
 import sys
-import time
-from llm_adapter.adapters.dashscope_adapter import DashScopeAdapter
+
+from _event_loop import run_main
+from _stream_output import write_stream
 
 
 def get_api_key():
@@ -34,12 +33,9 @@ def get_api_key():
     return None
 
 
-async def quick_start():
+async def quick_start(api_key):
     """快速开始示例"""
     
-    # 获取 API Key
-    api_key = get_api_key()
-    
     if not api_key:
         print("\n" + "=" * 60)
         print("错误: 未找到 API Key")
@@ -59,6 +55,7 @@ async def quick_start():
         return
     
     # 创建 adapter
+    from llm_adapter.adapters.dashscope_adapter import DashScopeAdapter
     adapter = DashScopeAdapter(api_key=api_key)
     
     print(f"Adapter base_url: {adapter.base_url}")
@@ -67,13 +64,15 @@ async def quick_start():
     # 调用模型生成文本
     print("\n正在调用通义千问...")
     try:
-        start = time.time()
+        import time
+        
+        start = time.perf_counter_ns()
         result = await adapter.generate(
             prompt="你好，请介绍一下你自己。",
             model="qwen-turbo"  # 可选: qwen-turbo, qwen-plus, qwen-max
         )
-        duration_ms = (time.time() - start) * 1000  # 转换为毫秒
-        print(f'所花时间：{duration_ms:.2f}ms')
+        duration_ms = (time.perf_counter_ns() - start) / 1e6  # 纳秒转毫秒
+        print(f'所花时间：{duration_ms:.2f} ms')
         print(f"\n回答: {result.text}")
         print(f"\nToken 使用: 输入 {result.input_tokens}, 输出 {result.output_tokens}")
         
@@ -84,21 +83,20 @@ async def quick_start():
     await adapter.aclose()
 
 
-async def streaming_example():
+async def streaming_example(api_key):
     """流式输出示例"""
     
-    api_key = get_api_key()
     if not api_key:
         return
     
+    from llm_adapter.adapters.dashscope_adapter import DashScopeAdapter
     adapter = DashScopeAdapter(api_key=api_key)
     
     print("\n流式输出示例:")
     print("-" * 50)
     
     try:
-        async for chunk in adapter.stream("讲一个笑话", "qwen-turbo"):
-            print(chunk, end="", flush=True)
+        await write_stream(adapter.stream("讲一个笑话", "qwen-turbo"))
         print("\n" + "-" * 50)
         
     except Exception as e:
@@ -112,8 +110,11 @@ if __name__ == "__main__":
     print("DashScope 快速开始")
     print("=" * 50)
     
-    asyncio.run(quick_start())
-    # asyncio.run(streaming_example())
+    # 只解析一次 API Key，传给各个示例
+    api_key = get_api_key()
+    
+    run_main(quick_start(api_key))
+    # run_main(streaming_example(api_key))
     
     print("\n提示:")
     print("• 如果遇到 'FreeTierOnly' 错误，说明免费额度已用完")
@@ -13,10 +13,11 @@ SDK 模式需要安装:
     pip install google-generativeai
 """
 
-import asyncio
 import os
 from llm_adapter.adapters.gemini_adapter import GeminiAdapter, ProviderError
 
+from _event_loop import run_main
+
 
 async def call_gemini_http():
     """HTTP 模式调用 (默认，无需额外依赖)"""
@@ -77,4 +78,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_main(main())
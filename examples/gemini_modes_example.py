@@ -7,9 +7,11 @@ This example shows how to use Gemini with:
 3. Vertex AI mode (for GCP projects)
 """
 
-import asyncio
 from llm_adapter.adapters import GeminiAdapter, ProviderError
 
+from _event_loop import run_main
+from _stream_output import write_stream
+
 
 async def test_http_mode():
     """Test Gemini with HTTP mode (default)."""
@@ -101,12 +103,13 @@ async def test_streaming():
         return
     
     try:
-        print("Streaming response: ", end="", flush=True)
-        async for chunk in adapter.stream(
-            prompt="Count from 1 to 5 slowly",
-            model="gemini-2.5-flash"
-        ):
-            print(chunk, end="", flush=True)
+        await write_stream(
+            adapter.stream(
+                prompt="Count from 1 to 5 slowly",
+                model="gemini-2.5-flash"
+            ),
+            prefix="Streaming response: ",
+        )
         print()  # New line after streaming
     except ProviderError as e:
         print(f"\nError: {e}")
@@ -133,4 +136,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_main(main())
@@ -7,11 +7,13 @@ region (us-central1) when the specified regional endpoint fails or is unavailabl
 The fallback tracker records timing and success metrics for each fallback event.
 """
 
-import asyncio
 import os
 from llm_adapter.adapters.gemini_adapter import GeminiAdapter
 from llm_adapter.fallback_tracker import get_fallback_tracker
 
+from _event_loop import run_main
+from _stream_output import write_stream
+
 
 async def test_region_fallback():
     """Test region fallback with an unavailable model in a specific region."""
@@ -20,9 +22,6 @@ async def test_region_fallback():
     print("Gemini Region Fallback Test")
     print("=" * 60)
     
-    # Get fallback tracker
-    tracker = get_fallback_tracker()
-    
     # Initialize adapter with a regional endpoint
     # Note: Some models may not be available in all regions
     adapter = GeminiAdapter(
@@ -59,36 +58,6 @@ async def test_region_fallback():
     except Exception as e:
         print(f"\n✗ Generation failed: {e}")
     
-    # Display fallback statistics
-    print("\n" + "=" * 60)
-    print("Fallback Statistics")
-    print("=" * 60)
-    
-    stats = tracker.get_stats()
-    summary = stats.get_summary()
-    
-    print(f"\nSummary:")
-    print(f"  Total fallbacks: {summary['total_fallbacks']}")
-    print(f"  Successful: {summary['successful_fallbacks']}")
-    print(f"  Failed: {summary['failed_fallbacks']}")
-    print(f"  Success rate: {summary['success_rate']:.1%}")
-    print(f"  Total duration: {summary['total_duration_ms']:.2f}ms")
-    print(f"  Average duration: {summary['average_duration_ms']:.2f}ms")
-    
-    # Display recent fallback events
-    recent_events = tracker.get_recent_events(limit=5)
-    if recent_events:
-        print(f"\nRecent Fallback Events:")
-        for i, event in enumerate(recent_events, 1):
-            print(f"\n  Event {i}:")
-            print(f"    Timestamp: {event.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"    Provider: {event.provider}")
-            print(f"    {event.original_location} → {event.fallback_location}")
-            print(f"    Model: {event.original_model}")
-            print(f"    Success: {'✓' if event.success else '✗'}")
-            print(f"    Duration: {event.fallback_duration_ms:.2f}ms")
-            print(f"    Error: {event.error_message[:80]}...")
-    
     await adapter.aclose()
 
 
@@ -116,9 +85,7 @@ async def test_streaming_with_fallback():
     print("\nStreaming response:")
     
     try:
-        print("  ", end="", flush=True)
-        async for chunk in adapter.stream(test_prompt, test_model):
-            print(chunk, end="", flush=True)
+        await write_stream(adapter.stream(test_prompt, test_model), prefix="  ")
         print("\n\n✓ Streaming completed successfully!")
         
     except Exception as e:
@@ -157,6 +124,42 @@ async def test_fallback_disabled():
     await adapter.aclose()
 
 
+def print_fallback_stats():
+    """Print the fallback statistics collected by the shared tracker."""
+    
+    tracker = get_fallback_tracker()
+    
+    # Display fallback statistics
+    print("\n" + "=" * 60)
+    print("Fallback Statistics")
+    print("=" * 60)
+    
+    stats = tracker.get_stats()
+    summary = stats.get_summary()
+    
+    print(f"\nSummary:")
+    print(f"  Total fallbacks: {summary['total_fallbacks']}")
+    print(f"  Successful: {summary['successful_fallbacks']}")
+    print(f"  Failed: {summary['failed_fallbacks']}")
+    print(f"  Success rate: {summary['success_rate']:.1%}")
+    print(f"  Total duration: {summary['total_duration_ms']:.2f}ms")
+    print(f"  Average duration: {summary['average_duration_ms']:.2f}ms")
+    
+    # Display recent fallback events
+    recent_events = tracker.get_recent_events(limit=5)
+    if recent_events:
+        print(f"\nRecent Fallback Events:")
+        for i, event in enumerate(recent_events, 1):
+            print(f"\n  Event {i}:")
+            print(f"    Timestamp: {event.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"    Provider: {event.provider}")
+            print(f"    {event.original_location} → {event.fallback_location}")
+            print(f"    Model: {event.original_model}")
+            print(f"    Success: {'✓' if event.success else '✗'}")
+            print(f"    Duration: {event.fallback_duration_ms:.2f}ms")
+            print(f"    Error: {event.error_message[:80]}...")
+
+
 async def main():
     """Run all fallback tests."""
     
@@ -173,10 +176,13 @@ async def main():
         print("Example: export GCP_PROJECT_ID=your-project-id")
         return
     
-    # Run tests
+    # Run tests one at a time: vertexai.init() is process-global, so a
+    # fallback re-init in one scenario would leak into the others. The
+    # statistics cover every scenario and are printed at the end.
     await test_region_fallback()
     await test_streaming_with_fallback()
     await test_fallback_disabled()
+    print_fallback_stats()
     
     print("\n" + "=" * 60)
     print("All tests completed!")
@@ -184,4 +190,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_main(main())
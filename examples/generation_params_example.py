@@ -9,19 +9,22 @@ Demonstrates the three-layer configuration system:
 """
 
 import asyncio
+import logging
 
 from llm_adapter.adapter import LLMAdapter
 from llm_adapter.config import ConfigManager, GenerationParams
 
+from _event_loop import run_main
 
-async def example_basic_usage():
+log = logging.getLogger(__name__)
+
+
+async def example_basic_usage(adapter: LLMAdapter):
     """Basic usage: Use configured parameters"""
     print("=" * 60)
     print("Example 1: Basic Usage (Using Configured Parameters)")
     print("=" * 60)
     
-    adapter = LLMAdapter()
-    
     # This will use parameters from config.yaml
     # Priority: model_params > generation_params > default_generation_params
     result = await adapter.generate(
@@ -36,14 +39,12 @@ async def example_basic_usage():
     print()
 
 
-async def example_runtime_override():
+async def example_runtime_override(adapter: LLMAdapter):
     """Runtime override: Override parameters in code"""
     print("=" * 60)
     print("Example 2: Runtime Override")
     print("=" * 60)
     
-    adapter = LLMAdapter()
-    
     # Override temperature and max_tokens at runtime
     result = await adapter.generate(
         prompt="Explain quantum computing in simple terms",
@@ -59,39 +60,41 @@ async def example_runtime_override():
     print()
 
 
-async def example_creative_vs_deterministic():
+async def example_creative_vs_deterministic(adapter: LLMAdapter):
     """Compare creative vs deterministic outputs"""
     print("=" * 60)
     print("Example 3: Creative vs Deterministic")
     print("=" * 60)
     
-    adapter = LLMAdapter()
     prompt = "Write a creative story opening about a robot"
     
-    # Deterministic output (temperature = 0)
-    print("Deterministic (temperature=0.0):")
-    result1 = await adapter.generate(
-        prompt=prompt,
-        provider="openai",
-        model="gpt-4o-mini",
-        temperature=0.0,
-        max_tokens=100
+    # Deterministic (temperature = 0) and creative (temperature = 1.2)
+    # variants are independent, so request them concurrently
+    result1, result2 = await asyncio.gather(
+        adapter.generate(
+            prompt=prompt,
+            provider="openai",
+            model="gpt-4o-mini",
+            temperature=0.0,
+            max_tokens=100
+        ),
+        adapter.generate(
+            prompt=prompt,
+            provider="openai",
+            model="gpt-4o-mini",
+            temperature=1.2,
+            max_tokens=100
+        ),
     )
+    
+    print("Deterministic (temperature=0.0):")
     print(f"Response: {result1.text}\n")
     
-    # Creative output (temperature = 1.2)
     print("Creative (temperature=1.2):")
-    result2 = await adapter.generate(
-        prompt=prompt,
-        provider="openai",
-        model="gpt-4o-mini",
-        temperature=1.2,
-        max_tokens=100
-    )
     print(f"Response: {result2.text}\n")
 
 
-async def example_with_config_manager():
+async def example_with_config_manager(adapter: LLMAdapter):
     """Use ConfigManager to get merged parameters"""
     print("=" * 60)
     print("Example 4: Using ConfigManager")
@@ -114,7 +117,6 @@ async def example_with_config_manager():
     print()
     
     # Use these parameters
-    adapter = LLMAdapter()
     result = await adapter.generate(
         prompt="List 3 benefits of async programming",
         provider="openai",
@@ -126,92 +128,82 @@ async def example_with_config_manager():
     print()
 
 
-async def example_provider_specific_params():
+async def example_provider_specific_params(adapter: LLMAdapter):
     """Use provider-specific parameters"""
     print("=" * 60)
     print("Example 5: Provider-Specific Parameters")
     print("=" * 60)
     
-    adapter = LLMAdapter()
+    # OpenAI and Gemini requests are independent, so send them together
+    result1, result2 = await asyncio.gather(
+        # OpenAI with presence_penalty and frequency_penalty
+        adapter.generate(
+            prompt="Write about the importance of code review",
+            provider="openai",
+            model="gpt-4o-mini",
+            temperature=0.7,
+            presence_penalty=0.6,    # Encourage new topics
+            frequency_penalty=0.3,   # Reduce repetition
+            max_tokens=150
+        ),
+        # Gemini with top_k
+        adapter.generate(
+            prompt="Write about the importance of code review",
+            provider="gemini",
+            model="gemini-2.5-flash",
+            temperature=0.7,
+            top_k=40,               # Gemini-specific
+            top_p=0.95,
+            max_tokens=150
+        ),
+    )
     
-    # OpenAI with presence_penalty and frequency_penalty
     print("OpenAI with penalties:")
-    result1 = await adapter.generate(
-        prompt="Write about the importance of code review",
-        provider="openai",
-        model="gpt-4o-mini",
-        temperature=0.7,
-        presence_penalty=0.6,    # Encourage new topics
-        frequency_penalty=0.3,   # Reduce repetition
-        max_tokens=150
-    )
     print(f"Response: {result1.text}\n")
     
-    # Gemini with top_k
     print("Gemini with top_k:")
-    result2 = await adapter.generate(
-        prompt="Write about the importance of code review",
-        provider="gemini",
-        model="gemini-2.5-flash",
-        temperature=0.7,
-        top_k=40,               # Gemini-specific
-        top_p=0.95,
-        max_tokens=150
-    )
     print(f"Response: {result2.text}\n")
 
 
-async def example_reproducible_output():
+async def example_reproducible_output(adapter: LLMAdapter):
     """Generate reproducible output using seed"""
     print("=" * 60)
     print("Example 6: Reproducible Output (with seed)")
     print("=" * 60)
     
-    adapter = LLMAdapter()
     prompt = "Generate a random number between 1 and 100"
     
-    # First run with seed
+    # The three runs are independent; issue them concurrently and print
+    # the results in a fixed order afterwards
+    result1, result2, result3 = await asyncio.gather(*(
+        adapter.generate(
+            prompt=prompt,
+            provider="openai",
+            model="gpt-4o-mini",
+            temperature=0.0,
+            seed=seed
+        )
+        for seed in (12345, 12345, 54321)
+    ))
+    
     print("First run (seed=12345):")
-    result1 = await adapter.generate(
-        prompt=prompt,
-        provider="openai",
-        model="gpt-4o-mini",
-        temperature=0.0,
-        seed=12345
-    )
     print(f"Response: {result1.text}\n")
     
     # Second run with same seed (should be similar)
     print("Second run (seed=12345):")
-    result2 = await adapter.generate(
-        prompt=prompt,
-        provider="openai",
-        model="gpt-4o-mini",
-        temperature=0.0,
-        seed=12345
-    )
     print(f"Response: {result2.text}\n")
     
     # Third run with different seed
     print("Third run (seed=54321):")
-    result3 = await adapter.generate(
-        prompt=prompt,
-        provider="openai",
-        model="gpt-4o-mini",
-        temperature=0.0,
-        seed=54321
-    )
     print(f"Response: {result3.text}\n")
 
 
-async def example_stop_sequences():
+async def example_stop_sequences(adapter: LLMAdapter):
     """Use stop sequences to control output"""
     print("=" * 60)
     print("Example 7: Stop Sequences")
     print("=" * 60)
     
-    adapter = LLMAdapter()
-    
     # Stop at double newline
     result = await adapter.generate(
         prompt="List programming languages:\n1.",
@@ -229,24 +221,50 @@ async def example_stop_sequences():
 
 async def main():
     """Run all examples"""
+    adapter = LLMAdapter()
+    failed = 0
     try:
-        await example_basic_usage()
-        await example_runtime_override()
-        await example_creative_vs_deterministic()
-        await example_with_config_manager()
-        await example_provider_specific_params()
-        await example_reproducible_output()
-        await example_stop_sequences()
+        # Single-request examples are independent of each other
+        independent = [
+            example_basic_usage,
+            example_runtime_override,
+            example_with_config_manager,
+            example_stop_sequences,
+        ]
+        results = await asyncio.gather(
+            *(example(adapter) for example in independent),
+            return_exceptions=True,
+        )
+        for example, result in zip(independent, results):
+            if isinstance(result, Exception):
+                failed += 1
+                log.error("example failed: %s", example.__name__, exc_info=result)
         
-        print("=" * 60)
+        # Comparisons print their variants side by side, so run them in order
+        for example in (
+            example_creative_vs_deterministic,
+            example_provider_specific_params,
+            example_reproducible_output,
+        ):
+            try:
+                await example(adapter)
+            except Exception:
+                failed += 1
+                log.exception("example failed: %s", example.__name__)
+    finally:
+        await adapter.aclose()
+    
+    print("=" * 60)
+    if failed:
+        print(f"Examples completed, {failed} failed (see log above)")
+    else:
         print("All examples completed!")
-        print("=" * 60)
-        
-    except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+    print("=" * 60)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s %(message)s",
+    )
+    run_main(main())
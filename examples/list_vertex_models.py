@@ -6,20 +6,78 @@ in different regions by attempting to initialize them.
 """
 
 import os
+import re
+import sys
+import time
 import asyncio
+from dataclasses import dataclass, field
 import vertexai
 from vertexai.generative_models import GenerativeModel
 
+from _event_loop import run_main
 
 
+# Max number of probes in flight at once (keeps us under Vertex quotas)
+MAX_CONCURRENT_PROBES = 20
+
+# Probes in flight per region, so one region cannot take all global slots
+MAX_PROBES_PER_REGION = 8
+
+# Consecutive throttled probes that open a region's circuit breaker, and how
+# long (seconds) the region is then skipped
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 30.0
+
+# Once a model has been "not found" in this many regions, its remaining
+# regions are skipped. Counted per exact name: a retired pinned version
+# (e.g. "-001") must not suppress probes of the live alias.
+MODEL_MISS_THRESHOLD = 2
+
+NOT_AVAILABLE = "Not available in this region"
+SKIPPED_MISSING = "Skipped (model not found in other regions)"
+THROTTLED = "Throttled (429 / quota exhausted)"
+SKIPPED_THROTTLED = "Skipped (region throttled, circuit open)"
+
+# Classifies probe errors as "model not found" (HTTP 404, NOT_FOUND, not found)
+_NOT_FOUND_RE = re.compile(r"404|not[ _\-]?found", re.IGNORECASE)
+
+# Classifies probe errors as throttling (HTTP 429, RESOURCE_EXHAUSTED)
+_THROTTLED_RE = re.compile(r"429|resource[ _]?exhausted|quota", re.IGNORECASE)
+
+# Location vertexai was last initialized for; vertexai.init is global state
+_initialized_location = None
+
+# GenerativeModel instances reused across probes, keyed by (project, location, model)
+_MODEL_CACHE: dict[tuple[str, str, str], GenerativeModel] = {}
+
+
+def _ensure_init(project_id: str, location: str):
+    """Call vertexai.init only when the location actually changes."""
+    global _initialized_location
+    if _initialized_location != location:
+        vertexai.init(project=project_id, location=location)
+        _initialized_location = location
+
+
+def _get_model(project_id: str, location: str, model_name: str) -> GenerativeModel:
+    """Return the cached GenerativeModel for this region, creating it on first use."""
+    key = (project_id, location, model_name)
+    model = _MODEL_CACHE.get(key)
+    if model is None:
+        # Only a newly constructed model needs vertexai pointed at its region
+        _ensure_init(project_id, location)
+        model = GenerativeModel(model_name)
+        _MODEL_CACHE[key] = model
+    return model
+
 
 async def check_model_availability(project_id: str, location: str, model_name: str):
     """Check if a specific model is available by attempting a simple generation."""
     
-    vertexai.init(project=project_id, location=location)
-    
     try:
-        model = GenerativeModel(model_name)
+        # init + model construction run without an await in between, so the
+        # model captures the right location even with other probes in flight
+        model = _get_model(project_id, location, model_name)
         # Try a minimal generation to verify availability
         response = await model.generate_content_async(
             "Hi",
@@ -29,12 +87,62 @@ async def check_model_availability(project_id: str, location: str, model_name: s
     except Exception as e:
         error_msg = str(e)
         # Check if it's a 404 (model not found) or other error
-        if "404" in error_msg or "not found" in error_msg.lower():
-            return False, "Not available in this region"
+        if _NOT_FOUND_RE.search(error_msg):
+            return False, NOT_AVAILABLE
+        elif _THROTTLED_RE.search(error_msg):
+            return False, THROTTLED
         else:
             return False, f"Error: {error_msg[:80]}"
 
 
+def _status_label(available: bool, error: str | None) -> str:
+    """Short status text for the summary table."""
+    if available:
+        return "✓ Available"
+    if error in (SKIPPED_MISSING, SKIPPED_THROTTLED):
+        return "- Skipped"
+    return "✗ Not Available"
+
+
+@dataclass
+class ProbeState:
+    """Concurrency limits and shared bookkeeping for one availability run."""
+    sem: asyncio.Semaphore
+    region_sems: dict[str, asyncio.Semaphore]
+    model_misses: dict[str, int] = field(default_factory=dict)
+    region_failures: dict[str, int] = field(default_factory=dict)
+    region_open_until: dict[str, float] = field(default_factory=dict)
+
+
+async def _bounded_check(state: ProbeState, project_id: str, location: str, model_name: str):
+    """
+    Run check_model_availability within the global and per-region limits.
+    
+    Returns (model_name, location, (available, error)) so the probe's identity
+    survives as_completed ordering. Models already "not found" in
+    MODEL_MISS_THRESHOLD regions are skipped, as are regions whose circuit
+    breaker is open after BREAKER_THRESHOLD consecutive throttled probes.
+    """
+    async with state.region_sems[location], state.sem:
+        if state.model_misses.get(model_name, 0) >= MODEL_MISS_THRESHOLD:
+            return model_name, location, (False, SKIPPED_MISSING)
+        if time.monotonic() < state.region_open_until.get(location, 0.0):
+            return model_name, location, (False, SKIPPED_THROTTLED)
+        available, error = await check_model_availability(project_id, location, model_name)
+    
+    if error == THROTTLED:
+        failures = state.region_failures.get(location, 0) + 1
+        state.region_failures[location] = failures
+        if failures >= BREAKER_THRESHOLD:
+            state.region_open_until[location] = time.monotonic() + BREAKER_COOLDOWN
+    else:
+        # Any non-throttled answer means the region is responding again
+        state.region_failures[location] = max(state.region_failures.get(location, 0) - 1, 0)
+        state.region_open_until.pop(location, None)
+        if error == NOT_AVAILABLE:
+            state.model_misses[model_name] = state.model_misses.get(model_name, 0) + 1
+    return model_name, location, (available, error)
+
 
 async def main():
     """Main function to check model availability across regions."""
@@ -93,54 +201,64 @@ async def main():
     print("Vertex AI Gemini Model Availability Check")
     print("="*80)
     
-    # Check each model in each region
-    results = {}
-    
-    for model in models_to_check:
-        print(f"\n📦 Checking {model}...")
-        results[model] = {}
-        
-        for region_code, region_name in regions:
-            print(f"  Testing {region_name}...", end=" ", flush=True)
-            available, error = await check_model_availability(project_id, region_code, model)
-            results[model][region_code] = (available, error)
-            
-            if available:
-                print("✓ Available")
-            else:
-                print(f"✗ {error}")
-    
-    # Print summary table
-    print("\n" + "="*80)
-    print("Summary Table")
-    print("="*80)
-    print(f"\n{'Model':<35} | {'Region':<25} | Status")
-    print("-" * 80)
+    # Check every (model, region) pair concurrently. Tasks are created
+    # region by region so vertexai.init runs once per region.
+    state = ProbeState(
+        sem=asyncio.Semaphore(MAX_CONCURRENT_PROBES),
+        region_sems={
+            region_code: asyncio.Semaphore(MAX_PROBES_PER_REGION)
+            for region_code, _ in regions
+        },
+    )
+    tasks = [
+        asyncio.create_task(_bounded_check(state, project_id, region_code, model))
+        for region_code, _ in regions
+        for model in models_to_check
+    ]
     
-    for model in models_to_check:
-        for region_code, region_name in regions:
-            available, error = results[model][region_code]
-            status = "✓ Available" if available else "✗ Not Available"
-            print(f"{model:<35} | {region_name:<25} | {status}")
+    # Report each probe as soon as it finishes
+    region_names = dict(regions)
+    results = {model: {} for model in models_to_check}
+    total = len(tasks)
+    for done, next_result in enumerate(asyncio.as_completed(tasks), start=1):
+        model, region_code, (available, error) = await next_result
+        results[model][region_code] = (available, error)
+        status = "✓ Available" if available else f"✗ {error}"
+        print(f"  [{done}/{total}] {model} @ {region_names[region_code]}... {status}")
     
-    # Print recommendations
-    print("\n" + "="*80)
-    print("Recommendations")
-    print("="*80)
+    # Print summary table (built in memory, written once)
+    lines = [
+        "\n" + "="*80,
+        "Summary Table",
+        "="*80,
+        f"\n{'Model':<35} | {'Region':<25} | Status",
+        "-" * 80,
+    ]
+    lines.extend(
+        f"{model:<35} | {region_name:<25} | {_status_label(*results[model][region_code])}"
+        for model in models_to_check
+        for region_code, region_name in regions
+    )
     
+    # Recommendations
+    lines += ["\n" + "="*80, "Recommendations", "="*80]
     for model in models_to_check:
         available_regions = [
             region_name for (region_code, region_name) in regions
             if results[model][region_code][0]
         ]
-        
+        lines.append(f"\n{model}:")
         if available_regions:
-            print(f"\n{model}:")
-            print(f"  Available in: {', '.join(available_regions)}")
+            lines.append(f"  Available in: {', '.join(available_regions)}")
+        elif all(
+            results[model][region_code][1] in (SKIPPED_MISSING, SKIPPED_THROTTLED)
+            for region_code, _ in regions
+        ):
+            lines.append(f"  - Skipped (not probed in any region)")
         else:
-            print(f"\n{model}:")
-            print(f"  ⚠ Not available in any tested region")
-
+            lines.append(f"  ⚠ Not available in any tested region")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_main(main())
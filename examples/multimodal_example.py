@@ -13,36 +13,32 @@ Supported providers:
 
 import asyncio
 import os
-import base64
-from pathlib import Path
 
 from llm_adapter.adapters.base import ImageInput, MultimodalContent
 from llm_adapter.adapters.openrouter_adapter import OpenRouterAdapter
 from llm_adapter.adapters.gemini_adapter import GeminiAdapter
 from llm_adapter.adapters.dashscope_adapter import DashScopeAdapter
 
+from _event_loop import run_main
 
-async def test_url_mode():
+# Sample image shared by the single-image tests; built once and reused by
+# every provider instead of being reconstructed per test.
+SHARED_IMAGE = ImageInput.from_url(
+    "https://help-static-aliyun-doc.aliyuncs.com/file-manage-files/zh-CN/20241108/ctdzex/biaozhun.jpg"
+)
+
+
+async def test_url_mode(adapter: OpenRouterAdapter):
     """Test multimodal generation with image URL."""
     
     print("=" * 70)
     print("Multimodal Generation - URL Mode")
     print("=" * 70)
     
-    # Example with OpenRouter
-    adapter = OpenRouterAdapter(
-        api_key=os.getenv("OPENROUTER_API_KEY"),
-        base_url=os.getenv("OPENROUTER_BASE_URL")
-    )
-    
     # Create multimodal content with image URL
     content = MultimodalContent(
         text="What's in this image? Please describe it briefly.",
-        images=[
-            ImageInput.from_url(
-                "https://help-static-aliyun-doc.aliyuncs.com/file-manage-files/zh-CN/20241108/ctdzex/biaozhun.jpg"
-            )
-        ]
+        images=[SHARED_IMAGE],
     )
     
     model = "google/gemini-2.0-flash-exp:free"
@@ -61,11 +57,9 @@ async def test_url_mode():
         print(f"\n⚠ {e}")
     except Exception as e:
         print(f"\n✗ Generation failed: {e}")
-    
-    await adapter.aclose()
 
 
-async def test_base64_mode():
+async def test_base64_mode(adapter: OpenRouterAdapter):
     """Test multimodal generation with base64-encoded image."""
     
     print("\n" + "=" * 70)
@@ -76,47 +70,31 @@ async def test_base64_mode():
     # For this example, we'll create a simple test
     # In real usage, you would read an actual image file
     
-    adapter = OpenRouterAdapter(
-        api_key=os.getenv("OPENROUTER_API_KEY"),
-        base_url=os.getenv("OPENROUTER_BASE_URL")
-    )
-    
     # Example: Read image file and encode to base64
-    # image_path = Path("path/to/your/image.jpg")
-    # if image_path.exists():
-    #     with open(image_path, "rb") as f:
-    #         image_data = base64.b64encode(f.read()).decode("utf-8")
-    # else:
+    # (afrom_file streams the file through the encoder in a worker thread,
+    # using pybase64 if installed, and detects the MIME type)
+    # try:
+    #     image = await ImageInput.afrom_file("path/to/your/image.jpg")
+    # except FileNotFoundError:
     #     print("Image file not found, skipping base64 test")
     #     return
     
     # For demo purposes, we'll use a URL instead
     print("Note: Base64 mode requires a local image file.")
     print("Skipping this test. See code comments for implementation.")
-    
-    await adapter.aclose()
 
 
-async def test_dashscope_multimodal():
+async def test_dashscope_multimodal(adapter: DashScopeAdapter):
     """Test multimodal with DashScope (Qwen-VL models)."""
     
     print("\n" + "=" * 70)
     print("DashScope Multimodal Test")
     print("=" * 70)
     
-    adapter = DashScopeAdapter(
-        api_key=os.getenv("DASHSCOPE_API_KEY"),
-        mode="dashscope"
-    )
-    
     # Create multimodal content
     content = MultimodalContent(
         text="请仅输出图像中的文本内容。",
-        images=[
-            ImageInput.from_url(
-                "https://help-static-aliyun-doc.aliyuncs.com/file-manage-files/zh-CN/20241108/ctdzex/biaozhun.jpg"
-            )
-        ]
+        images=[SHARED_IMAGE],
     )
     
     model = "qwen-vl-plus"
@@ -136,30 +114,19 @@ async def test_dashscope_multimodal():
         print("  DashScope multimodal support needs to be implemented")
     except Exception as e:
         print(f"\n✗ Generation failed: {e}")
-    
-    await adapter.aclose()
 
 
-async def test_gemini_multimodal():
+async def test_gemini_multimodal(adapter: GeminiAdapter):
     """Test multimodal with Gemini."""
     
     print("\n" + "=" * 70)
     print("Gemini Multimodal Test")
     print("=" * 70)
     
-    adapter = GeminiAdapter(
-        api_key=os.getenv("GEMINI_API_KEY"),
-        mode="http"
-    )
-    
     # Create multimodal content
     content = MultimodalContent(
         text="What do you see in this image?",
-        images=[
-            ImageInput.from_url(
-                "https://help-static-aliyun-doc.aliyuncs.com/file-manage-files/zh-CN/20241108/ctdzex/biaozhun.jpg"
-            )
-        ]
+        images=[SHARED_IMAGE],
     )
     
     model = "gemini-2.0-flash"
@@ -176,22 +143,15 @@ async def test_gemini_multimodal():
         print("  Gemini multimodal support needs to be implemented")
     except Exception as e:
         print(f"\n✗ Generation failed: {e}")
-    
-    await adapter.aclose()
 
 
-async def test_multiple_images():
+async def test_multiple_images(adapter: OpenRouterAdapter):
     """Test with multiple images in one request."""
     
     print("\n" + "=" * 70)
     print("Multiple Images Test")
     print("=" * 70)
     
-    adapter = OpenRouterAdapter(
-        api_key=os.getenv("OPENROUTER_API_KEY"),
-        base_url=os.getenv("OPENROUTER_BASE_URL")
-    )
-    
     # Create content with multiple images
     content = MultimodalContent(
         text="Compare these images and describe the differences.",
@@ -215,8 +175,6 @@ async def test_multiple_images():
         print(f"\n⚠ {e}")
     except Exception as e:
         print(f"\n✗ Generation failed: {e}")
-    
-    await adapter.aclose()
 
 
 async def main():
@@ -233,11 +191,33 @@ async def main():
         print("\n⚠ Warning: OPENROUTER_API_KEY not set")
         print("Some tests will be skipped")
     
-    await test_url_mode()
-    await test_base64_mode()
-    await test_dashscope_multimodal()
-    await test_gemini_multimodal()
-    await test_multiple_images()
+    # One adapter per provider, shared by every test so each host gets a
+    # single pooled connection instead of a fresh TLS handshake per test
+    openrouter = OpenRouterAdapter(
+        api_key=os.getenv("OPENROUTER_API_KEY"),
+        base_url=os.getenv("OPENROUTER_BASE_URL")
+    )
+    dashscope = DashScopeAdapter(
+        api_key=os.getenv("DASHSCOPE_API_KEY"),
+        mode="dashscope"
+    )
+    gemini = GeminiAdapter(
+        api_key=os.getenv("GEMINI_API_KEY"),
+        mode="http"
+    )
+    
+    try:
+        # The tests are independent network calls (each handles its own
+        # errors), so run them concurrently
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(test_url_mode(openrouter))
+            tg.create_task(test_base64_mode(openrouter))
+            tg.create_task(test_dashscope_multimodal(dashscope))
+            tg.create_task(test_gemini_multimodal(gemini))
+            tg.create_task(test_multiple_images(openrouter))
+    finally:
+        for adapter in (openrouter, dashscope, gemini):
+            await adapter.aclose()
     
     print("\n" + "=" * 70)
     print("Summary")
@@ -265,4 +245,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_main(main())
@@ -6,102 +6,87 @@ through HTTP response headers, not just in the JSON body.
 """
 
 import asyncio
+import logging
 import os
+import sys
+
 from llm_adapter.adapters.openrouter_adapter import OpenRouterAdapter
 
+from _event_loop import run_main
+
+log = logging.getLogger(__name__)
+
 
-async def test_cost_extraction():
+async def run_cost_extraction(adapter: OpenRouterAdapter):
     """Test extracting cost and metadata from OpenRouter response."""
     
-    print("=" * 70)
-    print("OpenRouter Cost & Metadata Extraction Test")
-    print("=" * 70)
-    
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
-        print("\n⚠ Error: OPENROUTER_API_KEY environment variable not set")
-        return
-    
-    adapter = OpenRouterAdapter(
-        api_key=api_key,
-        site_name="LLM Adapter Test",
-        site_url="https://github.com/your-repo"
-    )
+    log.info("=" * 70)
+    log.info("OpenRouter Cost & Metadata Extraction Test")
+    log.info("=" * 70)
     
     # Test with a cheap model
     model = "google/gemini-2.0-flash-lite-001"
     prompt = "Say hello in 5 words."
     
-    print(f"\nTesting with model: {model}")
-    print(f"Prompt: {prompt}")
-    print("\nGenerating response...")
+    log.info("\nTesting with model: %s", model)
+    log.info("Prompt: %s", prompt)
+    log.info("\nGenerating response...")
     
     try:
         result = await adapter.generate(prompt, model)
+    except Exception:
+        log.exception("✗ generate failed for %s", model)
+        return
+    
+    log.info("\n" + "=" * 70)
+    log.info("Response Details")
+    log.info("=" * 70)
+    
+    log.info("\n📝 Generated Text:")
+    log.info("  %s", result.text)
+    
+    log.info("\n🔢 Token Usage:")
+    log.info("  Input tokens:  %s", result.input_tokens)
+    log.info("  Output tokens: %s", result.output_tokens)
+    log.info("  Total tokens:  %s", (result.input_tokens or 0) + (result.output_tokens or 0))
+    
+    log.info("\n💰 Cost Information (from response body):")
+    if result.cost_usd is not None:
+        log.info("  ✓ Cost: $%.6f USD", result.cost_usd)
+        log.info("    (≈ $%.4f per 1K requests)", result.cost_usd * 1000)
+    else:
+        log.info("  ✗ Cost not available in response")
+    
+    log.info("\n🔍 Provider Metadata (from response body):")
+    if result.provider:
+        log.info("  ✓ Provider: %s", result.provider)
+    else:
+        log.info("  ✗ Provider not available")
         
-        print("\n" + "=" * 70)
-        print("Response Details")
-        print("=" * 70)
-        
-        print(f"\n📝 Generated Text:")
-        print(f"  {result.text}")
-        
-        print(f"\n🔢 Token Usage:")
-        print(f"  Input tokens:  {result.input_tokens}")
-        print(f"  Output tokens: {result.output_tokens}")
-        print(f"  Total tokens:  {(result.input_tokens or 0) + (result.output_tokens or 0)}")
-        
-        print(f"\n💰 Cost Information (from response body):")
-        if result.cost_usd is not None:
-            print(f"  ✓ Cost: ${result.cost_usd:.6f} USD")
-            print(f"    (≈ ${result.cost_usd * 1000:.4f} per 1K requests)")
-        else:
-            print(f"  ✗ Cost not available in response")
-        
-        print(f"\n🔍 Provider Metadata (from response body):")
-        if result.provider:
-            print(f"  ✓ Provider: {result.provider}")
-        else:
-            print(f"  ✗ Provider not available")
-            
-        if result.actual_model:
-            print(f"  ✓ Actual Model: {result.actual_model}")
-        else:
-            print(f"  ✗ Actual model not available")
-            
-        if result.latency_ms is not None:
-            print(f"  ✓ Processing Time: {result.latency_ms}ms")
-        else:
-            print(f"  ✗ Processing time not available")
-        
-        # Calculate cost per token if available
-        if result.cost_usd and result.input_tokens and result.output_tokens:
-            total_tokens = result.input_tokens + result.output_tokens
-            cost_per_1m_tokens = (result.cost_usd / total_tokens) * 1_000_000
-            print(f"\n📊 Cost Analysis:")
-            print(f"  Cost per 1M tokens: ${cost_per_1m_tokens:.2f}")
-            print(f"  Cost per token: ${result.cost_usd / total_tokens:.8f}")
+    if result.actual_model:
+        log.info("  ✓ Actual Model: %s", result.actual_model)
+    else:
+        log.info("  ✗ Actual model not available")
         
-    except Exception as e:
-        print(f"\n✗ Error: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    await adapter.aclose()
+    if result.latency_ms is not None:
+        log.info("  ✓ Processing Time: %sms", result.latency_ms)
+    else:
+        log.info("  ✗ Processing time not available")
+    
+    # Calculate cost per token if available
+    if result.cost_usd and result.input_tokens and result.output_tokens:
+        total_tokens = result.input_tokens + result.output_tokens
+        log.info("\n📊 Cost Analysis:")
+        log.info("  Cost per 1M tokens: $%.2f", result.cost_usd / total_tokens * 1_000_000)
+        log.info("  Cost per token: $%.8f", result.cost_usd / total_tokens)
 
 
-async def test_multiple_models():
+async def run_multiple_models(adapter: OpenRouterAdapter):
     """Test cost extraction across different models."""
     
-    print("\n" + "=" * 70)
-    print("Multi-Model Cost Comparison")
-    print("=" * 70)
-    
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
-        return
-    
-    adapter = OpenRouterAdapter(api_key=api_key)
+    log.info("\n" + "=" * 70)
+    log.info("Multi-Model Cost Comparison")
+    log.info("=" * 70)
     
     models = [
         "google/gemini-2.0-flash-lite-001",
@@ -110,31 +95,38 @@ async def test_multiple_models():
     ]
     
     prompt = "Hi"
-    results = []
-    
-    print(f"\nTesting {len(models)} models with prompt: '{prompt}'")
-    print("\nGenerating responses...\n")
-    
-    for model in models:
-        try:
-            result = await adapter.generate(prompt, model)
-            results.append({
-                "model": model,
-                "cost": result.cost_usd,
-                "tokens": (result.input_tokens or 0) + (result.output_tokens or 0),
-                "provider": result.provider,
-                "latency": result.latency_ms
-            })
-            print(f"✓ {model}")
-        except Exception as e:
-            print(f"✗ {model}: {e}")
-            results.append({
-                "model": model,
-                "cost": None,
-                "tokens": 0,
-                "provider": None,
-                "latency": None
-            })
+    
+    log.info("\nTesting %d models with prompt: '%s'", len(models), prompt)
+    log.info("\nGenerating responses...\n")
+    
+    sem = asyncio.Semaphore(8)  # avoid rate-limit bursts as the model list grows
+    
+    async def run(model: str) -> dict:
+        async with sem:
+            try:
+                result = await adapter.generate(prompt, model)
+            except Exception as e:
+                log.warning("✗ %s: %s", model, e)
+                return {
+                    "model": model,
+                    "cost": None,
+                    "tokens": 0,
+                    "provider": None,
+                    "latency": None
+                }
+        log.info("✓ %s", model)
+        return {
+            "model": model,
+            "cost": result.cost_usd,
+            "tokens": (result.input_tokens or 0) + (result.output_tokens or 0),
+            "provider": result.provider,
+            "latency": result.latency_ms
+        }
+    
+    # Requests are independent; run them concurrently, keep table order
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(run(model)) for model in models]
+    results = [task.result() for task in tasks]
     
     # Print comparison table
     print("\n" + "=" * 70)
@@ -143,24 +135,46 @@ async def test_multiple_models():
     print(f"\n{'Model':<40} | {'Cost (USD)':<12} | {'Tokens':<8} | {'Latency':<10}")
     print("-" * 70)
     
+    # One pass: build the table and track the cheapest model and latency stats
+    rows = []
+    cheapest = None
+    latency_sum = latency_count = 0
     for r in results:
-        cost_str = f"${r['cost']:.6f}" if r['cost'] is not None else "N/A"
-        latency_str = f"{r['latency']}ms" if r['latency'] is not None else "N/A"
-        print(f"{r['model']:<40} | {cost_str:<12} | {r['tokens']:<8} | {latency_str:<10}")
-    
-    # Find cheapest
-    valid_results = [r for r in results if r['cost'] is not None]
-    if valid_results:
-        cheapest = min(valid_results, key=lambda x: x['cost'])
+        cost, latency = r['cost'], r['latency']
+        if cost is not None and (cheapest is None or cost < cheapest['cost']):
+            cheapest = r
+        if latency is not None:
+            latency_sum += latency
+            latency_count += 1
+        cost_str = f"${cost:.6f}" if cost is not None else "N/A"
+        latency_str = f"{latency}ms" if latency is not None else "N/A"
+        rows.append(f"{r['model']:<40} | {cost_str:<12} | {r['tokens']:<8} | {latency_str:<10}")
+    print("\n".join(rows))
+    
+    if cheapest is not None:
         print(f"\n💡 Cheapest model: {cheapest['model']} (${cheapest['cost']:.6f})")
-    
-    await adapter.aclose()
+    if latency_count:
+        print(f"⏱  Mean latency: {latency_sum / latency_count:.1f}ms")
 
 
 async def main():
     """Run all tests."""
-    await test_cost_extraction()
-    await test_multiple_models()
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    if not api_key:
+        print("\n⚠ Error: OPENROUTER_API_KEY environment variable not set")
+        return
+    
+    # One adapter (and one pooled HTTP client) for every request
+    adapter = OpenRouterAdapter(
+        api_key=api_key,
+        site_name="LLM Adapter Test",
+        site_url="https://github.com/your-repo"
+    )
+    try:
+        await run_cost_extraction(adapter)
+        await run_multiple_models(adapter)
+    finally:
+        await adapter.aclose()
     
     print("\n" + "=" * 70)
     print("Summary")
@@ -180,4 +194,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    run_main(main())
@@ -9,11 +9,12 @@ OpenRouter 是一个聚合多个 LLM 的平台，支持 OpenAI、Anthropic、Goo
 获取 API Key: https://openrouter.ai/keys
 """
 
-import asyncio
 import os
 
 from llm_adapter.adapters.openrouter_adapter import OpenRouterAdapter
 
+from _event_loop import run_main
+
 
 async def main():
     # 从环境变量获取 API Key
@@ -56,4 +57,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_main(main())
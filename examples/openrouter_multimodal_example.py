@@ -3,6 +3,7 @@
 Usage:
     python openrouter_multimodal_example.py --image ./screenshot.png
     python openrouter_multimodal_example.py --image ./screenshot.png --model qwen/qwen3-vl-30b-a3b-instruct
+    python openrouter_multimodal_example.py --image ./shots/*.png
 
 Requires:
     - OPENROUTER_API_KEY environment variable
@@ -12,16 +13,28 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import base64
 import json
-import mimetypes
 import os
+import sys
 import time
+from operator import itemgetter
 from pathlib import Path
 
 import httpx
 
-from llm_adapter import ConfigManager
+from llm_adapter import ConfigManager, ImageInput
+
+from _event_loop import run_main
+
+try:
+    # orjson encodes the base64-heavy payload and parses the reply much faster
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    _loads = json.loads
 
 PROMPT = """You are a chat screenshot structure parser.
 
@@ -52,98 +65,207 @@ DEFAULT_MODEL = "qwen/qwen-2.5-vl-7b-instruct"
 # DEFAULT_MODEL = "bytedance-seed/seed-1.6-flash"
 DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
 
+try:
+    # msgspec decodes straight into typed structs, skipping the dict walk
+    import msgspec
+
+    class _Usage(msgspec.Struct):
+        prompt_tokens: int | None = None
+        completion_tokens: int | None = None
+        total_tokens: int | None = None
+        cost: float | None = None
+        total_cost: float | None = None
+
+    class _Message(msgspec.Struct):
+        content: str | None = None
+
+    class _Choice(msgspec.Struct):
+        message: _Message
+
+    class _Response(msgspec.Struct):
+        choices: list[_Choice]
+        usage: _Usage = msgspec.field(default_factory=_Usage)
+
+    _response_decoder = msgspec.json.Decoder(_Response)
+
+    def _parse_response(raw: bytes) -> tuple:
+        """Return (content, prompt_tokens, completion_tokens, total_tokens, cost)."""
+        try:
+            resp = _response_decoder.decode(raw)
+            content = resp.choices[0].message.content
+        except (msgspec.ValidationError, IndexError) as exc:
+            raise RuntimeError(f"Unexpected response format: {exc}")
+        u = resp.usage
+        return content, u.prompt_tokens, u.completion_tokens, u.total_tokens, u.total_cost or u.cost
+
+except ImportError:
+    # Response field accessors, bound once
+    _get_choices = itemgetter("choices")
+    _get_first = itemgetter(0)
+    _get_message = itemgetter("message")
+    _get_content = itemgetter("content")
+    _USAGE_KEYS = ("prompt_tokens", "completion_tokens", "total_tokens")
+
+    def _parse_response(raw: bytes) -> tuple:
+        """Return (content, prompt_tokens, completion_tokens, total_tokens, cost)."""
+        data = _loads(raw)
+        try:
+            content = _get_content(_get_message(_get_first(_get_choices(data))))
+        except (KeyError, IndexError) as exc:
+            raise RuntimeError(f"Unexpected response format: {exc}")
+        usage = data.get("usage", {})
+        # Missing keys come back as None, as with usage.get()
+        prompt_tokens, completion_tokens, total_tokens = map(usage.get, _USAGE_KEYS)
+        cost = usage.get("total_cost") or usage.get("cost")
+        return content, prompt_tokens, completion_tokens, total_tokens, cost
+
+# Request body template. The image data URL (often several MiB of base64) is
+# spliced in as raw bytes: base64 and the "data:<mime>;base64," prefix never
+# need JSON escaping, so running it through the encoder is wasted work.
+# The fixed PROMPT carries a cache_control marker so providers with prompt
+# caching (Anthropic, Gemini via OpenRouter) can reuse it across images;
+# other providers ignore the field.
+_BODY_HEAD = (
+    b'{"model":%b,"messages":[{"role":"user","content":['
+    b'{"type":"text","text":%b,"cache_control":{"type":"ephemeral"}},'
+    b'{"type":"image_url","image_url":{"url":"'
+)
+_BODY_TAIL = b'"}}]}]}'
+_PROMPT_JSON = _dumps(PROMPT)
+
 
 def _image_to_data_url(image_path: Path) -> str:
-    mime_type, _ = mimetypes.guess_type(image_path.name)
-    if not mime_type:
-        mime_type = "image/png"
-    data = image_path.read_bytes()
-    encoded = base64.b64encode(data).decode("utf-8")
-    return f"data:{mime_type};base64,{encoded}"
+    # ImageInput.from_file caches the encoded file per (path, mtime, size)
+    return ImageInput.from_file(image_path).to_data_url()
 
 
-async def main() -> None:
+def _build_body(model: str, image_url: str) -> bytes:
+    """Serialize the chat request, encoding only the small fields as JSON."""
+    if '"' in image_url or "\\" in image_url:
+        # Not a plain data/http URL; let the encoder escape it
+        return _dumps({
+            "model": model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": PROMPT,
+                            "cache_control": {"type": "ephemeral"},
+                        },
+                        {"type": "image_url", "image_url": {"url": image_url}},
+                    ],
+                }
+            ],
+        })
+    return b"".join((
+        _BODY_HEAD % (_dumps(model), _PROMPT_JSON),
+        image_url.encode("ascii"),
+        _BODY_TAIL,
+    ))
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="OpenRouter multimodal example.")
-    parser.add_argument("--image", required=True, help="Path to the screenshot image")
+    parser.add_argument(
+        "--image",
+        required=True,
+        nargs="+",
+        help="Path(s) to the screenshot image(s); several are processed in one run",
+    )
     parser.add_argument("--model", default=DEFAULT_MODEL, help="OpenRouter model name")
     parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="OpenRouter base URL")
     parser.add_argument(
         "--api-key",
         help="OpenRouter API key (overrides OPENROUTER_API_KEY)",
     )
-    args = parser.parse_args()
+    return parser.parse_args(argv)
 
-    ConfigManager().load_env_file()
-    api_key = args.api_key or os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
-        raise SystemExit("Missing OPENROUTER_API_KEY environment variable.")
 
-    image_path = Path(args.image)
-    if not image_path.exists():
-        raise SystemExit(f"Image not found: {image_path}")
-
-    image_url = _image_to_data_url(image_path)
-
-    payload = {
-        "model": args.model,
-        "messages": [
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": PROMPT},
-                    {"type": "image_url", "image_url": {"url": image_url}},
-                ],
-            }
-        ],
-    }
+async def _process_image(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict[str, str],
+    model: str,
+    image_path: Path,
+) -> None:
+    """Send one screenshot and print the parsed result and stats.
 
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
+    Raises:
+        RuntimeError: If the image is missing or the response is malformed
+        httpx.HTTPError: If the request fails or returns an error status
+    """
+    # Reading and encoding a large screenshot is blocking work; keep it off
+    # the event loop
+    try:
+        image_url = await asyncio.to_thread(_image_to_data_url, image_path)
+    except FileNotFoundError:
+        raise RuntimeError(f"Image not found: {image_path}")
 
-    start_time = time.monotonic()
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        response = await client.post(
-            f"{args.base_url}/chat/completions",
-            headers=headers,
-            json=payload,
-        )
-        response.raise_for_status()
-        data = response.json()
-    elapsed = time.monotonic() - start_time
+    body = _build_body(model, image_url)
 
-    try:
-        content = data["choices"][0]["message"]["content"]
-    except (KeyError, IndexError) as exc:
-        raise SystemExit(f"Unexpected response format: {exc}")
+    start_ns = time.perf_counter_ns()
+    response = await client.post(url, headers=headers, content=body)
+    response.raise_for_status()
+    elapsed_ns = time.perf_counter_ns() - start_ns
+    content, prompt_tokens, completion_tokens, total_tokens, cost = _parse_response(
+        response.content
+    )
 
     try:
-        parsed = json.loads(content)
+        parsed = _loads(content)
         formatted = json.dumps(parsed, ensure_ascii=False, indent=2)
-    except json.JSONDecodeError:
+    except ValueError:  # json.JSONDecodeError / orjson.JSONDecodeError
         formatted = content
 
     print(formatted)
 
-    usage = data.get("usage", {})
-    prompt_tokens = usage.get("prompt_tokens")
-    completion_tokens = usage.get("completion_tokens")
-    total_tokens = usage.get("total_tokens")
     if total_tokens is None and prompt_tokens is not None and completion_tokens is not None:
         total_tokens = prompt_tokens + completion_tokens
 
-    cost = usage.get("total_cost") or usage.get("cost")
-    header_cost = response.headers.get("x-openrouter-cost")
-    cost = cost or header_cost
+    cost = cost or response.headers.get("x-openrouter-cost")
 
     print("\n--- Stats ---")
-    print(f"Latency: {elapsed:.2f}s")
+    print(f"Latency: {elapsed_ns / 1e9:.2f}s")
     print(f"Prompt tokens: {prompt_tokens}")
     print(f"Completion tokens: {completion_tokens}")
     print(f"Total tokens: {total_tokens}")
     print(f"Cost: {cost}")
 
 
+async def main() -> None:
+    args = _parse_args()
+
+    ConfigManager().load_env_file()
+    api_key = args.api_key or os.getenv("OPENROUTER_API_KEY")
+    if not api_key:
+        raise SystemExit("Missing OPENROUTER_API_KEY environment variable.")
+
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+    url = f"{args.base_url}/chat/completions"
+
+    # Batch runs go through one process and one pooled client instead of
+    # re-launching the interpreter (and re-doing the TLS handshake) per image
+    failed = 0
+    limits = httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60)
+    async with httpx.AsyncClient(timeout=120.0, limits=limits) as client:
+        for image in args.image:
+            if len(args.image) > 1:
+                print(f"\n=== {image} ===")
+            try:
+                await _process_image(client, url, headers, args.model, Path(image))
+            except (RuntimeError, httpx.HTTPError) as exc:
+                # One bad image is counted and reported; the batch goes on
+                print(exc, file=sys.stderr)
+                failed += 1
+
+    if failed:
+        raise SystemExit(1)
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_main(main())
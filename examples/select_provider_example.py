@@ -11,6 +11,7 @@ LLMAdapter 使用示例 - 指定平台和模型
 """
 
 import asyncio
+import functools
 import os
 import sys
 from pathlib import Path
@@ -22,15 +23,17 @@ sys.path.insert(0, str(project_root))
 from llm_adapter.adapter import LLMAdapter
 from llm_adapter.config import ConfigManager
 
+from _event_loop import run_main
 
+
+@functools.lru_cache(maxsize=1)
 def get_config_path() -> str:
-    """获取配置文件路径"""
+    """获取配置文件路径（结果缓存，只解析一次）"""
     # 尝试多个可能的位置
     possible_paths = [
         Path(__file__).parent.parent / "config.yaml",  # 项目根目录
         Path.cwd() / "config.yaml",  # 当前工作目录
     ]
-    print(possible_paths)
     for path in possible_paths:
         if path.exists():
             return str(path)
@@ -138,22 +141,24 @@ async def interactive_mode(adapter: LLMAdapter) -> None:
 
 async def demo_all_providers(adapter: LLMAdapter) -> None:
     """演示调用所有可用平台"""
-    providers = adapter.get_available_providers()
-    print(providers)
     prompt = "用一句话介绍你自己"
     
-    for provider in providers:
+    # 先确定每个平台要调用的模型（取第一个可用模型）
+    targets = []
+    for provider in adapter.get_available_providers():
         models = adapter.get_provider_models(provider)
-        # 选择第一个可用模型
         if models:
-            model = list(models.values())[0]
-            await call_with_provider(adapter, provider, model, prompt)
+            targets.append((provider, next(iter(models.values()))))
+    
+    for provider, model in targets:
+        await call_with_provider(adapter, provider, model, prompt)
 
 
 async def main():
     # 获取配置文件路径
     try:
-        config_path = get_config_path()
+        # 文件系统探测放到线程中，避免阻塞事件循环
+        config_path = await asyncio.to_thread(get_config_path)
         print(f"使用配置文件: {config_path}")
     except FileNotFoundError as e:
         print(f"错误: {e}")
@@ -190,4 +195,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_main(main())
@@ -7,12 +7,13 @@ This example tests the newly implemented multimodal features:
 - Streaming support
 """
 
-import asyncio
 import os
 from llm_adapter.adapters.base import ImageInput, MultimodalContent
 from llm_adapter.adapters.dashscope_adapter import DashScopeAdapter
 from llm_adapter.adapters.openrouter_adapter import OpenRouterAdapter
 
+from _event_loop import run_main
+
 
 async def test_dashscope_url():
     """Test DashScope with URL image."""
@@ -253,4 +254,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_main(main())
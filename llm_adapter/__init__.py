@@ -38,6 +38,12 @@ from .logger import UsageLogger
 # Fallback tracker
 from .fallback_tracker import FallbackTracker, FallbackEvent, FallbackStats, get_fallback_tracker
 
+# Endpoint selector
+from .endpoint_selector import EndpointSelector, EndpointStats
+
+# Rate limiting
+from .rate_limiter import ProviderLimiter, TokenBucket
+
 # Main adapter (unified entry point)
 from .adapter import LLMAdapter, LLMAdapterError, ValidationError
 
@@ -85,6 +91,12 @@ __all__ = [
     "FallbackEvent",
     "FallbackStats",
     "get_fallback_tracker",
+    # Endpoint selector
+    "EndpointSelector",
+    "EndpointStats",
+    # Rate limiting
+    "ProviderLimiter",
+    "TokenBucket",
     # Provider adapters
     "ProviderAdapter",
     "ProviderError",
@@ -8,7 +8,13 @@ and usage logging.
 
 import atexit
 import asyncio
-from typing import AsyncIterator, Literal
+import dataclasses
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import AsyncIterator, Literal, Mapping
+
+import httpx
 
 from .adapters import (
     ProviderAdapter,
@@ -20,11 +26,24 @@ from .adapters import (
     DashScopeAdapter,
     OpenRouterAdapter,
 )
+from .adapters.base import RawLLMResult, _H2_AVAILABLE, _PROXY_KW
 from .billing import BillingEngine, BillingError
 from .config import ConfigManager, ConfigError
 from .logger import UsageLogger
 from .models import LLMRequest, LLMResponse, TokenUsage
-from .router import Router, RouterError
+from .rate_limiter import ProviderLimiter
+from .router import Router, RouterError, RouteResult
+
+
+# Built-in provider adapters, by provider name
+_PROVIDER_ADAPTERS: Mapping[str, type[ProviderAdapter]] = MappingProxyType({
+    "openai": OpenAIAdapter,
+    "gemini": GeminiAdapter,
+    "cloudflare": CloudflareAdapter,
+    "huggingface": HuggingFaceAdapter,
+    "dashscope": DashScopeAdapter,
+    "openrouter": OpenRouterAdapter,
+})
 
 
 class LLMAdapterError(Exception):
@@ -57,20 +76,19 @@ class LLMAdapter:
     # Maximum retry attempts for fallback
     MAX_RETRIES = 3
     
-    # Provider adapter class mapping
-    PROVIDER_ADAPTERS: dict[str, type[ProviderAdapter]] = {
-        "openai": OpenAIAdapter,
-        "gemini": GeminiAdapter,
-        "cloudflare": CloudflareAdapter,
-        "huggingface": HuggingFaceAdapter,
-        "dashscope": DashScopeAdapter,
-        "openrouter": OpenRouterAdapter,
-    }
+    # Seconds to wait for the primary provider before sending a hedged request
+    # (roughly the p50 latency of a high-quality call)
+    HEDGE_DELAY_S = 2.0
+    
+    # Provider adapter class mapping (read-only; subclasses may override it)
+    PROVIDER_ADAPTERS: Mapping[str, type[ProviderAdapter]] = _PROVIDER_ADAPTERS
     
     def __init__(
         self,
         config_manager: ConfigManager | None = None,
         config_path: str | None = None,
+        response_cache_size: int = 0,
+        response_cache_ttl: float | None = None,
     ):
         """
         Initialize LLMAdapter.
@@ -78,6 +96,15 @@ class LLMAdapter:
         Args:
             config_manager: Optional ConfigManager instance. If None, creates one.
             config_path: Optional path to config file (used if config_manager is None)
+            response_cache_size: Max entries in the LRU response cache used by
+                generate and generate_with_provider (0 disables caching).
+                Only enable this for deterministic workloads where identical
+                prompts may reuse an earlier answer. Entries are keyed by
+                (scene, provider, model, prompt) and shared across users:
+                one user's answer is returned to any user sending the same
+                prompt in the same scene.
+            response_cache_ttl: Seconds a cached response stays valid
+                (None: until evicted)
         """
         self._config_manager = config_manager or ConfigManager(config_path)
         self._router = Router(self._config_manager)
@@ -85,6 +112,21 @@ class LLMAdapter:
         self._logger = UsageLogger()
         atexit.register(self._close_on_exit)
         self._adapters: dict[str, ProviderAdapter] = {}
+        # One connection pool shared by every HTTP provider adapter; created
+        # on first use so constructing an LLMAdapter stays cheap
+        self._http_client: httpx.AsyncClient | None = None
+        self._limiters: dict[str, ProviderLimiter] = {}
+        self._response_cache_size = response_cache_size
+        self._response_cache_ttl = response_cache_ttl
+        # (scene, provider, model, prompt) -> (response, monotonic expiry time)
+        self._response_cache: OrderedDict[tuple[str, str, str, str], tuple[LLMResponse, float]] = OrderedDict()
+        self._response_cache_hits = 0
+        self._response_cache_misses = 0
+        # Provider listings derived from the loaded config; dropped when the
+        # config manager reloads (see _sync_listing_cache)
+        self._listing_config: object | None = None
+        self._providers_cache: tuple[str, ...] | None = None
+        self._provider_models_cache: dict[str, dict[str, str]] = {}
 
     @property
     def config_manager(self) -> ConfigManager:
@@ -119,19 +161,23 @@ class LLMAdapter:
         Raises:
             LLMAdapterError: If provider is not supported or not configured
         """
-        if provider in self._adapters:
-            return self._adapters[provider]
+        # Hot path: one dict lookup per call once the adapter exists
+        adapter = self._adapters.get(provider)
+        if adapter is not None:
+            return adapter
         
-        if provider not in self.PROVIDER_ADAPTERS:
-            raise LLMAdapterError(f"Unsupported provider: {provider}")
+        adapter_class = self.PROVIDER_ADAPTERS.get(provider)
+        if adapter_class is None:
+            raise LLMAdapterError(
+                f"Unsupported provider: {provider}. "
+                f"Supported providers: {', '.join(sorted(self.PROVIDER_ADAPTERS))}"
+            )
         
         try:
             provider_config = self._config_manager.get_provider_config(provider)
         except ConfigError as e:
             raise LLMAdapterError(f"Provider not configured: {provider}. {e}")
         
-        adapter_class = self.PROVIDER_ADAPTERS[provider]
-        
         # Build adapter kwargs from provider config
         kwargs = {}
         if provider_config.base_url:
@@ -147,15 +193,122 @@ class LLMAdapter:
                 kwargs["project_id"] = provider_config.project_id
             if provider_config.location:
                 kwargs["location"] = provider_config.location
+            if provider_config.auto_locations:
+                kwargs["auto_locations"] = provider_config.auto_locations
         
         proxy_url = self._config_manager.get_proxy_url()
         if proxy_url:
             kwargs["proxy_url"] = proxy_url
+        if adapter_class.SHARE_HTTP_CLIENT:
+            kwargs["shared_client"] = self._get_http_client()
         
         adapter = adapter_class(api_key=provider_config.api_key, **kwargs)
         self._adapters[provider] = adapter
         return adapter
     
+    async def warmup(
+        self,
+        providers: list[str] | None = None,
+        ping: bool = True,
+        timeout: float = 2.0,
+    ) -> list[str]:
+        """
+        Create provider adapters ahead of time instead of on the first call.
+        
+        Optional but recommended before serving traffic: adapter and HTTP
+        client construction then happen here rather than inside the first
+        user request, and with `ping` each adapter's ping() opens a pooled
+        connection. Ping failures and timeouts are ignored.
+        
+        Args:
+            providers: Providers to warm up (default: all configured providers
+                       with a supported adapter)
+            ping: Also call each adapter's ping() hook
+            timeout: Seconds to wait for each ping
+            
+        Returns:
+            Names of the providers whose adapters are ready
+        """
+        if providers is None:
+            providers = [
+                p for p in self._config_manager.get_available_providers()
+                if p in self.PROVIDER_ADAPTERS
+            ]
+        
+        ready: list[str] = []
+        for provider in providers:
+            try:
+                self._get_adapter(provider)
+            except (LLMAdapterError, ProviderError):
+                # Not configured or missing an optional SDK; skip it here and
+                # let a real call report the error
+                continue
+            ready.append(provider)
+        
+        if ping and ready:
+            await asyncio.gather(
+                *(asyncio.wait_for(self._adapters[p].ping(), timeout) for p in ready),
+                return_exceptions=True,
+            )
+        return ready
+    
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Get the HTTP client shared by provider adapters, creating it if needed.
+        
+        Pool size and timeout come from the `http_client` config section.
+        Adapters with SHARE_HTTP_CLIENT = False keep their own client.
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            http_config = self._config_manager.config.http_client
+            client_kwargs = {
+                "timeout": httpx.Timeout(http_config.timeout, connect=5.0),
+                "limits": httpx.Limits(
+                    max_connections=http_config.max_connections,
+                    max_keepalive_connections=http_config.max_keepalive_connections,
+                ),
+                "http2": _H2_AVAILABLE,
+            }
+            proxy_url = self._config_manager.get_proxy_url()
+            if proxy_url:
+                client_kwargs[_PROXY_KW] = proxy_url
+            self._http_client = httpx.AsyncClient(**client_kwargs)
+        return self._http_client
+    
+    def _get_limiter(self, provider: str) -> ProviderLimiter:
+        """Get or create the rate limiter for a provider from its config."""
+        limiter = self._limiters.get(provider)
+        if limiter is None:
+            provider_config = self._config_manager.get_provider_config(provider)
+            limiter = ProviderLimiter(
+                max_concurrency=provider_config.max_concurrency,
+                requests_per_minute=provider_config.requests_per_minute,
+                tokens_per_minute=provider_config.tokens_per_minute,
+            )
+            self._limiters[provider] = limiter
+        return limiter
+    
+    def _estimate_prompt_tokens(self, provider: str, adapter: ProviderAdapter, prompt: str) -> int:
+        """Estimate prompt tokens for the TPM limit (0 when no TPM limit is set)."""
+        if self._get_limiter(provider).limits_tokens:
+            return adapter.estimate_tokens(prompt, "").input_tokens
+        return 0
+    
+    async def _limited_generate(
+        self, provider: str, adapter: ProviderAdapter, prompt: str, model: str
+    ) -> RawLLMResult:
+        """Call adapter.generate() within the provider's concurrency/rate limits."""
+        limiter = self._get_limiter(provider)
+        async with limiter.slot(self._estimate_prompt_tokens(provider, adapter, prompt)):
+            try:
+                result = await adapter.generate(prompt, model)
+            except ProviderError as e:
+                if e.status_code == 429:
+                    limiter.record_throttled()
+                raise
+        limiter.record_success()
+        return result
+    
     def validate_request(self, request: LLMRequest) -> list[str]:
         """
         Validate an LLM request.
@@ -174,6 +327,9 @@ class LLMAdapter:
         prompt: str,
         scene: Literal["chat", "coach", "persona", "system"],
         quality: Literal["low", "medium", "high"],
+        hedge: bool = False,
+        hedge_delay: float | None = None,
+        no_cache: bool = False,
     ) -> LLMResponse:
         """
         Generate a response from an LLM.
@@ -186,11 +342,23 @@ class LLMAdapter:
         5. Logs the usage
         6. Returns a unified response
         
+        When the response cache is enabled (response_cache_size > 0), a
+        prompt already answered in the same scene by the provider/model the
+        quality routes to is returned from the cache without a provider
+        call, whichever user asked first; such hits are not logged and
+        report cost_usd=0.0. Pass no_cache=True for user-specific prompts.
+        
         Args:
             user_id: User identifier for logging and billing
             prompt: The input prompt to send to the LLM
             scene: Usage scene (chat, coach, persona, system)
             quality: Quality level (low, medium, high)
+            hedge: For quality="high", send a second request to another
+                   provider if the first has not answered within
+                   `hedge_delay` and use whichever succeeds first
+            hedge_delay: Seconds before hedging (default: HEDGE_DELAY_S)
+            no_cache: Bypass the response cache for this call; the answer
+                      is neither looked up nor stored
             
         Returns:
             LLMResponse with generated text, token counts, and cost
@@ -211,7 +379,31 @@ class LLMAdapter:
         if errors:
             raise ValidationError(errors)
         
-        return await self._generate_with_fallback(request)
+        # With the response cache enabled, a prompt already answered by the
+        # provider/model this quality routes to is served from the cache
+        use_cache = self._response_cache_size > 0
+        if use_cache and not no_cache:
+            try:
+                route = self._router.route(quality)
+            except RouterError:
+                pass  # _generate_with_fallback reports the routing error
+            else:
+                cached = self._cache_get((scene, route.provider, route.model, prompt))
+                if cached is not None:
+                    return cached
+        
+        response = None
+        if hedge and quality == "high":
+            routes = self._hedge_routes(quality)
+            if len(routes) >= 2:
+                delay = self.HEDGE_DELAY_S if hedge_delay is None else hedge_delay
+                response = await self._generate_hedged(request, routes, delay)
+        if response is None:
+            response = await self._generate_with_fallback(request)
+        
+        if use_cache and not no_cache:
+            self._cache_put((scene, response.provider, response.model, prompt), response)
+        return response
 
     async def stream(
         self,
@@ -275,12 +467,157 @@ class LLMAdapter:
         
         return await self._generate_with_fallback(request)
     
-    async def _generate_with_fallback(self, request: LLMRequest) -> LLMResponse:
+    async def _generate_on_route(
+        self, request: LLMRequest, provider: str, model: str
+    ) -> LLMResponse:
+        """
+        Call one provider/model and turn the result into a billed, logged response.
+        
+        Args:
+            request: Validated LLMRequest
+            provider: Provider to call
+            model: Model to use
+            
+        Returns:
+            LLMResponse from the provider
+            
+        Raises:
+            ProviderError: If the provider call fails
+        """
+        adapter = self._get_adapter(provider)
+        result = await self._limited_generate(provider, adapter, request.prompt, model)
+        
+        # Get token usage
+        if result.input_tokens is not None and result.output_tokens is not None:
+            input_tokens = result.input_tokens
+            output_tokens = result.output_tokens
+        else:
+            # Fallback to estimation
+            token_usage = adapter.estimate_tokens(request.prompt, result.text)
+            input_tokens = token_usage.input_tokens
+            output_tokens = token_usage.output_tokens
+        
+        # Calculate cost
+        try:
+            cost_usd = self._billing.calculate_cost(
+                provider=provider,
+                model=model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+            )
+        except BillingError:
+            # If no pricing rule, set cost to 0
+            cost_usd = 0.0
+        
+        # Log usage
+        self._logger.log(
+            user_id=request.user_id,
+            provider=provider,
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cost=cost_usd,
+        )
+        
+        return LLMResponse(
+            text=result.text,
+            model=model,
+            provider=provider,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cost_usd=cost_usd,
+        )
+    
+    def _hedge_routes(self, quality: str) -> list[RouteResult]:
+        """
+        Pick two routes on different providers for a hedged call.
+        
+        Returns:
+            [primary, secondary], or fewer when only one provider is available
+        """
+        try:
+            primary = self._router.route(quality)
+        except RouterError:
+            return []
+        try:
+            secondary = self._router.route(quality, excluded_providers={primary.provider})
+        except RouterError:
+            return [primary]
+        secondary.is_fallback = True
+        return [primary, secondary]
+    
+    async def _generate_hedged(
+        self,
+        request: LLMRequest,
+        routes: list[RouteResult],
+        hedge_delay: float,
+    ) -> LLMResponse:
+        """
+        Generate with a hedged second request to cut tail latency.
+        
+        The first route is called immediately. If it has not answered within
+        `hedge_delay` seconds (or fails earlier), the second route is started
+        too, and the first successful response wins; the other call is
+        cancelled. If both fail, the remaining providers are tried through
+        the normal fallback chain.
+        
+        Args:
+            request: Validated LLMRequest
+            routes: Two routes on different providers, in preference order
+            hedge_delay: Seconds to wait for the first route before hedging
+            
+        Returns:
+            LLMResponse from whichever provider answered first
+            
+        Raises:
+            LLMAdapterError: If every provider fails
+        """
+        primary, secondary = routes[0], routes[1]
+        pending = {
+            asyncio.create_task(
+                self._generate_on_route(request, primary.provider, primary.model)
+            )
+        }
+        last_error: BaseException | None = None
+        hedged = False
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=None if hedged else hedge_delay,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    last_error = error
+                if not hedged:
+                    # Primary is slow (timeout) or has failed: start the hedge
+                    hedged = True
+                    pending.add(asyncio.create_task(
+                        self._generate_on_route(request, secondary.provider, secondary.model)
+                    ))
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        try:
+            return await self._generate_with_fallback(
+                request, excluded_providers={primary.provider, secondary.provider}
+            )
+        except LLMAdapterError as e:
+            raise LLMAdapterError(f"{e}. Hedged providers failed with: {last_error}") from e
+    
+    async def _generate_with_fallback(
+        self, request: LLMRequest, excluded_providers: set[str] | None = None
+    ) -> LLMResponse:
         """
         Generate response with automatic fallback on failure.
         
         Args:
             request: Validated LLMRequest
+            excluded_providers: Providers that already failed for this request
             
         Returns:
             LLMResponse from successful provider
@@ -288,7 +625,7 @@ class LLMAdapter:
         Raises:
             LLMAdapterError: If all providers fail
         """
-        failed_providers: set[str] = set()
+        failed_providers: set[str] = set(excluded_providers or ())
         last_error: Exception | None = None
         last_failed_provider: str | None = None
         
@@ -296,7 +633,9 @@ class LLMAdapter:
             try:
                 # Get route (excluding failed providers)
                 if attempt == 0:
-                    route = self._router.route(request.quality)
+                    route = self._router.route(
+                        request.quality, excluded_providers=failed_providers or None
+                    )
                 else:
                     if last_failed_provider is None:
                         raise RouterError(
@@ -305,7 +644,8 @@ class LLMAdapter:
                         )
                     route = self._router.get_fallback(
                         request.quality, 
-                        failed_provider=last_failed_provider
+                        failed_provider=last_failed_provider,
+                        excluded_providers=failed_providers,
                     )
                 
                 provider = route.provider
@@ -315,51 +655,7 @@ class LLMAdapter:
                 if provider in failed_providers:
                     continue
                 
-                # Get adapter and generate
-                adapter = self._get_adapter(provider)
-                result = await adapter.generate(request.prompt, model)
-                
-                # Get token usage
-                if result.input_tokens is not None and result.output_tokens is not None:
-                    input_tokens = result.input_tokens
-                    output_tokens = result.output_tokens
-                else:
-                    # Fallback to estimation
-                    token_usage = adapter.estimate_tokens(request.prompt, result.text)
-                    input_tokens = token_usage.input_tokens
-                    output_tokens = token_usage.output_tokens
-                
-                # Calculate cost
-                try:
-                    cost_usd = self._billing.calculate_cost(
-                        provider=provider,
-                        model=model,
-                        input_tokens=input_tokens,
-                        output_tokens=output_tokens,
-                    )
-                except BillingError:
-                    # If no pricing rule, set cost to 0
-                    cost_usd = 0.0
-                
-                # Log usage
-                self._logger.log(
-                    user_id=request.user_id,
-                    provider=provider,
-                    model=model,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    cost=cost_usd,
-                )
-                
-                # Return response
-                return LLMResponse(
-                    text=result.text,
-                    model=model,
-                    provider=provider,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    cost_usd=cost_usd,
-                )
+                return await self._generate_on_route(request, provider, model)
                 
             except ProviderError as e:
                 failed_providers.add(e.provider)
@@ -383,9 +679,11 @@ class LLMAdapter:
         raise LLMAdapterError(error_msg)
 
     async def aclose(self) -> None:
-        """Close all provider adapters."""
+        """Close all provider adapters and the shared HTTP client."""
         for adapter in self._adapters.values():
             await adapter.aclose()
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
 
     def close(self) -> None:
         """Synchronously close adapters (for application shutdown)."""
@@ -429,6 +727,7 @@ class LLMAdapter:
                     route = self._router.get_fallback(
                         request.quality,
                         failed_provider=last_failed_provider,
+                        excluded_providers=failed_providers,
                     )
 
                 provider = route.provider
@@ -438,10 +737,19 @@ class LLMAdapter:
                     continue
 
                 adapter = self._get_adapter(provider)
-                async for chunk in adapter.stream(request.prompt, model):
-                    streamed_any = True
-                    chunks.append(chunk)
-                    yield chunk
+                limiter = self._get_limiter(provider)
+                estimated = self._estimate_prompt_tokens(provider, adapter, request.prompt)
+                async with limiter.slot(estimated):
+                    try:
+                        async for chunk in adapter.stream(request.prompt, model):
+                            streamed_any = True
+                            chunks.append(chunk)
+                            yield chunk
+                    except ProviderError as e:
+                        if e.status_code == 429:
+                            limiter.record_throttled()
+                        raise
+                limiter.record_success()
 
                 full_text = "".join(chunks)
                 if full_text == "":
@@ -562,20 +870,80 @@ class LLMAdapter:
             If quality is None: List of provider names
         """
         if quality:
+            # Depends on router availability, which changes at runtime
             return self._router.get_available_providers(quality)
-        return self._config_manager.get_available_providers()
+        self._sync_listing_cache()
+        if self._providers_cache is None:
+            self._providers_cache = tuple(self._config_manager.get_available_providers())
+        return list(self._providers_cache)
     
     def get_provider_models(self, provider: str) -> dict[str, str]:
         """
         Get all available models for a provider.
         
+        Results are cached per provider until the config is reloaded.
+        
         Args:
             provider: Provider name
             
         Returns:
             Dictionary mapping tier names (cheap/normal/premium) to model names
         """
-        return self._config_manager.get_provider_models(provider)
+        self._sync_listing_cache()
+        models = self._provider_models_cache.get(provider)
+        if models is None:
+            models = self._config_manager.get_provider_models(provider)
+            self._provider_models_cache[provider] = models
+        return dict(models)
+    
+    def _sync_listing_cache(self) -> None:
+        """Drop cached provider listings if the underlying config was reloaded."""
+        config = self._config_manager.config
+        if config is not self._listing_config:
+            self._listing_config = config
+            self._providers_cache = None
+            self._provider_models_cache.clear()
+    
+    def clear_cache(self) -> None:
+        """Drop all cached responses."""
+        self._response_cache.clear()
+    
+    def get_cache_stats(self) -> dict:
+        """
+        Get response cache statistics.
+        
+        Returns:
+            Dictionary with hits, misses, hit_rate and current size
+        """
+        lookups = self._response_cache_hits + self._response_cache_misses
+        return {
+            "hits": self._response_cache_hits,
+            "misses": self._response_cache_misses,
+            "hit_rate": self._response_cache_hits / lookups if lookups else 0.0,
+            "size": len(self._response_cache),
+        }
+    
+    def _cache_get(self, key: tuple[str, str, str, str]) -> LLMResponse | None:
+        """Look up a cached response, as a zero-cost copy (hits are not billed)."""
+        entry = self._response_cache.get(key)
+        if entry is not None:
+            response, expires_at = entry
+            if expires_at > time.monotonic():
+                self._response_cache.move_to_end(key)
+                self._response_cache_hits += 1
+                return dataclasses.replace(response, cost_usd=0.0)
+            del self._response_cache[key]
+        self._response_cache_misses += 1
+        return None
+    
+    def _cache_put(self, key: tuple[str, str, str, str], response: LLMResponse) -> None:
+        """Store a response, evicting the least recently used entries."""
+        ttl = self._response_cache_ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else float("inf")
+        self._response_cache[key] = (response, expires_at)
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > self._response_cache_size:
+            self._response_cache.popitem(last=False)
     
     async def generate_with_provider(
         self,
@@ -584,11 +952,16 @@ class LLMAdapter:
         provider: str,
         model: str,
         scene: Literal["chat", "coach", "persona", "system"] = "chat",
+        no_cache: bool = False,
     ) -> LLMResponse:
         """
         Generate a response using a specific provider and model.
         
         This bypasses the router and directly calls the specified provider/model.
+        When the response cache is enabled (response_cache_size > 0), an
+        identical (scene, provider, model, prompt) request is answered from
+        the cache without a provider call, even for a different user; such
+        hits are not logged and report cost_usd=0.0.
         
         Args:
             user_id: User identifier for logging and billing
@@ -596,6 +969,8 @@ class LLMAdapter:
             provider: Provider name (e.g., 'openai', 'gemini', 'dashscope')
             model: Model name (e.g., 'gpt-4o', 'gemini-1.5-flash', 'qwen-plus')
             scene: Usage scene (default: 'chat')
+            no_cache: Bypass the response cache for this call; the answer
+                      is neither looked up nor stored
             
         Returns:
             LLMResponse with generated text, token counts, and cost
@@ -610,10 +985,16 @@ class LLMAdapter:
         if not prompt or not prompt.strip():
             raise ValidationError(["prompt is required and cannot be empty"])
         
+        cache_key = (scene, provider, model, prompt)
+        if self._response_cache_size > 0 and not no_cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+        
         # Get adapter and generate
         try:
             adapter = self._get_adapter(provider)
-            result = await adapter.generate(prompt, model)
+            result = await self._limited_generate(provider, adapter, prompt, model)
         except ProviderError as e:
             raise LLMAdapterError(f"Provider error: {e}")
         
@@ -647,7 +1028,7 @@ class LLMAdapter:
             cost=cost_usd,
         )
         
-        return LLMResponse(
+        response = LLMResponse(
             text=result.text,
             model=model,
             provider=provider,
@@ -655,3 +1036,8 @@ class LLMAdapter:
             output_tokens=output_tokens,
             cost_usd=cost_usd,
         )
+        
+        if self._response_cache_size > 0 and not no_cache:
+            self._cache_put(cache_key, response)
+        
+        return response
@@ -12,7 +12,7 @@ from .base import (
 )
 from .openai_adapter import OpenAIAdapter
 from .gemini_adapter import GeminiAdapter
-from .cloudflare_adapter import CloudflareAdapter
+from .cloudflare_adapter import CloudflareAdapter, get_default_cloudflare_adapter
 from .huggingface_adapter import HuggingFaceAdapter
 from .dashscope_adapter import DashScopeAdapter
 from .openrouter_adapter import OpenRouterAdapter
@@ -27,6 +27,7 @@ __all__ = [
     "OpenAIAdapter",
     "GeminiAdapter",
     "CloudflareAdapter",
+    "get_default_cloudflare_adapter",
     "HuggingFaceAdapter",
     "DashScopeAdapter",
     "OpenRouterAdapter",
@@ -0,0 +1,118 @@
+"""
+Shared token counting for adapters whose APIs do not report token usage.
+
+Uses tiktoken's BPE encoders when tiktoken is installed and falls back to the
+~4 characters per token heuristic otherwise.
+"""
+
+import functools
+import hashlib
+from collections import OrderedDict
+from typing import Callable
+
+try:
+    # Optional: real BPE token counts instead of the chars/4 heuristic
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+@functools.lru_cache(maxsize=None)
+def get_encoder(name: str = "cl100k_base"):
+    """
+    Get a BPE encoder by encoding name.
+
+    Building an encoder loads its merge table and compiles its regex, which
+    takes tens of milliseconds, so each encoder is built once per process.
+    Returns None when tiktoken is not installed or the encoding cannot be
+    loaded, so callers fall back to chars/4.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception:
+        # e.g. the BPE file cannot be downloaded; don't retry on every call
+        return None
+
+
+# Texts longer than this are cached by SHA-256 digest instead of by value, so
+# the cache does not pin large prompts in memory
+_HASH_KEY_MIN_CHARS = 8192
+_TOKEN_COUNT_CACHE_SIZE = 4096
+_token_counts: "OrderedDict[tuple[str, str | bytes], int]" = OrderedDict()
+
+
+def cached_count(namespace: str, text: str, count: Callable[[str], int]) -> int:
+    """
+    Memoize a token count in the shared, bounded LRU.
+
+    Short texts are keyed by value, long ones by SHA-256 digest.
+
+    Args:
+        namespace: Separates counters (e.g. an encoding name)
+        text: Text to count
+        count: Counter called on a cache miss
+    """
+    if len(text) < _HASH_KEY_MIN_CHARS:
+        key = (namespace, text)
+    else:
+        key = (namespace, hashlib.sha256(text.encode("utf-8")).digest())
+    result = _token_counts.get(key)
+    if result is not None:
+        _token_counts.move_to_end(key)
+        return result
+    result = _token_counts[key] = count(text)
+    if len(_token_counts) > _TOKEN_COUNT_CACHE_SIZE:
+        _token_counts.popitem(last=False)
+    return result
+
+
+def count_tokens(text: str, model_family: str = "cl100k_base") -> int:
+    """
+    Count tokens in `text`, caching results so repeated system prompts and
+    few-shot examples are only tokenized once.
+
+    cl100k_base serves as a cross-model proxy for providers that do not
+    return usage (e.g. the Llama/Mistral models on Workers AI).
+
+    Args:
+        text: Text to count
+        model_family: tiktoken encoding name
+
+    Returns:
+        Token count, or len(text) // 4 when no encoder is available
+    """
+    encoder = get_encoder(model_family)
+    if encoder is None:
+        return len(text) // 4
+    # Count special-token text like "<|endoftext|>" as ordinary text
+    return cached_count(
+        model_family, text, lambda t: len(encoder.encode(t, disallowed_special=()))
+    )
+
+
+def count_tokens_batch(texts: list[str], model_family: str = "cl100k_base") -> list[int]:
+    """
+    Count tokens for many texts at once, e.g. for a bulk cost estimate.
+
+    Uses tiktoken's encode_batch, which encodes on native threads. Results
+    are not cached, so a one-off batch does not evict the count_tokens cache.
+
+    Args:
+        texts: Texts to count
+        model_family: tiktoken encoding name
+
+    Returns:
+        One token count per text, in order
+    """
+    encoder = get_encoder(model_family)
+    if encoder is None:
+        return [len(text) // 4 for text in texts]
+    return [len(ids) for ids in encoder.encode_batch(texts, disallowed_special=())]
+
+
+def clear_tokenizer_cache() -> None:
+    """Drop cached encoders and token counts (e.g. to free memory in tests)."""
+    get_encoder.cache_clear()
+    _token_counts.clear()
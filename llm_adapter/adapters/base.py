@@ -2,10 +2,270 @@
 Abstract base class for LLM provider adapters.
 """
 
+import asyncio
+import base64
+import binascii
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import AsyncIterator, Literal, Union, List
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Literal, Sequence, Union
 from enum import Enum
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+
+try:
+    # SIMD-accelerated base64 (runtime-dispatched SSSE3/AVX2/NEON); optional
+    import pybase64
+    _b64encode = pybase64.b64encode
+except ImportError:
+    _b64encode = base64.b64encode
+
+try:
+    # Optional: several times faster than json for request bodies carrying
+    # large base64 images, and it parses bytes without a decode step
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        # Same compact, non-ASCII-escaping output httpx produces for json=
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    _json_loads = json.loads
+
+# httpx needs the optional h2 package for HTTP/2
+_H2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# httpx 0.24+ takes `proxy`; older versions only accept `proxies`
+_PROXY_KW = "proxy" if "proxy" in inspect.signature(httpx.AsyncClient).parameters else "proxies"
+
+
+# Image files are encoded in chunks of this many bytes. A multiple of 3 means
+# no chunk produces "=" padding, so the encoded chunks concatenate cleanly.
+_IMAGE_READ_CHUNK = 3 * 64 * 1024
+
+# Process-wide cache of base64-encoded local image files, keyed by
+# (absolute path, mtime_ns, size) so an unchanged file is read and encoded once.
+_IMAGE_FILE_CACHE: "OrderedDict[tuple[str, int, int], tuple[str, str]]" = OrderedDict()
+_IMAGE_FILE_CACHE_MAX_BYTES = 64 * 1024 * 1024  # total size of cached base64 strings
+_image_file_cache_bytes = 0
+# ImageInput.afrom_file encodes in worker threads; guards the cache and byte count
+_IMAGE_FILE_CACHE_LOCK = threading.Lock()
+
+# Payloads above this size are base64-encoded in a worker thread so a
+# multi-megabyte image does not stall the event loop
+_OFFLOAD_ENCODE_BYTES = 256 * 1024
+
+# MIME types for image extensions, used when the file header is not recognized
+_MIME_BY_EXT = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+    ".bmp": "image/bmp",
+    ".tif": "image/tiff",
+    ".tiff": "image/tiff",
+    ".heic": "image/heic",
+}
+
+
+def _guess_image_mime(path: str, head: bytes) -> str:
+    """
+    Determine an image's MIME type from its leading bytes, then its extension.
+    
+    Returns:
+        MIME type, or "" if neither the header nor the extension is known
+    """
+    if head.startswith(b"\x89PNG"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head.startswith(b"GIF8"):
+        return "image/gif"
+    return _MIME_BY_EXT.get(os.path.splitext(path)[1].lower(), "")
+
+
+async def _b64encode_str(data: bytes) -> str:
+    """Base64-encode bytes to str, in a worker thread for large payloads."""
+    if len(data) > _OFFLOAD_ENCODE_BYTES:
+        encoded = await asyncio.to_thread(_b64encode, data)
+    else:
+        encoded = _b64encode(data)
+    return encoded.decode("ascii")
+
+
+# SSE field prefix and end-of-stream sentinel, compared as bytes
+_SSE_DATA = b"data:"
+_SSE_DONE = b"[DONE]"
+
+
+async def _iter_sse_data(
+    response: httpx.Response, bare_lines: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Yield the payload of each server-sent event `data:` line as bytes.
+    
+    Lines are split from the raw byte stream instead of going through
+    httpx's text decoding; _json_loads() accepts the bytes directly, so each
+    event is decoded once, by the JSON parser. Stops at `[DONE]`.
+    
+    Per the SSE spec only a trailing CR and the single space after `data:`
+    are removed; JSON payloads need no further trimming.
+    
+    Args:
+        response: Streaming httpx response
+        bare_lines: Also yield non-empty lines without a `data:` prefix
+                    (providers that stream plain JSON lines)
+    """
+    # Bytes after the last newline; a bytearray so a line spanning many
+    # chunks is appended to in place rather than re-copied per chunk
+    pending = bytearray()
+    async for chunk in response.aiter_bytes():
+        end = chunk.rfind(b"\n")
+        if end == -1:
+            pending += chunk
+            continue
+        if pending:
+            pending += chunk[:end]
+            lines = bytes(pending).split(b"\n")
+            pending[:] = chunk[end + 1:]
+        else:
+            lines = chunk[:end].split(b"\n")
+            pending += chunk[end + 1:]
+        for line in lines:
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            if line.startswith(_SSE_DATA):
+                data = line[6:] if line[5:6] == b" " else line[5:]
+            elif bare_lines:
+                data = line
+            else:
+                continue
+            if data == _SSE_DONE:
+                return
+            if data:
+                yield data
+    data = bytes(pending)
+    if data.endswith(b"\r"):
+        data = data[:-1]
+    if data.startswith(_SSE_DATA):
+        data = data[6:] if data[5:6] == b" " else data[5:]
+    elif not bare_lines:
+        return
+    if data and data != _SSE_DONE:
+        yield data
+
+
+def _encode_image_file(path: str) -> tuple[str, str]:
+    """
+    Read and base64-encode an image file, reusing the cached result when unchanged.
+    
+    Returns:
+        (base64 string, guessed mime type or "")
+    """
+    global _image_file_cache_bytes
+    
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    
+    with _IMAGE_FILE_CACHE_LOCK:
+        cached = _IMAGE_FILE_CACHE.get(key)
+        if cached is not None:
+            _IMAGE_FILE_CACHE.move_to_end(key)
+            return cached
+    
+    # Stream the file through the encoder instead of holding the raw bytes
+    # and the encoded copy in memory at the same time. Reads go into one
+    # reused buffer and the encoded chunks into an output buffer sized for
+    # the whole file, so the only full-size copies are that buffer and the
+    # final str.
+    out = bytearray(4 * ((st.st_size + 2) // 3))
+    buf = bytearray(_IMAGE_READ_CHUNK)
+    view = memoryview(buf)
+    pos = 0
+    head = b""
+    with open(path, "rb") as f:
+        # Buffered readinto only returns a short count at EOF, so every chunk
+        # but the last is a multiple of 3 bytes and encodes without padding
+        while n := f.readinto(buf):
+            if not pos:
+                head = bytes(view[:12])
+            chunk = _b64encode(view[:n])
+            out[pos:pos + len(chunk)] = chunk  # grows if the file grew since stat
+            pos += len(chunk)
+    view.release()
+    del out[pos:]  # the file may have shrunk since stat
+    encoded = out.decode("ascii")
+    entry = (encoded, _guess_image_mime(path, head))
+    
+    # Files larger than the whole budget are returned but not cached
+    if len(encoded) > _IMAGE_FILE_CACHE_MAX_BYTES:
+        return entry
+    with _IMAGE_FILE_CACHE_LOCK:
+        # Another thread may have encoded the same file meanwhile
+        cached = _IMAGE_FILE_CACHE.get(key)
+        if cached is not None:
+            _IMAGE_FILE_CACHE.move_to_end(key)
+            return cached
+        _IMAGE_FILE_CACHE[key] = entry
+        _image_file_cache_bytes += len(encoded)
+        while _image_file_cache_bytes > _IMAGE_FILE_CACHE_MAX_BYTES:
+            _, (old_encoded, _) = _IMAGE_FILE_CACHE.popitem(last=False)
+            _image_file_cache_bytes -= len(old_encoded)
+    return entry
+
+
+def _image_content_hash(image_type: "ImageInputType", data: str) -> str:
+    """
+    SHA-256 identity of an image's content.
+    
+    URLs are hashed after normalizing scheme and host case; base64 input is
+    hashed over the decoded bytes, so re-encoded copies of the same image
+    (e.g. with line breaks) hash equally.
+    """
+    h = hashlib.sha256()
+    if image_type == ImageInputType.URL:
+        parts = urlsplit(data.strip())
+        normalized = urlunsplit((
+            parts.scheme.lower(), parts.netloc.lower(),
+            parts.path, parts.query, parts.fragment,
+        ))
+        h.update(b"url:")
+        h.update(normalized.encode("utf-8"))
+    else:
+        h.update(b"b64:")
+        try:
+            h.update(base64.b64decode(data))
+        except (binascii.Error, ValueError):
+            # Not valid base64; fall back to hashing the string as given
+            h.update(data.encode("utf-8"))
+    return h.hexdigest()
+
+
+# Live URL images by (class, url). Weak values: an entry disappears once no
+# request holds the image any more, so interning never pins memory.
+_URL_IMAGES: "weakref.WeakValueDictionary[tuple[type, str], ImageInput]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _interned_url_image(cls: type, url: str) -> "ImageInput":
+    key = (cls, url)
+    image = _URL_IMAGES.get(key)
+    if image is None:
+        image = _URL_IMAGES[key] = cls(type=ImageInputType.URL, data=url)
+    return image
 
 
 class ImageInputType(str, Enum):
@@ -14,7 +274,7 @@ class ImageInputType(str, Enum):
     BASE64 = "base64"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class ImageInput:
     """
     Image input for multimodal requests.
@@ -22,41 +282,163 @@ class ImageInput:
     Supports two modes:
     - URL mode: Provide image via URL
     - Base64 mode: Provide image as base64-encoded string
+    
+    Instances are immutable and hashable, so one image can be shared by
+    several requests and used as a cache key.
     """
     type: ImageInputType
     data: str  # URL or base64 string
     mime_type: str | None = None  # e.g., "image/jpeg", "image/png" (required for base64)
+    # Memoized content_hash; lives and dies with the instance, so no
+    # module-level cache holds on to multi-megabyte payloads
+    _content_hash: str | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     @classmethod
     def from_url(cls, url: str) -> "ImageInput":
-        """Create ImageInput from URL."""
-        return cls(type=ImageInputType.URL, data=url)
+        """
+        Create ImageInput from URL.
+        
+        URLs are interned while in use, so repeated calls return the same
+        (immutable) instance.
+        """
+        return _interned_url_image(cls, url)
     
     @classmethod
     def from_base64(cls, base64_data: str, mime_type: str = "image/jpeg") -> "ImageInput":
         """Create ImageInput from base64 string."""
         return cls(type=ImageInputType.BASE64, data=base64_data, mime_type=mime_type)
+    
+    @classmethod
+    def from_file(cls, path: str | os.PathLike, mime_type: str | None = None) -> "ImageInput":
+        """
+        Create a base64 ImageInput from a local image file.
+        
+        The encoded content is cached per (path, mtime, size), so sending the
+        same unchanged file again skips both the read and the base64 encode.
+        
+        Args:
+            path: Path to the image file
+            mime_type: MIME type; detected from the file header or extension
+                       if omitted (falls back to "image/png")
+        """
+        encoded, guessed = _encode_image_file(os.fspath(path))
+        return cls(
+            type=ImageInputType.BASE64,
+            data=encoded,
+            mime_type=mime_type or guessed or "image/png",
+        )
+    
+    @classmethod
+    async def afrom_file(cls, path: str | os.PathLike, mime_type: str | None = None) -> "ImageInput":
+        """
+        Async variant of from_file() that reads and encodes in a worker thread.
+        
+        Use this inside coroutines so a large file does not block the event loop.
+        """
+        return await asyncio.to_thread(cls.from_file, path, mime_type)
+    
+    async def materialize(self, client: httpx.AsyncClient) -> "ImageInput":
+        """
+        Download a URL image and return it as a base64 ImageInput.
+        
+        Base64 images are returned unchanged. The MIME type is sniffed from
+        the downloaded bytes, falling back to the response Content-Type.
+        Only needed for providers that cannot fetch image URLs themselves.
+        
+        Args:
+            client: HTTP client used for the download
+            
+        Raises:
+            httpx.HTTPError: If the download fails
+        """
+        if self.type != ImageInputType.URL:
+            return self
+        response = await client.get(self.data, follow_redirects=True)
+        response.raise_for_status()
+        payload = response.content
+        mime_type = (
+            _guess_image_mime(urlsplit(self.data).path, payload[:12])
+            or response.headers.get("content-type", "").split(";")[0].strip()
+            or "image/jpeg"
+        )
+        return type(self)(
+            type=ImageInputType.BASE64,
+            data=await _b64encode_str(payload),
+            mime_type=mime_type,
+        )
+    
+    def to_data_url(self) -> str:
+        """Return the image as a URL (data: URL for base64 input)."""
+        if self.type == ImageInputType.URL:
+            return self.data
+        return f"data:{self.mime_type};base64,{self.data}"
+    
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 hex digest identifying the image content (computed once per instance)."""
+        if self._content_hash is None:
+            object.__setattr__(self, "_content_hash", _image_content_hash(self.type, self.data))
+        return self._content_hash
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MultimodalContent:
     """
     Content for multimodal requests.
     
-    Can contain text and/or images.
+    Can contain text and/or images. `images` accepts any sequence and is
+    stored as a tuple, keeping the content immutable and hashable. Repeated
+    images (same type, data and mime type) are sent only once, in order of
+    first appearance.
     """
     text: str | None = None
-    images: List[ImageInput] | None = None
+    images: Sequence[ImageInput] | None = None
     
     def __post_init__(self):
         if not self.text and not self.images:
             raise ValueError("MultimodalContent must have at least text or images")
+        if self.images is not None:
+            unique = tuple(dict.fromkeys(self.images))
+            if unique != self.images:
+                object.__setattr__(self, "images", unique)
+    
+    async def prepare(self, client: httpx.AsyncClient) -> "MultimodalContent":
+        """
+        Return a copy with every URL image downloaded and base64-encoded.
+        
+        Images are fetched concurrently; large ones are encoded off the
+        event loop (see ImageInput.materialize).
+        
+        Args:
+            client: HTTP client used for the downloads
+        """
+        if not self.images or all(img.type != ImageInputType.URL for img in self.images):
+            return self
+        images = await asyncio.gather(*(img.materialize(client) for img in self.images))
+        return MultimodalContent(text=self.text, images=images)
+    
+    def prefix_hash(self) -> str:
+        """
+        SHA-256 hex digest over the text and the ordered image content hashes.
+        
+        Two contents with the same prompt and the same images (by content,
+        not by object) hash equally, which makes this usable as a key for
+        response or prompt-prefix caches.
+        """
+        h = hashlib.sha256()
+        h.update((self.text or "").encode("utf-8"))
+        for image in self.images or ():
+            h.update(b"\0")
+            h.update(image.content_hash.encode("ascii"))
+        return h.hexdigest()
 
 
 from ..models import TokenUsage
 
 
-@dataclass
+@dataclass(slots=True)
 class RawLLMResult:
     """Raw result from LLM API call before processing."""
     text: str
@@ -78,20 +460,101 @@ class ProviderAdapter(ABC):
     All provider adapters must implement:
     - generate(): Async method to call the LLM API
     - estimate_tokens(): Method to estimate/extract token usage
+    
+    stream() and stream_multimodal() overrides must be async generators
+    (`async def` + `yield`); this is checked when the subclass is defined.
     """
     
     name: str = "base"
     
+    # Whether LLMAdapter may inject its shared HTTP client. Adapters that tune
+    # their own timeout, pool limits or HTTP/2 set this to False so the shared
+    # client's settings do not silently replace theirs.
+    SHARE_HTTP_CLIENT = True
+    
+    # Budget for the per-adapter cache of image data URLs (see _image_url)
+    MM_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    
+    # Methods that must stay async generators in every subclass
+    _ASYNC_GENERATOR_METHODS = ("stream", "stream_multimodal")
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # A sync generator here would be iterated in a worker thread by ASGI
+        # servers (or fail under `async for`), so reject it at import time
+        for method_name in cls._ASYNC_GENERATOR_METHODS:
+            method = cls.__dict__.get(method_name)
+            if method is not None and not inspect.isasyncgenfunction(method):
+                raise TypeError(
+                    f"{cls.__name__}.{method_name}() must be an async generator "
+                    f"(async def ... yield), got {type(method).__name__}"
+                )
+    
     def __init__(self, api_key: str, **kwargs):
         """
         Initialize the adapter.
         
         Args:
             api_key: API key for the provider
-            **kwargs: Additional provider-specific configuration
+            **kwargs: Additional provider-specific configuration.
+                      `shared_client` may be an httpx.AsyncClient owned by
+                      the caller; HTTP adapters then use it instead of
+                      opening their own connection pool.
         """
         self.api_key = api_key
         self.config = kwargs
+        self._shared_client: httpx.AsyncClient | None = kwargs.get("shared_client")
+        self._mm_cache: "OrderedDict[tuple[str, str | None], str]" = OrderedDict()
+        self._mm_cache_bytes = 0
+    
+    def _image_url(self, image: ImageInput) -> str:
+        """
+        Get the URL to send for an image, reusing data URLs by content hash.
+        
+        Building a data URL copies the whole base64 payload; agent loops and
+        image RAG resend the same image with every prompt, so the result is
+        kept in a small LRU keyed by (content hash, MIME type).
+        """
+        if image.type == ImageInputType.URL:
+            return image.data
+        key = (image.content_hash, image.mime_type)
+        data_url = self._mm_cache.get(key)
+        if data_url is not None:
+            self._mm_cache.move_to_end(key)
+            return data_url
+        data_url = image.to_data_url()
+        if len(data_url) <= self.MM_CACHE_MAX_BYTES:
+            self._mm_cache[key] = data_url
+            self._mm_cache_bytes += len(data_url)
+            while self._mm_cache_bytes > self.MM_CACHE_MAX_BYTES:
+                _, old = self._mm_cache.popitem(last=False)
+                self._mm_cache_bytes -= len(old)
+        return data_url
+    
+    def _create_http_client(self, **client_kwargs) -> httpx.AsyncClient:
+        """
+        Get the HTTP client for this adapter.
+        
+        Returns the injected shared client if there is one; otherwise creates
+        a client owned by this adapter, honoring the `proxy_url` config.
+        
+        Args:
+            **client_kwargs: httpx.AsyncClient arguments (timeout, limits, ...)
+        """
+        if self._shared_client is not None:
+            return self._shared_client
+        
+        proxy_url = self.config.get("proxy_url")
+        if proxy_url:
+            client_kwargs[_PROXY_KW] = proxy_url
+        return httpx.AsyncClient(**client_kwargs)
+    
+    async def _close_http_client(self) -> None:
+        """Close this adapter's own HTTP client; a shared client is left open."""
+        client = getattr(self, "_client", None)
+        if client is None or client is self._shared_client or client.is_closed:
+            return
+        await client.aclose()
     
     @abstractmethod
     async def generate(self, prompt: str, model: str) -> RawLLMResult:
@@ -186,6 +649,7 @@ class ProviderAdapter(ABC):
             f"{self.name} adapter does not support multimodal streaming. "
             f"Please use a multimodal-capable model and adapter."
         )
+        yield  # Unreachable; makes this an async generator like the overrides
 
     async def stream(self, prompt: str, model: str) -> AsyncIterator[str]:
         """
@@ -197,10 +661,45 @@ class ProviderAdapter(ABC):
         result = await self.generate(prompt, model)
         yield result.text
 
+    async def generate_from_stream(self, prompt: str, model: str) -> RawLLMResult:
+        """
+        Generate a complete response by consuming stream().
+        
+        Useful where the provider starts answering sooner in streaming mode
+        but the caller wants a single result. Token counts are left unset;
+        use estimate_tokens() on the text.
+        
+        Raises:
+            ProviderError: If the API call fails
+        """
+        chunks: list[str] = []
+        async for chunk in self.stream(prompt, model):
+            chunks.append(chunk)
+        return RawLLMResult(text="".join(chunks), input_tokens=None, output_tokens=None)
+
+    async def ping(self) -> None:
+        """
+        Optional warm-up hook, called by LLMAdapter.warmup().
+        
+        Adapters can override this with a cheap request (e.g. listing models)
+        so the TCP/TLS connection is already pooled before the first real
+        call. The default does nothing.
+        
+        Raises:
+            Exception: Any error; warmup() ignores failures
+        """
+        return None
+
     async def aclose(self) -> None:
         """Optional async cleanup hook for adapters."""
         return None
     
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
     @abstractmethod
     def estimate_tokens(self, prompt: str, output: str) -> TokenUsage:
         """
@@ -2,12 +2,42 @@
 Cloudflare Workers AI provider adapter implementation.
 """
 
-import json
+import asyncio
+import contextlib
+from typing import AsyncIterator
 
 import httpx
 
+try:
+    # Optional: encodes the typed request body in a single C call
+    import msgspec
+except ImportError:
+    msgspec = None
+
 from ..models import TokenUsage
-from .base import ProviderAdapter, ProviderError, RawLLMResult
+from ._tokenizer import count_tokens, count_tokens_batch
+from .base import _H2_AVAILABLE, _iter_sse_data, _json_dumps, _json_loads, ProviderAdapter, ProviderError, RawLLMResult
+
+
+if msgspec is not None:
+    class _Message(msgspec.Struct):
+        role: str
+        content: str
+
+    class _Payload(msgspec.Struct, omit_defaults=True):
+        messages: list[_Message]
+        stream: bool = False
+
+    _encode_payload = msgspec.json.Encoder().encode
+
+    def _chat_body(prompt: str, stream: bool = False) -> bytes:
+        return _encode_payload(_Payload([_Message("user", prompt)], stream))
+else:
+    def _chat_body(prompt: str, stream: bool = False) -> bytes:
+        payload = {"messages": [{"role": "user", "content": prompt}]}
+        if stream:
+            payload["stream"] = True
+        return _json_dumps(payload)
 
 
 class CloudflareAdapter(ProviderAdapter):
@@ -20,49 +50,98 @@ class CloudflareAdapter(ProviderAdapter):
     
     name: str = "cloudflare"
     BASE_URL = "https://api.cloudflare.com/client/v4/accounts"
+    SHARE_HTTP_CLIENT = False  # own client keeps its pool limits and HTTP/2
     
     # Neurons to tokens estimation ratio
     # Based on Cloudflare's billing model where neurons roughly correlate to compute
     NEURONS_TO_TOKENS_RATIO = 0.1  # Approximate: 10 neurons ≈ 1 token
     
-    def __init__(self, api_key: str, account_id: str | None = None, **kwargs):
+    # Default fan-out of generate_many()
+    BATCH_CONCURRENCY = 16
+    
+    def __init__(
+        self,
+        api_key: str,
+        account_id: str | None = None,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = None,
+        http2: bool | None = None,
+        max_concurrent_requests: int | None = None,
+        retain_raw: bool = False,
+        **kwargs,
+    ):
         """
         Initialize Cloudflare adapter.
         
+        Pool settings given here override the `http_client` config. Size the
+        pool to the expected concurrency: requests beyond max_connections
+        wait for a free connection, while each idle keep-alive connection
+        costs roughly 10-20 KB (more with TLS buffers) until keepalive_expiry.
+        None of this applies when a shared client is injected.
+        
         Args:
             api_key: Cloudflare API token
             account_id: Cloudflare account ID
+            max_connections: Maximum concurrent connections (default 200)
+            max_keepalive_connections: Idle connections kept open (default 50)
+            keepalive_expiry: Seconds an idle connection is kept (default 90)
+            http2: Use HTTP/2 when the h2 package is installed (default True)
+            max_concurrent_requests: Cap on in-flight generate/stream calls
+                                     made through this adapter; extra calls
+                                     wait their turn (default: no cap;
+                                     LLMAdapter applies its own per-provider
+                                     max_concurrency)
+            retain_raw: Keep the parsed response dict in
+                        RawLLMResult.raw_response; off by default so results
+                        do not pin the whole payload. Opt in if you need it.
             **kwargs: Additional configuration
         """
         super().__init__(api_key, **kwargs)
         self.account_id = account_id or kwargs.get('account_id', '')
         
-        # Get HTTP client config from config manager
+        # Request URL prefix and headers are identical for every call; build them once
+        self._run_url = f"{self.BASE_URL}/{self.account_id}/ai/run/"
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        self._stream_headers = {**self._headers, "Accept": "text/event-stream"}
+        
+        # Get HTTP client config from config manager. The client lives as
+        # long as the adapter so keep-alive connections to api.cloudflare.com
+        # are reused across generate/stream calls.
         http_config = self.config.get("http_client", {})
-        max_connections = http_config.get("max_connections", 100)
-        max_keepalive = http_config.get("max_keepalive_connections", 20)
+        if max_connections is None:
+            max_connections = http_config.get("max_connections", 200)
+        if max_keepalive_connections is None:
+            max_keepalive_connections = http_config.get("max_keepalive_connections", 50)
+        if keepalive_expiry is None:
+            keepalive_expiry = http_config.get("keepalive_expiry", 90.0)
+        if http2 is None:
+            http2 = http_config.get("http2", True)
         timeout = http_config.get("timeout", 60.0)
+        connect_timeout = http_config.get("connect_timeout", 10.0)
         
-        # Build client kwargs with proxy support for different httpx versions
+        # Build client kwargs (proxy_url is applied by _create_http_client)
         client_kwargs = {
-            "timeout": timeout,
+            "timeout": httpx.Timeout(timeout, connect=connect_timeout),
             "limits": httpx.Limits(
                 max_connections=max_connections,
-                max_keepalive_connections=max_keepalive,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
             ),
+            # HTTP/2 multiplexes concurrent requests over one connection;
+            # httpx needs the optional h2 package for it
+            "http2": http2 and _H2_AVAILABLE,
         }
         
-        # Handle proxy configuration for different httpx versions
-        proxy_url = self.config.get("proxy_url")
-        if proxy_url:
-            try:
-                # Try newer httpx versions (0.24+) that use 'proxy' parameter
-                self._client = httpx.AsyncClient(proxy=proxy_url, **client_kwargs)
-            except TypeError:
-                # Fall back to older httpx versions that use 'proxies' parameter
-                self._client = httpx.AsyncClient(proxies=proxy_url, **client_kwargs)
-        else:
-            self._client = httpx.AsyncClient(**client_kwargs)
+        self._client = self._create_http_client(**client_kwargs)
+        
+        self._semaphore = (
+            asyncio.Semaphore(max_concurrent_requests) if max_concurrent_requests else None
+        )
+        self._retain_raw = retain_raw
     
     async def generate(self, prompt: str, model: str) -> RawLLMResult:
         """
@@ -81,19 +160,15 @@ class CloudflareAdapter(ProviderAdapter):
         if not self.account_id:
             raise ProviderError(self.name, "account_id is required for Cloudflare")
         
-        url = f"{self.BASE_URL}/{self.account_id}/ai/run/{model}"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-        payload = {
-            "messages": [{"role": "user", "content": prompt}],
-        }
+        url = self._run_url + model
+        headers = self._headers
+        body = _chat_body(prompt)
         
         try:
-            response = await self._client.post(url, headers=headers, json=payload)
+            async with self._semaphore or contextlib.nullcontext():
+                response = await self._client.post(url, headers=headers, content=body)
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
         except httpx.TimeoutException:
             raise ProviderError(self.name, "Request timed out")
         except httpx.HTTPStatusError as e:
@@ -105,16 +180,21 @@ class CloudflareAdapter(ProviderAdapter):
         except Exception as e:
             raise ProviderError(self.name, f"Request failed: {str(e)}")
         
+        # Successful responses always carry both keys; only fall back to the
+        # defensive lookups for error or unexpected payloads
+        try:
+            success = data["success"]
+            text = data["result"]["response"]
+        except (KeyError, TypeError):
+            success = data.get("success", False)
+            text = (data.get("result") or {}).get("response", "")
+        
         # Check for API errors
-        if not data.get("success", False):
+        if not success:
             errors = data.get("errors", [])
             error_msg = errors[0].get("message", "Unknown error") if errors else "Unknown error"
             raise ProviderError(self.name, f"API error: {error_msg}")
         
-        # Extract response text
-        result = data.get("result", {})
-        text = result.get("response", "")
-        
         if not text:
             raise ProviderError(self.name, "Empty response from API")
         
@@ -124,56 +204,96 @@ class CloudflareAdapter(ProviderAdapter):
             text=text,
             input_tokens=None,
             output_tokens=None,
-            raw_response=data
+            raw_response=data if self._retain_raw else None
         )
 
-    async def stream(self, prompt: str, model: str):
+    async def stream(self, prompt: str, model: str) -> AsyncIterator[str]:
         """Stream response text from Cloudflare Workers AI."""
         if not self.account_id:
             raise ProviderError(self.name, "account_id is required for Cloudflare")
 
-        url = f"{self.BASE_URL}/{self.account_id}/ai/run/{model}"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "Accept": "text/event-stream",
-        }
-        payload = {
-            "messages": [{"role": "user", "content": prompt}],
-            "stream": True,
-        }
+        url = self._run_url + model
+        headers = self._stream_headers
+        body = _chat_body(prompt, stream=True)
 
-        async with self._client.stream("POST", url, headers=headers, json=payload) as response:
-            response.raise_for_status()
-            async for line in response.aiter_lines():
-                if not line:
-                    continue
-                if line.startswith("data: "):
-                    data = line[6:].strip()
-                else:
-                    data = line.strip()
-                if data == "[DONE]":
-                    break
-                try:
-                    payload = json.loads(data)
-                except json.JSONDecodeError:
-                    continue
-                result = payload.get("result", payload)
-                text = None
-                if isinstance(result, dict):
-                    text = result.get("response") or result.get("text")
-                if text:
-                    yield text
+        async with self._semaphore or contextlib.nullcontext():
+            async with self._client.stream("POST", url, headers=headers, content=body) as response:
+                response.raise_for_status()
+                async for data in _iter_sse_data(response, bare_lines=True):
+                    try:
+                        payload = _json_loads(data)
+                    except ValueError:
+                        continue
+                    result = payload.get("result", payload)
+                    text = None
+                    if isinstance(result, dict):
+                        text = result.get("response") or result.get("text")
+                    if text:
+                        yield text
+
+    async def generate_many(
+        self,
+        prompts: list[str],
+        model: str,
+        max_concurrency: int | None = None,
+    ) -> list[RawLLMResult | ProviderError]:
+        """
+        Generate responses for a batch of prompts concurrently.
+        
+        A failed prompt does not cancel the rest: its slot in the result
+        list holds the ProviderError instead of a RawLLMResult.
+        
+        Args:
+            prompts: Input prompts
+            model: Model identifier
+            max_concurrency: Prompts in flight at once (default
+                             BATCH_CONCURRENCY); max_concurrent_requests
+                             still applies on top of this
+            
+        Returns:
+            One result or error per prompt, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.BATCH_CONCURRENCY)
+        
+        async def run(prompt: str) -> RawLLMResult:
+            async with semaphore:
+                return await self.generate(prompt, model)
+        
+        results = await asyncio.gather(
+            *(run(prompt) for prompt in prompts), return_exceptions=True
+        )
+        return [
+            r if isinstance(r, (RawLLMResult, ProviderError))
+            else ProviderError(self.name, f"Request failed: {r}")
+            for r in results
+        ]
 
+    async def ping(self, connections: int = 2) -> None:
+        """
+        Open pooled connections to api.cloudflare.com before real traffic.
+        
+        Sends `connections` concurrent HEAD requests so DNS, TCP and TLS are
+        done ahead of the first generate(); the response status is ignored.
+        Called by LLMAdapter.warmup().
+        
+        Args:
+            connections: Number of concurrent requests (connections to open)
+        """
+        await asyncio.gather(
+            *(self._client.head(self.BASE_URL) for _ in range(connections))
+        )
+    
     async def aclose(self) -> None:
-        await self._client.aclose()
+        await self._close_http_client()
     
     def estimate_tokens(self, prompt: str, output: str) -> TokenUsage:
         """
         Estimate token usage for Cloudflare Workers AI.
         
         Cloudflare uses neurons for billing, not tokens directly.
-        This method estimates tokens based on character count heuristics.
+        Tokens are counted with tiktoken's cl100k_base BPE when tiktoken is
+        installed, otherwise estimated from character count (~4 chars/token),
+        which miscounts code and non-ASCII text noticeably.
         
         Args:
             prompt: The input prompt
@@ -182,16 +302,29 @@ class CloudflareAdapter(ProviderAdapter):
         Returns:
             TokenUsage with estimated token counts
         """
-        # Estimation based on character count
-        # Cloudflare models (like Llama) typically use ~4 chars per token
-        input_tokens = max(1, len(prompt) // 4)
-        output_tokens = max(1, len(output) // 4)
+        input_tokens = max(1, count_tokens(prompt))
+        output_tokens = max(1, count_tokens(output))
         
         return TokenUsage(
             input_tokens=input_tokens,
             output_tokens=output_tokens
         )
     
+    def estimate_tokens_batch(self, prompts: list[str]) -> list[int]:
+        """
+        Estimate input tokens for many prompts in one call.
+        
+        Cheaper than calling estimate_tokens() per prompt when pricing a
+        large batch up front.
+        
+        Args:
+            prompts: The input prompts
+            
+        Returns:
+            Estimated input token count per prompt (at least 1)
+        """
+        return [max(1, n) for n in count_tokens_batch(prompts)]
+    
     def estimate_tokens_from_neurons(self, neurons: int) -> int:
         """
         Convert Cloudflare neurons to approximate token count.
@@ -203,3 +336,31 @@ class CloudflareAdapter(ProviderAdapter):
             Estimated token count
         """
         return max(1, int(neurons * self.NEURONS_TO_TOKENS_RATIO))
+
+
+# Process-wide adapters handed out by get_default_cloudflare_adapter()
+_DEFAULT_ADAPTERS: dict[tuple, CloudflareAdapter] = {}
+
+
+def get_default_cloudflare_adapter(
+    api_key: str, account_id: str, **kwargs
+) -> CloudflareAdapter:
+    """
+    Get a shared CloudflareAdapter for these credentials.
+    
+    Creating an adapter per request opens a new connection pool each time
+    and throws away keep-alive connections. This returns one adapter per
+    (api_key, account_id, kwargs) for the whole process instead, which is
+    safe to use from concurrent coroutines on one event loop. A closed
+    adapter is replaced on the next call.
+    
+    Args:
+        api_key: Cloudflare API token
+        account_id: Cloudflare account ID
+        **kwargs: CloudflareAdapter arguments (must be hashable)
+    """
+    key = (api_key, account_id, frozenset(kwargs.items()))
+    adapter = _DEFAULT_ADAPTERS.get(key)
+    if adapter is None or adapter._client.is_closed:
+        adapter = _DEFAULT_ADAPTERS[key] = CloudflareAdapter(api_key, account_id, **kwargs)
+    return adapter
@@ -3,16 +3,22 @@
 Supports HTTP API and official SDK modes.
 """
 
-import json
 import time
 
-from typing import Literal, Optional
+from typing import AsyncIterator, Literal, Optional
 
 import httpx
 
 from ..models import TokenUsage
 from ..request_logger import get_logger
-from .base import ProviderAdapter, ProviderError, RawLLMResult, MultimodalContent, ImageInput, ImageInputType
+from .base import _iter_sse_data, _json_dumps, _json_loads, ProviderAdapter, ProviderError, RawLLMResult, MultimodalContent, ImageInput
+
+
+# Request "parameters" blocks, shared by every call; only ever serialized,
+# never mutated
+_TEXT_PARAMS = {"result_format": "message"}
+_TEXT_STREAM_PARAMS = {"result_format": "message", "incremental_output": True}
+_MULTIMODAL_STREAM_PARAMS = {"incremental_output": True}
 
 
 class DashScopeAdapter(ProviderAdapter):
@@ -75,6 +81,15 @@ class DashScopeAdapter(ProviderAdapter):
         else:
             self.base_url = self.DEFAULT_BASE_URL
         
+        # Request URLs and headers are identical for every call; build them once
+        self._text_url = f"{self.base_url}/services/aigc/text-generation/generation"
+        self._multimodal_url = f"{self.base_url}/services/aigc/multimodal-generation/generation"
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        self._stream_headers = {**self._headers, "Accept": "text/event-stream"}
+        
         # 初始化日志记录器
         self._logger = get_logger(self.name)
         
@@ -95,7 +110,7 @@ class DashScopeAdapter(ProviderAdapter):
         max_keepalive = http_config.get("max_keepalive_connections", 20)
         timeout = http_config.get("timeout", 60.0)
         
-        # Build client kwargs with proxy support for different httpx versions
+        # Build client kwargs (proxy_url is applied by _create_http_client)
         client_kwargs = {
             "timeout": timeout,
             "limits": httpx.Limits(
@@ -104,17 +119,7 @@ class DashScopeAdapter(ProviderAdapter):
             ),
         }
         
-        # Handle proxy configuration for different httpx versions
-        proxy_url = self.config.get("proxy_url")
-        if proxy_url:
-            try:
-                # Try newer httpx versions (0.24+) that use 'proxy' parameter
-                self._client = httpx.AsyncClient(proxy=proxy_url, **client_kwargs)
-            except TypeError:
-                # Fall back to older httpx versions that use 'proxies' parameter
-                self._client = httpx.AsyncClient(proxies=proxy_url, **client_kwargs)
-        else:
-            self._client = httpx.AsyncClient(**client_kwargs)
+        self._client = self._create_http_client(**client_kwargs)
     
     def _init_dashscope_sdk(self):
         """Initialize the official DashScope SDK."""
@@ -154,7 +159,7 @@ class DashScopeAdapter(ProviderAdapter):
             return await self._generate_sdk(prompt, model)
         return await self._generate_http(prompt, model)
 
-    async def stream(self, prompt: str, model: str):
+    async def stream(self, prompt: str, model: str) -> AsyncIterator[str]:
         """Stream response text from DashScope."""
         if self.mode == "dashscope":
             async for chunk in self._stream_sdk(prompt, model):
@@ -170,24 +175,19 @@ class DashScopeAdapter(ProviderAdapter):
         result = None
         
         try:
-            url = f"{self.base_url}/services/aigc/text-generation/generation"
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
+            url = self._text_url
+            headers = self._headers
             payload = {
                 "model": model,
                 "input": {
                     "messages": [{"role": "user", "content": prompt}]
                 },
-                "parameters": {
-                    "result_format": "message",
-                },
+                "parameters": _TEXT_PARAMS,
             }
             
-            response = await self._client.post(url, headers=headers, json=payload)
+            response = await self._client.post(url, headers=headers, content=_json_dumps(payload))
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             # Check for API-level errors
             if "code" in data and data["code"] != "":
@@ -312,42 +312,27 @@ class DashScopeAdapter(ProviderAdapter):
 
     async def _stream_http(self, prompt: str, model: str):
         """Stream using direct HTTP API calls."""
-        url = f"{self.base_url}/services/aigc/text-generation/generation"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "Accept": "text/event-stream",
-        }
+        url = self._text_url
+        headers = self._stream_headers
         payload = {
             "model": model,
             "input": {
                 "messages": [{"role": "user", "content": prompt}]
             },
-            "parameters": {
-                "result_format": "message",
-                "incremental_output": True,
-            },
+            "parameters": _TEXT_STREAM_PARAMS,
         }
 
-        async with self._client.stream("POST", url, headers=headers, json=payload) as response:
+        async with self._client.stream("POST", url, headers=headers, content=_json_dumps(payload)) as response:
             response.raise_for_status()
-            async for line in response.aiter_lines():
-                if not line:
-                    continue
-                if line.startswith("data:"):
-                    data = line[5:].strip()
-                else:
-                    data = line.strip()
-                if not data or data == "[DONE]":
-                    continue
+            async for data in _iter_sse_data(response, bare_lines=True):
                 try:
-                    payload = json.loads(data)
+                    payload = _json_loads(data)
                     output = payload.get("output", {})
                     choices = output.get("choices", [])
                     if not choices:
                         continue
                     text = choices[0].get("message", {}).get("content")
-                except (json.JSONDecodeError, AttributeError):
+                except (ValueError, AttributeError):
                     continue
                 if text:
                     yield text
@@ -396,7 +381,7 @@ class DashScopeAdapter(ProviderAdapter):
         self,
         content: MultimodalContent,
         model: str
-    ):
+    ) -> AsyncIterator[str]:
         """Stream multimodal response (text + images)."""
         if self.mode == "dashscope":
             async for chunk in self._stream_multimodal_sdk(content, model):
@@ -412,12 +397,8 @@ class DashScopeAdapter(ProviderAdapter):
         # Add images first
         if content.images:
             for image in content.images:
-                if image.type == ImageInputType.URL:
-                    message_content.append({"image": image.data})
-                elif image.type == ImageInputType.BASE64:
-                    # DashScope base64 format
-                    data_url = f"data:{image.mime_type};base64,{image.data}"
-                    message_content.append({"image": data_url})
+                # DashScope accepts a URL or a base64 data URL
+                message_content.append({"image": self._image_url(image)})
         
         # Add text
         if content.text:
@@ -436,11 +417,8 @@ class DashScopeAdapter(ProviderAdapter):
         result = None
         
         try:
-            url = f"{self.base_url}/services/aigc/multimodal-generation/generation"
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
+            url = self._multimodal_url
+            headers = self._headers
             
             messages = self._build_multimodal_messages(content)
             
@@ -454,9 +432,9 @@ class DashScopeAdapter(ProviderAdapter):
             if not self._client:
                 raise ProviderError(self.name, "HTTP client not initialized")
             
-            response = await self._client.post(url, headers=headers, json=payload)
+            response = await self._client.post(url, headers=headers, content=_json_dumps(payload))
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             # Check for API-level errors
             if "code" in data and data["code"] != "":
@@ -604,12 +582,8 @@ class DashScopeAdapter(ProviderAdapter):
         model: str
     ):
         """Stream multimodal response using HTTP API."""
-        url = f"{self.base_url}/services/aigc/multimodal-generation/generation"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "Accept": "text/event-stream",
-        }
+        url = self._multimodal_url
+        headers = self._stream_headers
         
         messages = self._build_multimodal_messages(content)
         
@@ -618,27 +592,17 @@ class DashScopeAdapter(ProviderAdapter):
             "input": {
                 "messages": messages
             },
-            "parameters": {
-                "incremental_output": True,
-            },
+            "parameters": _MULTIMODAL_STREAM_PARAMS,
         }
         
         if not self._client:
             raise ProviderError(self.name, "HTTP client not initialized")
         
-        async with self._client.stream("POST", url, headers=headers, json=payload) as response:
+        async with self._client.stream("POST", url, headers=headers, content=_json_dumps(payload)) as response:
             response.raise_for_status()
-            async for line in response.aiter_lines():
-                if not line:
-                    continue
-                if line.startswith("data:"):
-                    data = line[5:].strip()
-                else:
-                    data = line.strip()
-                if not data or data == "[DONE]":
-                    continue
+            async for data in _iter_sse_data(response, bare_lines=True):
                 try:
-                    payload = json.loads(data)
+                    payload = _json_loads(data)
                     output = payload.get("output", {})
                     choices = output.get("choices", [])
                     if not choices:
@@ -651,7 +615,7 @@ class DashScopeAdapter(ProviderAdapter):
                                 text = item["text"]
                                 if text:
                                     yield text
-                except (json.JSONDecodeError, AttributeError):
+                except (ValueError, AttributeError):
                     continue
     
     async def _stream_multimodal_sdk(
@@ -694,8 +658,7 @@ class DashScopeAdapter(ProviderAdapter):
                 )
 
     async def aclose(self) -> None:
-        if self._client:
-            await self._client.aclose()
+        await self._close_http_client()
     
     def estimate_tokens(self, prompt: str, output: str) -> TokenUsage:
         """
@@ -3,17 +3,17 @@ Google Gemini provider adapter implementation.
 Supports HTTP API, official SDK, and Vertex AI SDK modes.
 """
 
-import json
 import time
 
-from typing import Literal, Optional
+from typing import AsyncIterator, Literal, Optional
 
 import httpx
 
 from ..models import TokenUsage
+from ..endpoint_selector import EndpointSelector, EndpointStats
 from ..fallback_tracker import get_fallback_tracker
 from ..request_logger import get_logger
-from .base import ProviderAdapter, ProviderError, RawLLMResult
+from .base import _H2_AVAILABLE, _iter_sse_data, _json_dumps, _json_loads, ProviderAdapter, ProviderError, RawLLMResult
 
 
 class GeminiAdapter(ProviderAdapter):
@@ -43,6 +43,9 @@ class GeminiAdapter(ProviderAdapter):
     
     name: str = "gemini"
     BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+    SHARE_HTTP_CLIENT = False  # own client keeps its HTTP/2 and keep-alive tuning
+    # Candidate locations for vertex mode with location="auto"
+    DEFAULT_AUTO_LOCATIONS = ("global", "us-central1", "us-east4", "europe-west1", "asia-southeast1")
     
     def __init__(
         self, 
@@ -66,12 +69,16 @@ class GeminiAdapter(ProviderAdapter):
             location: GCP region (required for vertex mode)
                       - "global" (recommended): Google auto-selects best available zone
                       - Specific region: "us-central1", "europe-west1", "asia-southeast1", etc.
+                      - "auto": pick the fastest of `auto_locations` per request,
+                        based on measured latency
                       If not provided, reads from config
             enable_region_fallback: Enable automatic fallback to global region on failure
                                    If not provided, reads from config (default: True)
             fallback_location: Fallback region to use
                               If not provided, reads from config (default: "us-central1")
-            **kwargs: Additional configuration
+            **kwargs: Additional configuration. `auto_locations` lists the
+                      candidate regions for location="auto"
+                      (default: DEFAULT_AUTO_LOCATIONS)
         """
         super().__init__(api_key, **kwargs)
         
@@ -98,6 +105,7 @@ class GeminiAdapter(ProviderAdapter):
         self.fallback_location = fallback_location
         self._sdk_client = None
         self._vertex_model_cache = {}  # Cache for Vertex AI models
+        self._endpoint_selector: EndpointSelector | None = None  # location="auto" only
         self._client: httpx.AsyncClient | None = None
         self._fallback_tracker = get_fallback_tracker()
         self._logger = get_logger(self.name)  # 添加日志记录器
@@ -106,29 +114,26 @@ class GeminiAdapter(ProviderAdapter):
             # Get HTTP client config from config manager
             http_config = self.config.get("http_client", {})
             max_connections = http_config.get("max_connections", 100)
-            max_keepalive = http_config.get("max_keepalive_connections", 20)
+            max_keepalive = http_config.get("max_keepalive_connections", 50)
+            keepalive_expiry = http_config.get("keepalive_expiry", 60.0)
             timeout = http_config.get("timeout", 60.0)
+            connect_timeout = http_config.get("connect_timeout", 5.0)
+            # HTTP/2 multiplexes concurrent requests over one connection;
+            # httpx needs the optional h2 package for it
+            http2 = http_config.get("http2", True) and _H2_AVAILABLE
             
-            # Build client kwargs with proxy support for different httpx versions
+            # Build client kwargs (proxy_url is applied by _create_http_client)
             client_kwargs = {
-                "timeout": timeout,
+                "timeout": httpx.Timeout(timeout, connect=connect_timeout),
                 "limits": httpx.Limits(
                     max_connections=max_connections,
                     max_keepalive_connections=max_keepalive,
+                    keepalive_expiry=keepalive_expiry,
                 ),
+                "http2": http2,
             }
             
-            # Handle proxy configuration for different httpx versions
-            proxy_url = self.config.get("proxy_url")
-            if proxy_url:
-                try:
-                    # Try newer httpx versions (0.24+) that use 'proxy' parameter
-                    self._client = httpx.AsyncClient(proxy=proxy_url, **client_kwargs)
-                except TypeError:
-                    # Fall back to older httpx versions that use 'proxies' parameter
-                    self._client = httpx.AsyncClient(proxies=proxy_url, **client_kwargs)
-            else:
-                self._client = httpx.AsyncClient(**client_kwargs)
+            self._client = self._create_http_client(**client_kwargs)
         
         if mode == "sdk":
             self._init_sdk()
@@ -192,9 +197,17 @@ class GeminiAdapter(ProviderAdapter):
                 f"GOOGLE_APPLICATION_CREDENTIALS points to non-existent file: {creds_path}"
             )
         
+        init_location = self.location
+        if self.location == "auto":
+            locations = self.config.get("auto_locations") or self.DEFAULT_AUTO_LOCATIONS
+            self._endpoint_selector = EndpointSelector(locations)
+            init_location = self._endpoint_selector.locations[0]
+            # Region fallback is replaced by latency-based selection
+            self.enable_region_fallback = False
+        
         try:
             import vertexai
-            vertexai.init(project=self.project_id, location=self.location)
+            vertexai.init(project=self.project_id, location=init_location)
             self._vertexai = vertexai
         except ImportError:
             raise ProviderError(
@@ -215,12 +228,102 @@ class GeminiAdapter(ProviderAdapter):
                 f"Failed to initialize Vertex AI: {error_msg}"
             )
     
-    def _get_vertex_model(self, model: str):
-        """Get or create a cached Vertex AI GenerativeModel instance."""
-        if model not in self._vertex_model_cache:
+    def _get_vertex_model(self, model: str, location: str | None = None):
+        """
+        Get or create a cached Vertex AI GenerativeModel instance.
+        
+        With `location` (location="auto" mode) the instance is cached per
+        (location, model) and built from the full publisher model resource
+        name, which binds it to that location without calling vertexai.init;
+        the process-wide init state other adapters rely on stays untouched.
+        """
+        key = model if location is None else (location, model)
+        if key not in self._vertex_model_cache:
             from vertexai.generative_models import GenerativeModel
-            self._vertex_model_cache[model] = GenerativeModel(model)
-        return self._vertex_model_cache[model]
+            if location is not None:
+                model = (
+                    f"projects/{self.project_id}/locations/{location}"
+                    f"/publishers/google/models/{model}"
+                )
+            self._vertex_model_cache[key] = GenerativeModel(model)
+        return self._vertex_model_cache[key]
+    
+    def get_endpoint_stats(self, model: str) -> dict[str, EndpointStats]:
+        """
+        Get the measured latency per location for `model`.
+        
+        Only location="auto" records latencies; other modes return {}.
+        """
+        if self._endpoint_selector is None:
+            return {}
+        return self._endpoint_selector.get_stats(model)
+    
+    def _vertex_error(self, error_msg: str, prefix: str = "Vertex AI error") -> ProviderError:
+        """Map a Vertex AI SDK error message to a ProviderError."""
+        lowered = error_msg.lower()
+        if "quota" in lowered or "429" in error_msg:
+            return ProviderError(self.name, f"Rate limit exceeded: {error_msg}", status_code=429)
+        if "not found" in lowered or "404" in error_msg:
+            return ProviderError(self.name, f"Model not found: {error_msg}", status_code=404)
+        if "permission" in lowered or "403" in error_msg:
+            return ProviderError(self.name, f"Permission denied: {error_msg}", status_code=403)
+        return ProviderError(self.name, f"{prefix}: {error_msg}")
+    
+    async def _generate_vertex_auto(self, prompt: str, model: str) -> RawLLMResult:
+        """Generate in the location picked by the endpoint selector and record its latency."""
+        import asyncio
+        
+        selector = self._endpoint_selector
+        location = selector.pick(model)
+        start = time.perf_counter()
+        try:
+            vertex_model = self._get_vertex_model(model, location)
+            loop = asyncio.get_event_loop()
+            response = await loop.run_in_executor(None, vertex_model.generate_content, prompt)
+            text = response.text
+        except Exception as e:
+            selector.record_failure(location, model)
+            raise self._vertex_error(str(e))
+        selector.record(location, model, (time.perf_counter() - start) * 1000)
+        
+        input_tokens = None
+        output_tokens = None
+        if hasattr(response, 'usage_metadata') and response.usage_metadata:
+            input_tokens = getattr(response.usage_metadata, 'prompt_token_count', None)
+            output_tokens = getattr(response.usage_metadata, 'candidates_token_count', None)
+        
+        return RawLLMResult(
+            text=text,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            raw_response=response
+        )
+    
+    async def _stream_vertex_auto(self, prompt: str, model: str):
+        """Stream from the location picked by the endpoint selector, recording time to first chunk."""
+        import asyncio
+        
+        selector = self._endpoint_selector
+        location = selector.pick(model)
+        start = time.perf_counter()
+        first_chunk = True
+        try:
+            vertex_model = self._get_vertex_model(model, location)
+            loop = asyncio.get_event_loop()
+            response = await loop.run_in_executor(
+                None, lambda: vertex_model.generate_content(prompt, stream=True)
+            )
+            for chunk in response:
+                text = getattr(chunk, "text", None)
+                if text:
+                    if first_chunk:
+                        selector.record(location, model, (time.perf_counter() - start) * 1000)
+                        first_chunk = False
+                    yield text
+        except Exception as e:
+            if first_chunk:
+                selector.record_failure(location, model)
+            raise self._vertex_error(str(e), "Vertex AI streaming error")
     
     async def generate(self, prompt: str, model: str) -> RawLLMResult:
         """
@@ -239,7 +342,7 @@ class GeminiAdapter(ProviderAdapter):
             return await self._generate_sdk(prompt, model)
         return await self._generate_http(prompt, model)
 
-    async def stream(self, prompt: str, model: str):
+    async def stream(self, prompt: str, model: str) -> AsyncIterator[str]:
         """Stream response text from Gemini."""
         if self.mode == "vertex":
             async for chunk in self._stream_vertex(prompt, model):
@@ -263,9 +366,14 @@ class GeminiAdapter(ProviderAdapter):
         if not self._client:
             raise ProviderError(self.name, "HTTP client not initialized")
         try:
-            response = await self._client.post(url, params=params, json=payload)
+            response = await self._client.post(
+                url,
+                params=params,
+                headers={"Content-Type": "application/json"},
+                content=_json_dumps(payload),
+            )
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
         except httpx.TimeoutException:
             raise ProviderError(self.name, "Request timed out")
         except httpx.HTTPStatusError as e:
@@ -301,7 +409,7 @@ class GeminiAdapter(ProviderAdapter):
         payload = {
             "contents": [{"parts": [{"text": prompt}]}]
         }
-        headers = {"Accept": "text/event-stream"}
+        headers = {"Accept": "text/event-stream", "Content-Type": "application/json"}
 
         if not self._client:
             raise ProviderError(self.name, "HTTP client not initialized")
@@ -310,19 +418,14 @@ class GeminiAdapter(ProviderAdapter):
             url,
             params=params,
             headers=headers,
-            json=payload,
+            content=_json_dumps(payload),
         ) as response:
             response.raise_for_status()
-            async for line in response.aiter_lines():
-                if not line or not line.startswith("data: "):
-                    continue
-                data = line[6:].strip()
-                if data == "[DONE]":
-                    break
+            async for data in _iter_sse_data(response):
                 try:
-                    payload = json.loads(data)
+                    payload = _json_loads(data)
                     text = payload["candidates"][0]["content"]["parts"][0].get("text")
-                except (json.JSONDecodeError, KeyError, IndexError, TypeError):
+                except (ValueError, KeyError, IndexError, TypeError):
                     continue
                 if text:
                     yield text
@@ -386,6 +489,9 @@ class GeminiAdapter(ProviderAdapter):
         """Generate using Vertex AI SDK with region fallback support."""
         import asyncio
         
+        if self._endpoint_selector is not None:
+            return await self._generate_vertex_auto(prompt, model)
+        
         try:
             # Vertex AI SDK is sync, run in executor
             def _sync_generate():
@@ -534,6 +640,11 @@ class GeminiAdapter(ProviderAdapter):
     async def _stream_vertex(self, prompt: str, model: str):
         """Stream using Vertex AI SDK with region fallback support."""
         import asyncio
+        
+        if self._endpoint_selector is not None:
+            async for chunk in self._stream_vertex_auto(prompt, model):
+                yield chunk
+            return
 
         def _sync_stream():
             vertex_model = self._get_vertex_model(model)
@@ -637,8 +748,7 @@ class GeminiAdapter(ProviderAdapter):
             )
 
     async def aclose(self) -> None:
-        if self._client:
-            await self._client.aclose()
+        await self._close_http_client()
     
     def estimate_tokens(self, prompt: str, output: str) -> TokenUsage:
         """
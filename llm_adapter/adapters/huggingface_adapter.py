@@ -5,7 +5,31 @@ HuggingFace Inference API provider adapter implementation.
 import httpx
 
 from ..models import TokenUsage
-from .base import ProviderAdapter, ProviderError, RawLLMResult
+from ._tokenizer import cached_count
+from .base import _json_dumps, _json_loads, ProviderAdapter, ProviderError, RawLLMResult
+
+
+def _count_tokens(text: str) -> int:
+    """
+    Heuristic token count, cached (see _tokenizer.cached_count) so retried
+    or repeated prompts are scanned once.
+    """
+    if not text:
+        return 0
+    return cached_count("huggingface", text, _heuristic_count)
+
+
+def _heuristic_count(text: str) -> int:
+    # Count words (rough approximation)
+    word_count = len(text.split())
+    
+    # Add extra tokens for special characters and numbers. Alphanumeric and
+    # whitespace characters are disjoint, so the rest are the special ones;
+    # map() keeps the per-character loop in C.
+    special_chars = len(text) - sum(map(str.isalnum, text)) - sum(map(str.isspace, text))
+    
+    # Estimate: words + some overhead for special chars
+    return max(1, word_count + (special_chars // 4))
 
 
 class HuggingFaceAdapter(ProviderAdapter):
@@ -18,6 +42,7 @@ class HuggingFaceAdapter(ProviderAdapter):
     
     name: str = "huggingface"
     BASE_URL = "https://api-inference.huggingface.co/models"
+    SHARE_HTTP_CLIENT = False  # own client keeps its 120s timeout
     
     def __init__(self, api_key: str, default_model: str | None = None, **kwargs):
         """
@@ -31,13 +56,19 @@ class HuggingFaceAdapter(ProviderAdapter):
         super().__init__(api_key, **kwargs)
         self.default_model = default_model or "meta-llama/Llama-3.1-8B-Instruct"
         
+        # Request headers are identical for every call; build them once
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        
         # Get HTTP client config from config manager
         http_config = self.config.get("http_client", {})
         max_connections = http_config.get("max_connections", 100)
         max_keepalive = http_config.get("max_keepalive_connections", 20)
         timeout = http_config.get("timeout", 120.0)
         
-        # Build client kwargs with proxy support for different httpx versions
+        # Build client kwargs (proxy_url is applied by _create_http_client)
         client_kwargs = {
             "timeout": timeout,
             "limits": httpx.Limits(
@@ -46,17 +77,7 @@ class HuggingFaceAdapter(ProviderAdapter):
             ),
         }
         
-        # Handle proxy configuration for different httpx versions
-        proxy_url = self.config.get("proxy_url")
-        if proxy_url:
-            try:
-                # Try newer httpx versions (0.24+) that use 'proxy' parameter
-                self._client = httpx.AsyncClient(proxy=proxy_url, **client_kwargs)
-            except TypeError:
-                # Fall back to older httpx versions that use 'proxies' parameter
-                self._client = httpx.AsyncClient(proxies=proxy_url, **client_kwargs)
-        else:
-            self._client = httpx.AsyncClient(**client_kwargs)
+        self._client = self._create_http_client(**client_kwargs)
     
     async def generate(self, prompt: str, model: str) -> RawLLMResult:
         """
@@ -74,10 +95,7 @@ class HuggingFaceAdapter(ProviderAdapter):
         """
         model_to_use = model or self.default_model
         url = f"{self.BASE_URL}/{model_to_use}"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+        headers = self._headers
         payload = {
             "inputs": prompt,
             "parameters": {
@@ -87,9 +105,9 @@ class HuggingFaceAdapter(ProviderAdapter):
         }
         
         try:
-            response = await self._client.post(url, headers=headers, json=payload)
+            response = await self._client.post(url, headers=headers, content=_json_dumps(payload))
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
         except httpx.TimeoutException:
             raise ProviderError(self.name, "Request timed out")
         except httpx.HTTPStatusError as e:
@@ -159,7 +177,7 @@ class HuggingFaceAdapter(ProviderAdapter):
         )
 
     async def aclose(self) -> None:
-        await self._client.aclose()
+        await self._close_http_client()
     
     def _estimate_token_count(self, text: str) -> int:
         """
@@ -176,17 +194,4 @@ class HuggingFaceAdapter(ProviderAdapter):
         Returns:
             Estimated token count
         """
-        if not text:
-            return 0
-        
-        # Count words (rough approximation)
-        words = text.split()
-        word_count = len(words)
-        
-        # Add extra tokens for special characters and numbers
-        special_chars = sum(1 for c in text if not c.isalnum() and not c.isspace())
-        
-        # Estimate: words + some overhead for special chars
-        estimated = word_count + (special_chars // 4)
-        
-        return max(1, estimated)
+        return _count_tokens(text)
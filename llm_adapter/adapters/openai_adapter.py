@@ -2,12 +2,12 @@
 OpenAI provider adapter implementation.
 """
 
-import json
+from typing import AsyncIterator
 
 import httpx
 
 from ..models import TokenUsage
-from .base import ProviderAdapter, ProviderError, RawLLMResult
+from .base import _iter_sse_data, _json_dumps, _json_loads, ProviderAdapter, ProviderError, RawLLMResult
 
 
 class OpenAIAdapter(ProviderAdapter):
@@ -33,13 +33,20 @@ class OpenAIAdapter(ProviderAdapter):
         super().__init__(api_key, **kwargs)
         self.base_url = base_url or self.DEFAULT_BASE_URL
         
+        # Request URL and headers are identical for every call; build them once
+        self._completions_url = f"{self.base_url}/chat/completions"
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        
         # Get HTTP client config from config manager
         http_config = self.config.get("http_client", {})
         max_connections = http_config.get("max_connections", 100)
         max_keepalive = http_config.get("max_keepalive_connections", 20)
         timeout = http_config.get("timeout", 60.0)
         
-        # Build client kwargs with proxy support for different httpx versions
+        # Build client kwargs (proxy_url is applied by _create_http_client)
         client_kwargs = {
             "timeout": timeout,
             "limits": httpx.Limits(
@@ -48,17 +55,7 @@ class OpenAIAdapter(ProviderAdapter):
             ),
         }
         
-        # Handle proxy configuration for different httpx versions
-        proxy_url = self.config.get("proxy_url")
-        if proxy_url:
-            try:
-                # Try newer httpx versions (0.24+) that use 'proxy' parameter
-                self._client = httpx.AsyncClient(proxy=proxy_url, **client_kwargs)
-            except TypeError:
-                # Fall back to older httpx versions that use 'proxies' parameter
-                self._client = httpx.AsyncClient(proxies=proxy_url, **client_kwargs)
-        else:
-            self._client = httpx.AsyncClient(**client_kwargs)
+        self._client = self._create_http_client(**client_kwargs)
     
     async def generate(self, prompt: str, model: str) -> RawLLMResult:
         """
@@ -74,20 +71,17 @@ class OpenAIAdapter(ProviderAdapter):
         Raises:
             ProviderError: If API call fails
         """
-        url = f"{self.base_url}/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+        url = self._completions_url
+        headers = self._headers
         payload = {
             "model": model,
             "messages": [{"role": "user", "content": prompt}],
         }
         
         try:
-            response = await self._client.post(url, headers=headers, json=payload)
+            response = await self._client.post(url, headers=headers, content=_json_dumps(payload))
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
         except httpx.TimeoutException:
             raise ProviderError(self.name, "Request timed out")
         except httpx.HTTPStatusError as e:
@@ -117,38 +111,38 @@ class OpenAIAdapter(ProviderAdapter):
             raw_response=data
         )
 
-    async def stream(self, prompt: str, model: str):
+    async def stream(self, prompt: str, model: str) -> AsyncIterator[str]:
         """Stream response text using OpenAI-compatible streaming."""
-        url = f"{self.base_url}/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+        url = self._completions_url
+        headers = self._headers
         payload = {
             "model": model,
             "messages": [{"role": "user", "content": prompt}],
             "stream": True,
         }
 
-        async with self._client.stream("POST", url, headers=headers, json=payload) as response:
+        async with self._client.stream("POST", url, headers=headers, content=_json_dumps(payload)) as response:
             response.raise_for_status()
-            async for line in response.aiter_lines():
-                if not line or not line.startswith("data: "):
-                    continue
-                data = line[6:].strip()
-                if data == "[DONE]":
-                    break
+            async for data in _iter_sse_data(response):
                 try:
-                    payload = json.loads(data)
+                    payload = _json_loads(data)
                     delta = payload["choices"][0].get("delta", {})
                     content = delta.get("content")
-                except (json.JSONDecodeError, KeyError, IndexError):
+                except (ValueError, KeyError, IndexError):
                     continue
                 if content:
                     yield content
 
     async def aclose(self) -> None:
-        await self._client.aclose()
+        await self._close_http_client()
+    
+    async def ping(self) -> None:
+        """Warm the connection pool with a cheap GET /models request."""
+        response = await self._client.get(
+            f"{self.base_url}/models",
+            headers=self._headers,
+        )
+        response.raise_for_status()
     
     def estimate_tokens(self, prompt: str, output: str) -> TokenUsage:
         """
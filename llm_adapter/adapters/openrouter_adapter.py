@@ -5,14 +5,14 @@ OpenRouter is a unified API that provides access to multiple LLM providers
 including OpenAI, Anthropic, Google, Meta, and many others.
 """
 
-import json
 import time
+from typing import AsyncIterator
 
 import httpx
 
 from ..models import TokenUsage
 from ..request_logger import get_logger
-from .base import ProviderAdapter, ProviderError, RawLLMResult, MultimodalContent, ImageInput, ImageInputType
+from .base import _iter_sse_data, _json_dumps, _json_loads, ProviderAdapter, ProviderError, RawLLMResult, MultimodalContent, ImageInput
 
 
 class OpenRouterAdapter(ProviderAdapter):
@@ -28,6 +28,7 @@ class OpenRouterAdapter(ProviderAdapter):
     
     name: str = "openrouter"
     DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+    SHARE_HTTP_CLIENT = False  # own client keeps its 120s timeout
     
     def __init__(
         self, 
@@ -55,13 +56,25 @@ class OpenRouterAdapter(ProviderAdapter):
         # 初始化日志记录器
         self._logger = get_logger(self.name)
         
+        # Request URL and headers are identical for every call; build them once
+        self._completions_url = f"{self.base_url}/chat/completions"
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        # Add optional headers for OpenRouter analytics
+        if self.site_url:
+            self._headers["HTTP-Referer"] = self.site_url
+        if self.site_name:
+            self._headers["X-Title"] = self.site_name
+        
         # Get HTTP client config from config manager
         http_config = self.config.get("http_client", {})
         max_connections = http_config.get("max_connections", 100)
         max_keepalive = http_config.get("max_keepalive_connections", 20)
         timeout = http_config.get("timeout", 120.0)
         
-        # Build client kwargs with proxy support for different httpx versions
+        # Build client kwargs (proxy_url is applied by _create_http_client)
         client_kwargs = {
             "timeout": timeout,
             "limits": httpx.Limits(
@@ -70,17 +83,28 @@ class OpenRouterAdapter(ProviderAdapter):
             ),
         }
         
-        # Handle proxy configuration for different httpx versions
-        proxy_url = self.config.get("proxy_url")
-        if proxy_url:
-            try:
-                # Try newer httpx versions (0.24+) that use 'proxy' parameter
-                self._client = httpx.AsyncClient(proxy=proxy_url, **client_kwargs)
-            except TypeError:
-                # Fall back to older httpx versions that use 'proxies' parameter
-                self._client = httpx.AsyncClient(proxies=proxy_url, **client_kwargs)
-        else:
-            self._client = httpx.AsyncClient(**client_kwargs)
+        self._client = self._create_http_client(**client_kwargs)
+    
+    @staticmethod
+    def _text_messages(prompt: str, cache_prefix: str | None = None) -> list[dict]:
+        """
+        Build the chat messages for a text prompt.
+        
+        A non-empty `cache_prefix` is sent first as a system message marked
+        with cache_control, so providers that support prompt caching
+        (Anthropic, Gemini) can reuse it across calls.
+        """
+        messages = [{"role": "user", "content": prompt}]
+        if cache_prefix:
+            messages.insert(0, {
+                "role": "system",
+                "content": [{
+                    "type": "text",
+                    "text": cache_prefix,
+                    "cache_control": {"type": "ephemeral"},
+                }],
+            })
+        return messages
     
     async def generate(self, prompt: str, model: str, **kwargs) -> RawLLMResult:
         """
@@ -89,7 +113,11 @@ class OpenRouterAdapter(ProviderAdapter):
         Args:
             prompt: The input prompt
             model: Model identifier (e.g., 'openai/gpt-4o', 'anthropic/claude-3-opus')
-            **kwargs: Additional generation parameters (temperature, max_tokens, etc.)
+            **kwargs: Additional generation parameters (temperature, max_tokens, etc.).
+                      `cache_prefix` sends static leading text (instructions,
+                      reference material) as a system message marked with
+                      cache_control, so providers that support prompt caching
+                      (Anthropic, Gemini) can reuse it across calls.
             
         Returns:
             RawLLMResult with generated text and token counts
@@ -102,22 +130,13 @@ class OpenRouterAdapter(ProviderAdapter):
         result = None
         
         try:
-            url = f"{self.base_url}/chat/completions"
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-            
-            # Add optional headers for OpenRouter analytics
-            if self.site_url:
-                headers["HTTP-Referer"] = self.site_url
-            if self.site_name:
-                headers["X-Title"] = self.site_name
+            url = self._completions_url
+            headers = self._headers
             
             # Build payload with generation parameters
             payload = {
                 "model": model,
-                "messages": [{"role": "user", "content": prompt}],
+                "messages": self._text_messages(prompt, kwargs.get("cache_prefix")),
             }
             
             # Add generation parameters from kwargs
@@ -130,9 +149,9 @@ class OpenRouterAdapter(ProviderAdapter):
                 if key in generation_keys and value is not None:
                     payload[key] = value
             
-            response = await self._client.post(url, headers=headers, json=payload)
+            response = await self._client.post(url, headers=headers, content=_json_dumps(payload))
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             # Extract OpenRouter-specific metadata from response body
             # OpenRouter returns cost in the usage object, not in headers
@@ -211,37 +230,31 @@ class OpenRouterAdapter(ProviderAdapter):
                 actual_model=result.actual_model if result else None,
             )
 
-    async def stream(self, prompt: str, model: str):
-        """Stream response text using OpenRouter's OpenAI-compatible API."""
-        url = f"{self.base_url}/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-        if self.site_url:
-            headers["HTTP-Referer"] = self.site_url
-        if self.site_name:
-            headers["X-Title"] = self.site_name
+    async def stream(
+        self, prompt: str, model: str, cache_prefix: str | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream response text using OpenRouter's OpenAI-compatible API.
+        
+        `cache_prefix` is sent as a cacheable system message, as in generate().
+        """
+        url = self._completions_url
+        headers = self._headers
 
         payload = {
             "model": model,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": self._text_messages(prompt, cache_prefix),
             "stream": True,
         }
 
-        async with self._client.stream("POST", url, headers=headers, json=payload) as response:
+        async with self._client.stream("POST", url, headers=headers, content=_json_dumps(payload)) as response:
             response.raise_for_status()
-            async for line in response.aiter_lines():
-                if not line or not line.startswith("data: "):
-                    continue
-                data = line[6:].strip()
-                if data == "[DONE]":
-                    break
+            async for data in _iter_sse_data(response):
                 try:
-                    payload = json.loads(data)
+                    payload = _json_loads(data)
                     delta = payload["choices"][0].get("delta", {})
                     content = delta.get("content")
-                except (json.JSONDecodeError, KeyError, IndexError):
+                except (ValueError, KeyError, IndexError):
                     continue
                 if content:
                     yield content
@@ -257,15 +270,8 @@ class OpenRouterAdapter(ProviderAdapter):
         result = None
         
         try:
-            url = f"{self.base_url}/chat/completions"
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-            if self.site_url:
-                headers["HTTP-Referer"] = self.site_url
-            if self.site_name:
-                headers["X-Title"] = self.site_name
+            url = self._completions_url
+            headers = self._headers
             
             # Build message content array
             message_content = []
@@ -280,22 +286,13 @@ class OpenRouterAdapter(ProviderAdapter):
             # Add images
             if content.images:
                 for image in content.images:
-                    if image.type == ImageInputType.URL:
-                        message_content.append({
-                            "type": "image_url",
-                            "image_url": {
-                                "url": image.data
-                            }
-                        })
-                    elif image.type == ImageInputType.BASE64:
-                        # OpenAI format: data:image/jpeg;base64,{base64_data}
-                        data_url = f"data:{image.mime_type};base64,{image.data}"
-                        message_content.append({
-                            "type": "image_url",
-                            "image_url": {
-                                "url": data_url
-                            }
-                        })
+                    # OpenAI format: plain URL or data:image/jpeg;base64,{base64_data}
+                    message_content.append({
+                        "type": "image_url",
+                        "image_url": {
+                            "url": self._image_url(image)
+                        }
+                    })
             
             payload = {
                 "model": model,
@@ -307,9 +304,9 @@ class OpenRouterAdapter(ProviderAdapter):
                 ],
             }
             
-            response = await self._client.post(url, headers=headers, json=payload)
+            response = await self._client.post(url, headers=headers, content=_json_dumps(payload))
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             # Extract response text
             text = data["choices"][0]["message"]["content"]
@@ -393,17 +390,10 @@ class OpenRouterAdapter(ProviderAdapter):
         self,
         content: MultimodalContent,
         model: str
-    ):
+    ) -> AsyncIterator[str]:
         """Stream multimodal response (text + images) using OpenRouter."""
-        url = f"{self.base_url}/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-        if self.site_url:
-            headers["HTTP-Referer"] = self.site_url
-        if self.site_name:
-            headers["X-Title"] = self.site_name
+        url = self._completions_url
+        headers = self._headers
         
         # Build message content array
         message_content = []
@@ -418,21 +408,13 @@ class OpenRouterAdapter(ProviderAdapter):
         # Add images
         if content.images:
             for image in content.images:
-                if image.type == ImageInputType.URL:
-                    message_content.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": image.data
-                        }
-                    })
-                elif image.type == ImageInputType.BASE64:
-                    data_url = f"data:{image.mime_type};base64,{image.data}"
-                    message_content.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": data_url
-                        }
-                    })
+                # OpenAI format: plain URL or data:image/jpeg;base64,{base64_data}
+                message_content.append({
+                    "type": "image_url",
+                    "image_url": {
+                        "url": self._image_url(image)
+                    }
+                })
         
         payload = {
             "model": model,
@@ -445,26 +427,28 @@ class OpenRouterAdapter(ProviderAdapter):
             "stream": True,
         }
         
-        async with self._client.stream("POST", url, headers=headers, json=payload) as response:
+        async with self._client.stream("POST", url, headers=headers, content=_json_dumps(payload)) as response:
             response.raise_for_status()
-            async for line in response.aiter_lines():
-                if not line or not line.startswith("data: "):
-                    continue
-                data = line[6:].strip()
-                if data == "[DONE]":
-                    break
+            async for data in _iter_sse_data(response):
                 try:
-                    payload = json.loads(data)
+                    payload = _json_loads(data)
                     delta = payload["choices"][0].get("delta", {})
                     content_chunk = delta.get("content")
-                except (json.JSONDecodeError, KeyError, IndexError):
+                except (ValueError, KeyError, IndexError):
                     continue
                 if content_chunk:
                     yield content_chunk
 
     async def aclose(self) -> None:
-        if not self._client.is_closed:
-            await self._client.aclose()
+        await self._close_http_client()
+    
+    async def ping(self) -> None:
+        """Warm the connection pool with a cheap GET /models request."""
+        response = await self._client.get(
+            f"{self.base_url}/models",
+            headers=self._headers,
+        )
+        response.raise_for_status()
     
     def estimate_tokens(self, prompt: str, output: str) -> TokenUsage:
         """
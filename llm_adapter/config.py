@@ -74,6 +74,11 @@ class ProviderConfig:
     mode: str | None = None  # For Gemini: "http", "sdk", "vertex"
     project_id: str | None = None  # For Vertex AI
     location: str | None = None  # For Vertex AI
+    auto_locations: list[str] | None = None  # Candidates for Vertex location="auto"
+    # Client-side limits (None = unlimited)
+    max_concurrency: int | None = None  # Max in-flight requests
+    requests_per_minute: float | None = None  # RPM
+    tokens_per_minute: float | None = None  # TPM (estimated prompt tokens)
 
 
 @dataclass
@@ -300,6 +305,32 @@ class ConfigManager:
             seed=int(params_raw['seed']) if 'seed' in params_raw else None,
         )
     
+    @staticmethod
+    def _parse_optional_number(data: dict, key: str, provider: str, cast: type) -> Any:
+        """Parse an optional positive numeric provider setting."""
+        value = data.get(key)
+        if value is None:
+            return None
+        try:
+            value = cast(value)
+        except (TypeError, ValueError):
+            raise ConfigError(f"'{provider}.{key}' must be a number")
+        if value <= 0:
+            raise ConfigError(f"'{provider}.{key}' must be positive")
+        return value
+    
+    @staticmethod
+    def _parse_auto_locations(data: dict, provider: str) -> list[str] | None:
+        """Parse the optional list of candidate regions for location="auto"."""
+        value = data.get('auto_locations')
+        if value is None:
+            return None
+        if not isinstance(value, list) or not value or not all(
+            isinstance(location, str) and location for location in value
+        ):
+            raise ConfigError(f"'{provider}.auto_locations' must be a non-empty list of region names")
+        return value
+    
     def _parse_config(self, raw: dict) -> Config:
         """Parse raw configuration dictionary into Config object."""
         config = Config()
@@ -413,6 +444,16 @@ class ConfigManager:
                     mode=provider_data.get('mode'),
                     project_id=provider_data.get('project_id'),
                     location=provider_data.get('location'),
+                    auto_locations=self._parse_auto_locations(provider_data, provider_name),
+                    max_concurrency=self._parse_optional_number(
+                        provider_data, 'max_concurrency', provider_name, int
+                    ),
+                    requests_per_minute=self._parse_optional_number(
+                        provider_data, 'requests_per_minute', provider_name, float
+                    ),
+                    tokens_per_minute=self._parse_optional_number(
+                        provider_data, 'tokens_per_minute', provider_name, float
+                    ),
                 )
         
         # Parse pricing rules
@@ -0,0 +1,159 @@
+"""
+Latency-aware endpoint selection for regional provider deployments.
+
+Keeps an exponentially weighted moving average (EWMA) of observed latency per
+(location, model) and picks among the locations that are within a tolerance
+of the fastest one, so traffic is spread over near-equivalent endpoints
+instead of pinning to a single early winner.
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class EndpointStats:
+    """Latency statistics for one (location, model) pair."""
+    ewma_ms: Optional[float] = None
+    samples: int = 0
+    failures: int = 0
+    last_updated: float = 0.0  # time.monotonic() of the last record
+
+
+class EndpointSelector:
+    """
+    Pick the fastest endpoint (location) for a model from observed latencies.
+
+    Example:
+        selector = EndpointSelector(["global", "us-central1", "asia-southeast1"])
+        location = selector.pick("gemini-2.5-flash")
+        ...  # call the model in `location`, measuring latency
+        selector.record(location, "gemini-2.5-flash", latency_ms)
+    """
+
+    def __init__(
+        self,
+        locations: Sequence[str],
+        alpha: float = 0.2,
+        tolerance: float = 1.15,
+        reprobe_interval_s: float = 300.0,
+        failure_penalty: float = 2.0,
+    ):
+        """
+        Initialize the selector.
+
+        Args:
+            locations: Candidate locations, in preference order for cold starts
+            alpha: EWMA smoothing factor (weight of the newest sample)
+            tolerance: Locations whose EWMA is within `best * tolerance` are
+                       all candidates for selection
+            reprobe_interval_s: Locations not measured for this long are
+                                probed again so a stale winner cannot stick
+            failure_penalty: Multiplier applied to a location's EWMA on failure
+        """
+        if not locations:
+            raise ValueError("EndpointSelector requires at least one location")
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha must be in (0, 1]")
+        if tolerance < 1.0:
+            raise ValueError("tolerance must be >= 1.0")
+
+        self.locations: List[str] = list(dict.fromkeys(locations))
+        self.alpha = alpha
+        self.tolerance = tolerance
+        self.reprobe_interval_s = reprobe_interval_s
+        self.failure_penalty = failure_penalty
+        self._stats: Dict[Tuple[str, str], EndpointStats] = {}
+        self._rng = random.Random()
+
+    def _get_stats(self, location: str, model: str) -> EndpointStats:
+        key = (location, model)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = EndpointStats()
+        return stats
+
+    def record(self, location: str, model: str, latency_ms: float) -> None:
+        """
+        Record a successful call's latency and update the EWMA.
+
+        Args:
+            location: Location the call was sent to
+            model: Model identifier
+            latency_ms: Observed latency (e.g. time to first token) in milliseconds
+        """
+        stats = self._get_stats(location, model)
+        if stats.ewma_ms is None:
+            stats.ewma_ms = latency_ms
+        else:
+            stats.ewma_ms += self.alpha * (latency_ms - stats.ewma_ms)
+        stats.samples += 1
+        stats.last_updated = time.monotonic()
+
+    def record_failure(self, location: str, model: str) -> None:
+        """
+        Record a failed call so the location is deprioritized.
+
+        Args:
+            location: Location the call was sent to
+            model: Model identifier
+        """
+        stats = self._get_stats(location, model)
+        stats.failures += 1
+        stats.last_updated = time.monotonic()
+        if stats.ewma_ms is None:
+            # Never succeeded: rank it behind every measured location
+            measured = [
+                s.ewma_ms for (loc, m), s in self._stats.items()
+                if m == model and s.ewma_ms is not None
+            ]
+            stats.ewma_ms = max(measured, default=1000.0) * self.failure_penalty
+        else:
+            stats.ewma_ms *= self.failure_penalty
+
+    def pick(self, model: str) -> str:
+        """
+        Choose a location for the next call to `model`.
+
+        Unmeasured or stale locations are returned first (in the order given
+        at construction) so every endpoint keeps getting measured. Otherwise
+        one of the locations within `tolerance` of the best EWMA is chosen,
+        weighted towards lower latency.
+
+        Args:
+            model: Model identifier
+
+        Returns:
+            Location to use
+        """
+        now = time.monotonic()
+        candidates = []
+        for location in self.locations:
+            stats = self._stats.get((location, model))
+            if stats is None or stats.ewma_ms is None:
+                return location
+            if now - stats.last_updated > self.reprobe_interval_s:
+                return location
+            candidates.append((location, stats.ewma_ms))
+
+        best = min(ewma for _, ewma in candidates)
+        threshold = best * self.tolerance
+        eligible = [(loc, ewma) for loc, ewma in candidates if ewma <= threshold]
+        if len(eligible) == 1:
+            return eligible[0][0]
+
+        weights = [1.0 / max(ewma, 1e-6) for _, ewma in eligible]
+        return self._rng.choices([loc for loc, _ in eligible], weights=weights)[0]
+
+    def get_stats(self, model: str) -> Dict[str, EndpointStats]:
+        """Get the per-location statistics recorded for `model`."""
+        return {
+            location: stats for (location, m), stats in self._stats.items()
+            if m == model
+        }
+
+    def clear(self) -> None:
+        """Forget all recorded latencies."""
+        self._stats.clear()
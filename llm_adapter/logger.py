@@ -3,7 +3,7 @@ Usage Logger module for recording and querying LLM usage logs.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional
 
 from llm_adapter.models import UsageLog
 
@@ -62,6 +62,18 @@ class UsageLogger:
         self._logs.append(log_entry)
         return log_entry
 
+    def log_batch(self, entries: Iterable[UsageLog]) -> None:
+        """
+        批量记录已构造好的使用日志。
+        
+        内存存储下与逐条调用 log() 等价；写入文件或数据库的子类可覆盖此方法，
+        用一次批量写入代替多次单条写入。
+        
+        Args:
+            entries: UsageLog 记录
+        """
+        self._logs.extend(entries)
+
     def get_logs_by_user(self, user_id: str) -> list[UsageLog]:
         """
         按用户ID查询使用记录。
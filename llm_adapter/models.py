@@ -6,8 +6,12 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Literal
 
+# Allowed values for LLMRequest.scene / LLMRequest.quality
+_SCENES = frozenset(("chat", "coach", "persona", "system"))
+_QUALITIES = frozenset(("low", "medium", "high"))
 
-@dataclass
+
+@dataclass(slots=True)
 class LLMRequest:
     """统一LLM请求参数"""
     user_id: str
@@ -22,14 +26,14 @@ class LLMRequest:
             errors.append("user_id is required and cannot be empty")
         if not self.prompt or not self.prompt.strip():
             errors.append("prompt is required and cannot be empty")
-        if self.scene not in ("chat", "coach", "persona", "system"):
+        if self.scene not in _SCENES:
             errors.append(f"scene must be one of: chat, coach, persona, system")
-        if self.quality not in ("low", "medium", "high"):
+        if self.quality not in _QUALITIES:
             errors.append(f"quality must be one of: low, medium, high")
         return errors
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenUsage:
     """Token使用统计"""
     input_tokens: int
@@ -41,7 +45,7 @@ class TokenUsage:
         return self.input_tokens + self.output_tokens
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
     """统一LLM响应结构"""
     text: str
@@ -52,7 +56,7 @@ class LLMResponse:
     cost_usd: float
 
 
-@dataclass
+@dataclass(slots=True)
 class PricingRule:
     """定价规则"""
     provider: str
@@ -67,7 +71,7 @@ class PricingRule:
         return input_cost + output_cost
 
 
-@dataclass
+@dataclass(slots=True)
 class UsageLog:
     """使用日志记录"""
     user_id: str
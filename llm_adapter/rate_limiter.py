@@ -0,0 +1,141 @@
+"""
+Client-side rate limiting for provider calls.
+
+Each provider gets a ProviderLimiter that bounds in-flight requests with a
+semaphore, paces requests and tokens per minute with token buckets, and backs
+off after the provider answers 429 so callers stop hammering a throttled API.
+"""
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously from the monotonic clock.
+
+    Example:
+        bucket = TokenBucket(rate_per_minute=600)
+        await bucket.acquire()        # one request
+        await bucket.acquire(1200)    # e.g. estimated prompt tokens
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate_per_minute: Tokens added per minute
+            capacity: Maximum burst size; defaults to one minute's worth
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0  # tokens per second
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """
+        Wait until `amount` tokens are available and take them.
+
+        Waiters are served in arrival order. Requests larger than the bucket
+        capacity are clamped to it so they cannot wait forever.
+        """
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= amount
+
+
+class ProviderLimiter:
+    """
+    Concurrency, rate and backoff control for one provider.
+
+    All limits are optional; a limiter with no limits only applies the 429
+    backoff.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        base_backoff_s: float = 1.0,
+        max_backoff_s: float = 30.0,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_concurrency: Maximum in-flight requests
+            requests_per_minute: Request rate limit (RPM)
+            tokens_per_minute: Estimated prompt-token rate limit (TPM)
+            base_backoff_s: Backoff after the first 429, doubled on each
+                            consecutive one
+            max_backoff_s: Upper bound for the backoff delay
+        """
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.base_backoff_s = base_backoff_s
+        self.max_backoff_s = max_backoff_s
+        self._throttled = 0
+        self._cooldown_until = 0.0
+
+    @property
+    def limits_tokens(self) -> bool:
+        """Whether a TPM limit is configured (callers can skip token estimates otherwise)."""
+        return self._tokens is not None
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0) -> AsyncIterator[None]:
+        """
+        Hold a request slot for the duration of the `async with` block.
+
+        Args:
+            estimated_tokens: Estimated prompt tokens, charged to the TPM bucket
+        """
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        try:
+            delay = self._cooldown_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self._requests is not None:
+                await self._requests.acquire()
+            if self._tokens is not None and estimated_tokens > 0:
+                await self._tokens.acquire(estimated_tokens)
+            yield
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    def record_throttled(self) -> float:
+        """
+        Record a 429 response and start an exponential backoff with jitter.
+
+        Returns:
+            The backoff delay in seconds
+        """
+        self._throttled += 1
+        delay = min(self.max_backoff_s, self.base_backoff_s * 2 ** (self._throttled - 1))
+        delay *= random.uniform(0.5, 1.0)
+        self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+        return delay
+
+    def record_success(self) -> None:
+        """Reset the backoff after a successful call."""
+        self._throttled = 0
@@ -3,6 +3,7 @@ Router module for intelligent LLM provider selection.
 Implements quality-based routing strategy with automatic fallback.
 """
 
+import dataclasses
 import os
 from dataclasses import dataclass
 from typing import Literal
@@ -67,6 +68,11 @@ class Router:
         """
         self.config_manager = config_manager
         self._unavailable_providers: set[str] = set()
+        # Successful routing decisions keyed by (quality, excluded providers,
+        # routing disabled). Cleared when provider availability changes or
+        # the config manager loads a new config.
+        self._route_cache: dict[tuple[str, frozenset[str], bool], RouteResult] = {}
+        self._route_cache_config: object | None = None
     
     def route(
         self, 
@@ -93,12 +99,32 @@ class Router:
         if quality not in self.QUALITY_ROUTES:
             raise RouterError(f"Invalid quality level: {quality}")
         
-        excluded = excluded_providers or set()
-        excluded = excluded.union(self._unavailable_providers)
+        excluded = frozenset(excluded_providers or ()).union(self._unavailable_providers)
 
         # Check if quality routing is disabled via environment variable
         disable_routing = os.getenv("LLM_DISABLE_QUALITY_ROUTING", "").lower() in ("true", "1", "yes")
         
+        config = self.config_manager.config
+        if config is not self._route_cache_config:
+            self._route_cache.clear()
+            self._route_cache_config = config
+        
+        key = (quality, excluded, disable_routing)
+        result = self._route_cache.get(key)
+        if result is None:
+            result = self._route_cache[key] = self._select_route(
+                quality, excluded, disable_routing
+            )
+        # Callers may modify the result (e.g. is_fallback); hand out a copy
+        return dataclasses.replace(result)
+    
+    def _select_route(
+        self,
+        quality: Literal["low", "medium", "high"],
+        excluded: frozenset[str],
+        disable_routing: bool,
+    ) -> RouteResult:
+        """Routing decision behind route(), without caching."""
         # Prefer default_provider when configured and available
         tier_by_quality: dict[str, str] = {
             "low": "cheap",
@@ -167,7 +193,7 @@ class Router:
         
         raise RouterError(
             f"No available provider for quality '{quality}'. "
-            f"Excluded providers: {excluded}"
+            f"Excluded providers: {set(excluded)}"
         )
     
     def _get_model_for_tier(self, provider: str, tier: str) -> str | None:
@@ -201,6 +227,7 @@ class Router:
             provider: Provider name to mark as unavailable
         """
         self._unavailable_providers.add(provider)
+        self._route_cache.clear()
     
     def mark_provider_available(self, provider: str) -> None:
         """
@@ -210,15 +237,18 @@ class Router:
             provider: Provider name to mark as available
         """
         self._unavailable_providers.discard(provider)
+        self._route_cache.clear()
     
     def reset_availability(self) -> None:
         """Reset all providers to available status."""
         self._unavailable_providers.clear()
+        self._route_cache.clear()
     
     def get_fallback(
         self,
         quality: Literal["low", "medium", "high"],
-        failed_provider: str
+        failed_provider: str,
+        excluded_providers: set[str] | None = None,
     ) -> RouteResult:
         """
         Get a fallback provider after a failure.
@@ -226,6 +256,8 @@ class Router:
         Args:
             quality: Quality level
             failed_provider: Provider that failed
+            excluded_providers: Providers that already failed earlier in the
+                                same request, so they are not picked again
             
         Returns:
             RouteResult with fallback provider and model
@@ -233,8 +265,10 @@ class Router:
         Raises:
             RouterError: If no fallback is available
         """
-        # Mark the failed provider as unavailable for this request
+        # Mark the failed providers as unavailable for this request
         excluded = {failed_provider}
+        if excluded_providers:
+            excluded |= excluded_providers
         
         try:
             result = self.route(quality, excluded_providers=excluded)
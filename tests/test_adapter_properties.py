@@ -4,12 +4,21 @@ Property-based tests for LLMAdapter request validation and response structure.
 Feature: llm-adapter
 Property 1: 请求参数验证
 Property 2: 响应结构完整性
+Property 13: 流式接口异步生成器
+Property 17: 共享 HTTP 客户端不覆盖适配器配置
 Validates: Requirements 1.1, 1.2, 1.3
 """
 
+import asyncio
+import inspect
+
+import pytest
+import yaml
 from hypothesis import given, strategies as st, settings, assume
 
-from llm_adapter.models import LLMRequest, LLMResponse
+from llm_adapter.adapter import LLMAdapter
+from llm_adapter.adapters.base import ProviderAdapter, RawLLMResult
+from llm_adapter.models import LLMRequest, LLMResponse, TokenUsage
 
 
 # Valid values for scene and quality fields
@@ -270,3 +279,91 @@ class TestResponseStructureProperty:
         assert isinstance(response.input_tokens, int), f"input_tokens must be int, got {type(response.input_tokens)}"
         assert isinstance(response.output_tokens, int), f"output_tokens must be int, got {type(response.output_tokens)}"
         assert isinstance(response.cost_usd, float), f"cost_usd must be float, got {type(response.cost_usd)}"
+
+
+class _EchoAdapter(ProviderAdapter):
+    """Minimal adapter relying on the default stream() implementation."""
+    name = "echo"
+
+    async def generate(self, prompt: str, model: str) -> RawLLMResult:
+        return RawLLMResult(text=prompt)
+
+    def estimate_tokens(self, prompt: str, output: str) -> TokenUsage:
+        return TokenUsage(input_tokens=len(prompt), output_tokens=len(output))
+
+
+class TestStreamingIsAsync:
+    """
+    Property 13: 流式接口异步生成器
+    
+    Every adapter's stream() and stream_multimodal() must be async generators
+    so ASGI servers iterate them on the event loop instead of a threadpool.
+    """
+
+    @pytest.mark.parametrize("adapter_cls", list(LLMAdapter.PROVIDER_ADAPTERS.values()))
+    def test_provider_streams_are_async_generators(self, adapter_cls):
+        """
+        Property 13: Built-in adapters expose async generator stream methods.
+        """
+        assert inspect.isasyncgenfunction(adapter_cls.stream)
+        assert inspect.isasyncgenfunction(adapter_cls.stream_multimodal)
+
+    @settings(max_examples=50)
+    @given(prompt=st.text(min_size=1, max_size=200))
+    def test_default_stream_yields_generate_text(self, prompt):
+        """
+        Property 13: The default stream() is async-iterable and yields generate() text.
+        """
+        gen = _EchoAdapter(api_key="k").stream(prompt, "m")
+        assert hasattr(type(gen), "__aiter__")
+
+        async def collect():
+            return [chunk async for chunk in gen]
+
+        assert asyncio.run(collect()) == [prompt]
+
+    def test_sync_generator_override_is_rejected(self):
+        """
+        Property 13: Defining a sync generator stream() fails at class creation.
+        """
+        with pytest.raises(TypeError):
+            class _SyncStreamAdapter(_EchoAdapter):
+                def stream(self, prompt, model):
+                    yield prompt
+
+
+class TestSharedHttpClient:
+    """
+    Property 17: 共享 HTTP 客户端不覆盖适配器配置
+    
+    LLMAdapter injects its shared HTTP client only into adapters that do not
+    tune their own transport, so per-adapter timeouts survive.
+    """
+
+    @pytest.fixture
+    def llm(self, tmp_path):
+        config = {
+            "llm": {"default_provider": "openai"},
+            "providers": {
+                name: {"api_key": "test-key", "models": {"normal": "m"}}
+                for name in ("openai", "openrouter", "huggingface")
+            },
+        }
+        path = tmp_path / "config.yaml"
+        path.write_text(yaml.dump(config))
+        return LLMAdapter(config_path=str(path))
+
+    @pytest.mark.parametrize("provider", ["openrouter", "huggingface"])
+    def test_custom_timeout_is_kept(self, llm, provider):
+        """
+        Property 17: Adapters with their own 120s timeout do not get the shared client.
+        """
+        adapter = llm._get_adapter(provider)
+        assert adapter._client is not llm._get_http_client()
+        assert adapter._client.timeout.read == 120.0
+
+    def test_plain_adapter_uses_shared_client(self, llm):
+        """
+        Property 17: Adapters without custom transport reuse the shared client.
+        """
+        assert llm._get_adapter("openai")._client is llm._get_http_client()
@@ -210,6 +210,21 @@ class TestConfigRoundTrip:
         finally:
             os.unlink(temp_path)
 
+    def test_auto_locations_round_trip(self):
+        """The Vertex auto_locations list is parsed into ProviderConfig unchanged."""
+        locations = ["global", "us-central1", "asia-southeast1"]
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+            yaml.dump({"providers": {"gemini": {
+                "api_key": "k", "location": "auto", "auto_locations": locations,
+            }}}, f)
+            temp_path = f.name
+        
+        try:
+            config = ConfigManager(temp_path).load()
+            assert config.providers["gemini"].auto_locations == locations
+        finally:
+            os.unlink(temp_path)
+
 
 class TestInvalidConfigErrorHandling:
     """
@@ -319,3 +334,19 @@ class TestInvalidConfigErrorHandling:
                 assert "environment variable" in str(e).lower() or "not set" in str(e).lower()
         finally:
             os.unlink(temp_path)
+
+    def test_invalid_auto_locations_raises_config_error(self):
+        """ConfigManager should raise ConfigError when auto_locations is not a list of regions."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+            f.write("providers:\n  gemini:\n    api_key: k\n    location: auto\n    auto_locations: us-central1\n")
+            temp_path = f.name
+        
+        try:
+            manager = ConfigManager(temp_path)
+            try:
+                manager.load()
+                raise AssertionError("Expected ConfigError for invalid auto_locations")
+            except ConfigError as e:
+                assert "auto_locations" in str(e)
+        finally:
+            os.unlink(temp_path)
@@ -0,0 +1,81 @@
+"""
+Property-based tests for latency-aware endpoint selection.
+
+Feature: llm-adapter
+Property 9: 端点选择收敛性
+"""
+
+from hypothesis import given, strategies as st, settings
+
+from llm_adapter.endpoint_selector import EndpointSelector
+
+
+locations_strategy = st.lists(
+    st.sampled_from(["global", "us-central1", "us-east4", "europe-west1", "asia-southeast1"]),
+    min_size=1,
+    max_size=5,
+    unique=True,
+)
+
+
+class TestEndpointSelection:
+    """
+    Property 9: 端点选择收敛性
+    
+    For any set of measured locations, pick() must only return locations
+    whose EWMA latency is within `tolerance` of the fastest one, and
+    unmeasured locations must be probed before any measured one is reused.
+    """
+
+    @settings(max_examples=100)
+    @given(
+        locations=locations_strategy,
+        latencies=st.lists(
+            st.floats(min_value=1.0, max_value=10_000.0, allow_nan=False, allow_infinity=False),
+            min_size=5,
+            max_size=5,
+        ),
+    )
+    def test_pick_stays_within_tolerance_of_best(self, locations, latencies):
+        """
+        Property 9: Picked location is always within tolerance of the best EWMA.
+        """
+        selector = EndpointSelector(locations, tolerance=1.15)
+        for location, latency in zip(locations, latencies):
+            selector.record(location, "m", latency)
+        
+        best = min(latencies[:len(locations)])
+        for _ in range(20):
+            picked = selector.pick("m")
+            assert picked in locations
+            assert selector.get_stats("m")[picked].ewma_ms <= best * 1.15 + 1e-9
+
+    @settings(max_examples=100)
+    @given(locations=locations_strategy)
+    def test_unmeasured_locations_are_probed_first(self, locations):
+        """
+        Property 9: Every location is picked once before any measured location is reused.
+        """
+        selector = EndpointSelector(locations)
+        seen = []
+        for _ in locations:
+            location = selector.pick("m")
+            seen.append(location)
+            selector.record(location, "m", 100.0)
+        
+        assert seen == locations
+
+    @settings(max_examples=100)
+    @given(
+        latency=st.floats(min_value=1.0, max_value=10_000.0, allow_nan=False, allow_infinity=False),
+    )
+    def test_failure_moves_location_behind_healthy_one(self, latency):
+        """
+        Property 9: A failing location is ranked behind a healthy one with equal latency.
+        """
+        selector = EndpointSelector(["a", "b"], tolerance=1.15)
+        selector.record("a", "m", latency)
+        selector.record("b", "m", latency)
+        selector.record_failure("a", "m")
+        
+        assert all(selector.pick("m") == "b" for _ in range(20))
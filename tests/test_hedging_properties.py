@@ -0,0 +1,150 @@
+"""
+Property-based tests for hedged generate() calls.
+
+Feature: llm-adapter
+Property 15: 对冲请求正确性
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+from llm_adapter.adapter import LLMAdapter, LLMAdapterError
+from llm_adapter.adapters.base import ProviderAdapter, ProviderError, RawLLMResult
+from llm_adapter.models import TokenUsage
+
+
+def create_test_config_file(directory: Path) -> str:
+    """Create a config in `directory` with three providers serving quality="high"."""
+    config = {
+        "llm": {"default_provider": "openai"},
+        "providers": {
+            "openai": {"api_key": "test-key", "models": {"premium": "gpt-4-turbo"}},
+            "gemini": {"api_key": "test-key", "models": {"premium": "gemini-1.5-pro"}},
+            "dashscope": {"api_key": "test-key", "models": {"premium": "qwen-max"}},
+        },
+    }
+    path = directory / "config.yaml"
+    path.write_text(yaml.dump(config))
+    return str(path)
+
+
+class _FakeAdapter(ProviderAdapter):
+    """Answers after `delay` seconds, or raises ProviderError if `fail`."""
+
+    def __init__(self, provider: str, delay: float = 0.0, fail: bool = False):
+        super().__init__("test-key")
+        self.name = provider
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = False
+
+    async def generate(self, prompt: str, model: str) -> RawLLMResult:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise ProviderError(self.name, "simulated failure")
+        return RawLLMResult(text=f"{self.name}: {prompt}", input_tokens=1, output_tokens=1)
+
+    def estimate_tokens(self, prompt: str, output: str) -> TokenUsage:
+        return TokenUsage(input_tokens=1, output_tokens=1)
+
+
+def _make_adapter(tmp_path: Path, **fakes: _FakeAdapter) -> LLMAdapter:
+    llm = LLMAdapter(config_path=create_test_config_file(tmp_path))
+    llm._adapters.update(fakes)
+    return llm
+
+
+def _generate(llm: LLMAdapter, hedge_delay: float):
+    return asyncio.run(llm.generate(
+        user_id="user", prompt="hi", scene="chat", quality="high",
+        hedge=True, hedge_delay=hedge_delay,
+    ))
+
+
+class TestHedgedGenerate:
+    """
+    Property 15: 对冲请求正确性
+
+    A hedged call returns the first successful provider, cancels the slower
+    one, hedges as soon as the primary fails, and still falls back to the
+    remaining providers when both hedged providers fail.
+    """
+
+    def test_primary_wins_without_hedging(self, tmp_path):
+        """
+        Property 15: A primary answering within hedge_delay is used alone.
+        """
+        openai, gemini = _FakeAdapter("openai"), _FakeAdapter("gemini")
+        llm = _make_adapter(tmp_path, openai=openai, gemini=gemini)
+
+        response = _generate(llm, hedge_delay=1.0)
+
+        assert response.provider == "openai"
+        assert gemini.calls == 0
+
+    def test_hedge_wins_after_delay(self, tmp_path):
+        """
+        Property 15: A slow primary is raced by the hedge and cancelled.
+        """
+        openai = _FakeAdapter("openai", delay=5.0)
+        gemini = _FakeAdapter("gemini")
+        llm = _make_adapter(tmp_path, openai=openai, gemini=gemini)
+
+        start = time.monotonic()
+        response = _generate(llm, hedge_delay=0.05)
+
+        assert response.provider == "gemini"
+        assert openai.cancelled
+        assert time.monotonic() - start < 2.0
+
+    def test_primary_failure_hedges_immediately(self, tmp_path):
+        """
+        Property 15: A primary failing before hedge_delay starts the hedge at once.
+        """
+        openai = _FakeAdapter("openai", fail=True)
+        gemini = _FakeAdapter("gemini")
+        llm = _make_adapter(tmp_path, openai=openai, gemini=gemini)
+
+        start = time.monotonic()
+        response = _generate(llm, hedge_delay=5.0)
+
+        assert response.provider == "gemini"
+        assert time.monotonic() - start < 2.0
+
+    def test_both_hedged_providers_fail_falls_back(self, tmp_path):
+        """
+        Property 15: When both hedged providers fail, the next provider is tried.
+        """
+        openai = _FakeAdapter("openai", fail=True)
+        gemini = _FakeAdapter("gemini", fail=True)
+        dashscope = _FakeAdapter("dashscope")
+        llm = _make_adapter(tmp_path, openai=openai, gemini=gemini, dashscope=dashscope)
+
+        response = _generate(llm, hedge_delay=0.05)
+
+        assert response.provider == "dashscope"
+        assert openai.calls == 1 and gemini.calls == 1
+
+    def test_all_providers_fail(self, tmp_path):
+        """
+        Property 15: With every provider failing, LLMAdapterError is raised.
+        """
+        llm = _make_adapter(
+            tmp_path,
+            openai=_FakeAdapter("openai", fail=True),
+            gemini=_FakeAdapter("gemini", fail=True),
+            dashscope=_FakeAdapter("dashscope", fail=True),
+        )
+
+        with pytest.raises(LLMAdapterError):
+            _generate(llm, hedge_delay=0.05)
@@ -0,0 +1,113 @@
+"""
+Property-based tests for multimodal content construction.
+
+Feature: llm-adapter
+Property 10: 多模态图片去重
+Property 11: 图片内容哈希一致性
+"""
+
+import base64
+
+from hypothesis import given, strategies as st, settings
+
+from llm_adapter.adapters.base import ImageInput, MultimodalContent
+
+
+image_strategy = st.one_of(
+    st.sampled_from([
+        "https://example.com/a.jpg",
+        "https://example.com/b.jpg",
+        "https://example.com/c.png",
+    ]).map(ImageInput.from_url),
+    st.sampled_from(["QUJD", "REVG"]).map(
+        lambda data: ImageInput.from_base64(data, "image/png")
+    ),
+)
+
+
+class TestImageDeduplication:
+    """
+    Property 10: 多模态图片去重
+    
+    For any list of images, MultimodalContent SHALL keep each distinct image
+    exactly once, in order of first appearance, and stay hashable.
+    """
+
+    @settings(max_examples=100)
+    @given(images=st.lists(image_strategy, min_size=1, max_size=8))
+    def test_images_are_unique_and_ordered(self, images: list[ImageInput]):
+        """
+        Property 10: Duplicate images are dropped, first-seen order is kept.
+        """
+        content = MultimodalContent(text="describe", images=images)
+        
+        assert isinstance(content.images, tuple)
+        assert len(set(content.images)) == len(content.images)
+        assert set(content.images) == set(images)
+        
+        first_seen = []
+        for image in images:
+            if image not in first_seen:
+                first_seen.append(image)
+        assert list(content.images) == first_seen
+        
+        hash(content)
+
+    @settings(max_examples=100)
+    @given(images=st.lists(image_strategy, min_size=1, max_size=8))
+    def test_equal_inputs_produce_equal_content(self, images: list[ImageInput]):
+        """
+        Property 10: Content built from the same images is equal and hashes equally.
+        """
+        a = MultimodalContent(text="describe", images=images)
+        b = MultimodalContent(text="describe", images=list(images) + images[:1])
+        
+        assert a == b
+        assert hash(a) == hash(b)
+
+
+class TestContentHash:
+    """
+    Property 11: 图片内容哈希一致性
+    
+    For any image, content_hash SHALL depend only on the image content:
+    base64 input hashes over the decoded bytes and URLs ignore scheme/host
+    case. prefix_hash SHALL change when the text or the images change.
+    """
+
+    @settings(max_examples=100)
+    @given(raw=st.binary(min_size=1, max_size=512))
+    def test_base64_hash_ignores_encoding_layout(self, raw: bytes):
+        """
+        Property 11: The same bytes hash equally regardless of line breaks or MIME type.
+        """
+        encoded = base64.b64encode(raw).decode("ascii")
+        wrapped = "\n".join(encoded[i:i + 76] for i in range(0, len(encoded), 76))
+        
+        a = ImageInput.from_base64(encoded, "image/png")
+        b = ImageInput.from_base64(wrapped, "image/jpeg")
+        
+        assert a.content_hash == b.content_hash
+
+    @settings(max_examples=100)
+    @given(
+        host=st.from_regex(r"[a-z]{1,10}\.com", fullmatch=True),
+        path=st.from_regex(r"/[a-z0-9]{0,10}\.jpg", fullmatch=True),
+        text=st.text(min_size=1, max_size=50),
+    )
+    def test_url_hash_and_prefix_hash(self, host: str, path: str, text: str):
+        """
+        Property 11: URL case in scheme/host is ignored; text changes prefix_hash.
+        """
+        lower = ImageInput.from_url(f"https://{host}{path}")
+        upper = ImageInput.from_url(f"HTTPS://{host.upper()}{path}")
+        
+        assert lower.content_hash == upper.content_hash
+        assert (
+            MultimodalContent(text=text, images=[lower]).prefix_hash()
+            == MultimodalContent(text=text, images=[upper]).prefix_hash()
+        )
+        assert (
+            MultimodalContent(text=text, images=[lower]).prefix_hash()
+            != MultimodalContent(text=text + "!", images=[lower]).prefix_hash()
+        )
@@ -0,0 +1,64 @@
+"""
+Property-based tests for per-provider rate limiting.
+
+Feature: llm-adapter
+Property 12: 限流并发上限
+"""
+
+import asyncio
+
+from hypothesis import given, strategies as st, settings
+
+from llm_adapter.rate_limiter import ProviderLimiter
+
+
+class TestProviderLimiter:
+    """
+    Property 12: 限流并发上限
+
+    For any max_concurrency, no more than that many callers may be inside
+    slot() at once, and the 429 backoff delay never exceeds max_backoff_s.
+    """
+
+    @settings(max_examples=30, deadline=None)
+    @given(
+        max_concurrency=st.integers(min_value=1, max_value=5),
+        callers=st.integers(min_value=1, max_value=20),
+    )
+    def test_in_flight_never_exceeds_max_concurrency(self, max_concurrency, callers):
+        """
+        Property 12: In-flight calls are bounded by max_concurrency.
+        """
+        limiter = ProviderLimiter(max_concurrency=max_concurrency)
+        in_flight = 0
+        peak = 0
+
+        async def call():
+            nonlocal in_flight, peak
+            async with limiter.slot():
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0)
+                in_flight -= 1
+
+        async def run():
+            await asyncio.gather(*(call() for _ in range(callers)))
+
+        asyncio.run(run())
+        assert peak <= max_concurrency
+        assert in_flight == 0
+
+    @settings(max_examples=100)
+    @given(
+        base=st.floats(min_value=0.01, max_value=5.0),
+        cap=st.floats(min_value=0.01, max_value=60.0),
+        throttles=st.integers(min_value=1, max_value=40),
+    )
+    def test_backoff_is_bounded(self, base, cap, throttles):
+        """
+        Property 12: Consecutive 429s back off up to, never beyond, max_backoff_s.
+        """
+        limiter = ProviderLimiter(base_backoff_s=base, max_backoff_s=cap)
+        for _ in range(throttles):
+            delay = limiter.record_throttled()
+            assert 0.0 < delay <= cap
@@ -0,0 +1,207 @@
+"""
+Property-based tests for the LLMAdapter response cache.
+
+Feature: llm-adapter
+Property 16: 响应缓存一致性
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+import yaml
+from hypothesis import given, strategies as st, settings
+
+from llm_adapter.adapter import LLMAdapter
+from llm_adapter.adapters.base import ProviderAdapter, RawLLMResult
+from llm_adapter.models import TokenUsage
+
+
+def create_test_config_file() -> str:
+    """Create a temporary config with one provider serving every quality."""
+    config = {
+        "llm": {"default_provider": "openai"},
+        "providers": {
+            "openai": {
+                "api_key": "test-key",
+                "models": {"cheap": "gpt-4o-mini", "normal": "gpt-4o", "premium": "gpt-4-turbo"},
+            },
+        },
+        "pricing": {
+            "openai": {
+                "gpt-4o": {"input_cost_per_1m": 2.50, "output_cost_per_1m": 10.00},
+            },
+        },
+    }
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+        yaml.dump(config, f)
+        return f.name
+
+
+@pytest.fixture(scope="module")
+def config_path():
+    path = create_test_config_file()
+    yield path
+    os.unlink(path)
+
+
+class _CountingAdapter(ProviderAdapter):
+    """Answers every prompt with a fresh text, counting provider calls."""
+
+    name = "openai"
+
+    def __init__(self):
+        super().__init__("test-key")
+        self.calls = 0
+
+    async def generate(self, prompt: str, model: str) -> RawLLMResult:
+        self.calls += 1
+        return RawLLMResult(
+            text=f"{prompt} #{self.calls}", input_tokens=1000, output_tokens=1000
+        )
+
+    def estimate_tokens(self, prompt: str, output: str) -> TokenUsage:
+        return TokenUsage(input_tokens=1, output_tokens=1)
+
+
+def _make_adapter(config_path: str, **kwargs) -> tuple[LLMAdapter, _CountingAdapter]:
+    llm = LLMAdapter(config_path=config_path, **kwargs)
+    fake = _CountingAdapter()
+    llm._adapters["openai"] = fake
+    return llm, fake
+
+
+def _call(llm: LLMAdapter, prompt: str, user_id: str = "user", scene: str = "chat", **kwargs):
+    return asyncio.run(llm.generate_with_provider(
+        user_id=user_id, prompt=prompt, provider="openai", model="gpt-4o",
+        scene=scene, **kwargs,
+    ))
+
+
+class TestResponseCache:
+    """
+    Property 16: 响应缓存一致性
+
+    A repeated (scene, provider, model, prompt) request is answered from the
+    cache at zero cost until it expires or is evicted; no_cache and
+    clear_cache bypass or empty it, and get_cache_stats counts every lookup.
+    """
+
+    @settings(max_examples=50)
+    @given(prompt=st.text(min_size=1, max_size=50).filter(lambda x: x.strip()))
+    def test_repeat_is_a_free_hit(self, config_path, prompt):
+        """
+        Property 16: The second identical call is a hit with the same text and cost 0.
+        """
+        llm, fake = _make_adapter(config_path, response_cache_size=8)
+
+        first = _call(llm, prompt)
+        second = _call(llm, prompt, user_id="someone-else")
+
+        assert fake.calls == 1
+        assert second.text == first.text
+        assert first.cost_usd > 0 and second.cost_usd == 0.0
+        assert llm.get_cache_stats()["hits"] == 1
+        assert llm.get_cache_stats()["misses"] == 1
+
+    def test_disabled_by_default(self, config_path):
+        """
+        Property 16: Without response_cache_size every call reaches the provider.
+        """
+        llm, fake = _make_adapter(config_path)
+
+        _call(llm, "hello")
+        _call(llm, "hello")
+
+        assert fake.calls == 2
+        assert llm.get_cache_stats()["size"] == 0
+
+    def test_scene_is_part_of_the_key(self, config_path):
+        """
+        Property 16: The same prompt in another scene is a miss.
+        """
+        llm, fake = _make_adapter(config_path, response_cache_size=8)
+
+        _call(llm, "hello", scene="chat")
+        _call(llm, "hello", scene="coach")
+
+        assert fake.calls == 2
+
+    def test_ttl_expiry(self, config_path, monkeypatch):
+        """
+        Property 16: Entries older than response_cache_ttl are misses.
+        """
+        now = [1000.0]
+        monkeypatch.setattr("llm_adapter.adapter.time.monotonic", lambda: now[0])
+        llm, fake = _make_adapter(config_path, response_cache_size=8, response_cache_ttl=10.0)
+
+        _call(llm, "hello")
+        now[0] += 5.0
+        _call(llm, "hello")
+        now[0] += 10.0
+        _call(llm, "hello")
+
+        assert fake.calls == 2
+
+    def test_lru_eviction(self, config_path):
+        """
+        Property 16: The least recently used entry is evicted past the size limit.
+        """
+        llm, fake = _make_adapter(config_path, response_cache_size=2)
+
+        _call(llm, "a")
+        _call(llm, "b")
+        _call(llm, "a")  # hit; "b" is now least recently used
+        _call(llm, "c")  # evicts "b"
+        _call(llm, "a")  # still cached
+        _call(llm, "b")  # miss
+
+        assert fake.calls == 4
+        assert llm.get_cache_stats()["size"] == 2
+
+    def test_no_cache_and_clear_cache(self, config_path):
+        """
+        Property 16: no_cache skips the lookup; clear_cache empties the cache.
+        """
+        llm, fake = _make_adapter(config_path, response_cache_size=8)
+
+        _call(llm, "hello")
+        fresh = _call(llm, "hello", no_cache=True)
+        assert fake.calls == 2
+        assert fresh.cost_usd > 0
+
+        llm.clear_cache()
+        assert llm.get_cache_stats()["size"] == 0
+        _call(llm, "hello")
+        assert fake.calls == 3
+
+    @settings(max_examples=50)
+    @given(prompt=st.text(min_size=1, max_size=50).filter(lambda x: x.strip()))
+    def test_no_cache_call_is_not_stored(self, config_path, prompt):
+        """
+        Property 16: A no_cache answer is never stored, routed or direct.
+        """
+        llm, fake = _make_adapter(config_path, response_cache_size=8)
+
+        _call(llm, prompt, no_cache=True)
+        asyncio.run(llm.generate(
+            user_id="user", prompt=prompt, scene="chat", quality="medium", no_cache=True,
+        ))
+
+        assert llm.get_cache_stats()["size"] == 0
+        _call(llm, prompt, user_id="someone-else")
+        assert fake.calls == 3
+
+    def test_routed_generate_uses_cache(self, config_path):
+        """
+        Property 16: generate() serves a repeated routed prompt from the cache.
+        """
+        llm, fake = _make_adapter(config_path, response_cache_size=8)
+
+        async def run():
+            for _ in range(2):
+                await llm.generate(user_id="user", prompt="hello", scene="chat", quality="medium")
+
+        asyncio.run(run())
+        assert fake.calls == 1
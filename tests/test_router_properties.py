@@ -284,3 +284,42 @@ class TestRouterStrategyCorrectness:
             )
         finally:
             os.unlink(config_path)
+
+    @settings(max_examples=100)
+    @given(
+        quality=st.sampled_from(["low", "medium", "high"]),
+        failed=st.lists(
+            st.sampled_from(["openai", "gemini", "cloudflare", "huggingface"]),
+            min_size=1,
+            max_size=3,
+            unique=True,
+        ),
+    )
+    def test_fallback_skips_every_failed_provider(
+        self,
+        quality: Literal["low", "medium", "high"],
+        failed: list[str],
+    ):
+        """
+        Property 5: A fallback never returns a provider that already failed.
+        """
+        config_path = create_test_config_file()
+        
+        try:
+            config_manager = ConfigManager(config_path)
+            config_manager.load()
+            router = Router(config_manager)
+            
+            try:
+                result = router.get_fallback(
+                    quality,
+                    failed_provider=failed[-1],
+                    excluded_providers=set(failed),
+                )
+            except RouterError:
+                return
+            
+            assert result.provider not in failed
+            assert result.is_fallback
+        finally:
+            os.unlink(config_path)
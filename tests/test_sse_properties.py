@@ -0,0 +1,84 @@
+"""
+Property-based tests for server-sent event parsing in streaming adapters.
+
+Feature: llm-adapter
+Property 14: SSE 分块无关性
+"""
+
+import asyncio
+import json
+
+import httpx
+from hypothesis import given, strategies as st, settings
+
+from llm_adapter.adapters.base import _iter_sse_data
+
+
+class _ChunkedStream(httpx.AsyncByteStream):
+    def __init__(self, chunks: list[bytes]):
+        self._chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+def _collect(body: bytes, cuts: list[int], bare_lines: bool = False) -> list[bytes]:
+    bounds = [0, *sorted(c % (len(body) + 1) for c in cuts), len(body)]
+    chunks = [body[a:b] for a, b in zip(bounds, bounds[1:])]
+    response = httpx.Response(200, stream=_ChunkedStream(chunks))
+
+    async def run():
+        return [data async for data in _iter_sse_data(response, bare_lines=bare_lines)]
+
+    return asyncio.run(run())
+
+
+texts_strategy = st.lists(st.text(min_size=1, max_size=20), min_size=1, max_size=8)
+
+
+class TestSSEChunking:
+    """
+    Property 14: SSE 分块无关性
+
+    For any event stream and any way the network splits it into chunks,
+    _iter_sse_data must yield exactly the `data:` payloads, in order, and
+    stop at `[DONE]`.
+    """
+
+    @settings(max_examples=100)
+    @given(
+        texts=texts_strategy,
+        cuts=st.lists(st.integers(min_value=0, max_value=10_000), max_size=10),
+        crlf=st.booleans(),
+    )
+    def test_payloads_do_not_depend_on_chunking(self, texts, cuts, crlf):
+        """
+        Property 14: Payloads are the same for every chunk split.
+        """
+        eol = "\r\n" if crlf else "\n"
+        events = [json.dumps({"choices": [{"delta": {"content": t}}]}) for t in texts]
+        body = "".join(
+            f": keep-alive{eol}" + f"data: {e}{eol}{eol}" for e in events
+        ) + f"data: [DONE]{eol}{eol}data: {{\"after\": 1}}{eol}"
+
+        payloads = _collect(body.encode("utf-8"), cuts)
+
+        decoded = [json.loads(p)["choices"][0]["delta"]["content"] for p in payloads]
+        assert decoded == texts
+
+    @settings(max_examples=50)
+    @given(
+        texts=texts_strategy,
+        cuts=st.lists(st.integers(min_value=0, max_value=10_000), max_size=10),
+    )
+    def test_bare_json_lines(self, texts, cuts):
+        """
+        Property 14: With bare_lines, unprefixed JSON lines are yielded too,
+        including a final line without a trailing newline.
+        """
+        body = "\n".join(json.dumps({"response": t}) for t in texts)
+
+        payloads = _collect(body.encode("utf-8"), cuts, bare_lines=True)
+
+        assert [json.loads(p)["response"] for p in payloads] == texts